@@ -10,22 +10,33 @@
 
 В рамках этой функции выполняются следующие операции:
 1. Отображение основного меню и ожидание выбора пользователя.
-2. Вывод на экран всех незавершенных задач или с разбивкой по категориям. 
+2. Вывод на экран всех незавершенных задач или с разбивкой по категориям (постранично). 
 3. Добавление новой задачи с запросом названия, описания, категории, срока, приоритета.
 4. Изменение задачи по идентификатору или изменения статуса задачи.
 5. Удаление задачи по идентификатору или удаление категории задач.
-6. Поиск задач по заданному критерию, категориям или статусу выполнения.
-7. Выход из программы.
+6. Поиск задач по заданному критерию, категориям, статусу выполнения или по нескольким условиям сразу.
+7. Статистика: количество задач по статусу, категориям, приоритету и срокам.
+8. Выход из программы.
 
 При возникновении ошибок они логируются, и пользователю предоставляется обратная связь о причине сбоя.
 Все действия записываются в лог для последующего анализа.
+Время каждого действия меню попадает в метрики (Task.metrics); если задана переменная окружения
+TASK_METRICS, при выходе метрики записываются в этот файл (JSON или, для расширения .prom,
+текстовый формат Prometheus).
+Архивирование включается явно: если задана переменная окружения TASK_ARCHIVE_DAYS (или параметр
+archive_after_days), при выходе выполненные задачи со сроком старше стольких дней переносятся
+в архив, и пользователю сообщается, сколько задач перенесено.
 
 Это функция является основным интерфейсом для работы с библиотекой и обеспечивает пользователю 
 доступ ко всем основным операциям управления задачами.
 """
 
+import os
+import time
 import logging
+from typing import Optional
 from Task.TaskManager import TaskManager
+from Task.metrics import METRICS
 from Task.lexicon import LEXICON, LEXICON_LOG
 import Task.View as view
 from Task.user_exception import (NotInputError, InvalidIDError, NotTaskError,
@@ -33,11 +44,23 @@ from Task.user_exception import (NotInputError, InvalidIDError, NotTaskError,
                                  InvalidTaskIntError, InvalidPriorityError,
                                  YearTaskError)
 
+# Возраст (в днях) выполненных задач, переносимых в архив при выходе; не задан - без архивирования
+ARCHIVE_AFTER_DAYS = (int(os.environ['TASK_ARCHIVE_DAYS'])
+                      if os.environ.get('TASK_ARCHIVE_DAYS') else None)
 
-def task_console():
+
+def task_console(archive_after_days: Optional[int] = ARCHIVE_AFTER_DAYS):
+    """ Главный цикл консольного интерфейса
+
+    :param archive_after_days: Переносить при выходе в архив выполненные задачи со сроком
+                               старше стольких дней (None - не архивировать).
+    """
     logging.info(LEXICON_LOG['start_console'])
     # Создаем экземпляр класса записной книжки названием - tasks_book.json)
-    task_manager = TaskManager(filename='tasks_book.json')
+    # (задачи загружаются в фоне, меню показывается сразу; файл может быть
+    # открыт одновременно в нескольких консолях)
+    task_manager = TaskManager(filename='tasks_book.json', lazy=True,
+                               shared=True)
 
     # запуск цикла основного меню
     while True:
@@ -45,6 +68,9 @@ def task_console():
 
         try:
             choice = view.menu()
+            # подтягиваем изменения, сделанные другими процессами
+            task_manager.refresh()
+            started = time.perf_counter()
             match choice:
                 case 1:  # Показать список задач
                     logging.info(LEXICON_LOG['display_tasks'])
@@ -65,13 +91,14 @@ def task_console():
                             tasks_shows = task_manager.view_tasks_category()
                             view.print_message(LEXICON['tasks_display_true'])
                             for key, value in tasks_shows.items():
-                                view.show_tasks(value, key)
+                                # 'q' на странице категории заканчивает весь просмотр
+                                if not view.show_tasks(value, key):
+                                    break
                         logging.info(LEXICON_LOG['tasks_display_true'])
                     except (NotInputError, ValueError, DisplayError,
                             InvalidTaskIntError) as e:
                         # Выводим информацию в логи и пользователю в зависимости от вида ошибок
-                        logging.error(
-                            f"{LEXICON_LOG['task_display_error']} {e}")
+                        logging.error("%s %s", LEXICON_LOG['task_display_error'], e)
                         print(e)
 
                 case 2:  # Добавление задачи
@@ -93,7 +120,7 @@ def task_console():
                     except (NotInputError, YearTaskError, ValueError,
                             InvalidPriorityError) as e:
                         # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(f"{LEXICON_LOG['task_add_error']} {e}")
+                        logging.error("%s %s", LEXICON_LOG['task_add_error'], e)
                         print(e)
 
                 case 3:  # Изменения задачи
@@ -120,8 +147,7 @@ def task_console():
                     except (
                     InvalidIDError, NotInputError, InvalidTaskIntError) as e:
                         # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(
-                            f"{LEXICON_LOG['task_update_error']} {e}")
+                        logging.error("%s %s", LEXICON_LOG['task_update_error'], e)
                         print(e)
 
                 case 4:  # Удаление задачи
@@ -138,8 +164,7 @@ def task_console():
                         logging.info(LEXICON_LOG['delete_tasks_true'])
                     except (NotInputError, InvalidIDError) as e:
                         # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(
-                            f"{LEXICON_LOG['delete_task_error']} {e}")
+                        logging.error("%s %s", LEXICON_LOG['delete_task_error'], e)
                         print(e)
 
                 case 5:  # Поиск задачи
@@ -166,35 +191,72 @@ def task_console():
                                 LEXICON['search_tasks_status'])
                             result = task_manager.search_tasks(
                                 status=search_status)
+                        if choice_search == "4":
+                            # Составной поиск: все заполненные условия объединяются через И
+                            search_query = view.actions_with_tasks(
+                                LEXICON['search_tasks_query'])
+                            result = task_manager.search_tasks(
+                                **{key: value for key, value in
+                                   search_query.items() if value})
+                        if choice_search == "5":
+                            # Ранжированный поиск: самые релевантные задачи первыми
+                            search_data = view.input_user(
+                                LEXICON['search_tasks_ranked'])
+                            result = task_manager.ranked_search(search_data)
 
                         # Выводим задачи, которые найдены
                         view.print_message(LEXICON['search_tasks_true'])
                         view.show_tasks(result)
                         logging.info(LEXICON_LOG['search_tasks_true'])
-                    except (
-                    NotTaskError, NotInputError, InvalidTaskIntError) as e:
+                    except (NotTaskError, NotInputError,
+                            InvalidTaskIntError, ValueError) as e:
                         # Выводим информацию в логи и пользователю в зависимости от ошибок
-                        logging.error(
-                            f"{LEXICON_LOG['search_tasks_error']} {e}")
+                        logging.error("%s %s", LEXICON_LOG['search_tasks_error'], e)
                         print(e)
 
-                case 6:  # Завершение работы приложения
+                case 6:  # Статистика
+                    logging.info(LEXICON_LOG['stats'])
+                    view.print_message(LEXICON['stats_title'])
+                    view.show_stats(task_manager.stats())
+                    logging.info(LEXICON_LOG['stats_true'])
+
+                case 7:  # Завершение работы приложения
                     logging.info(LEXICON_LOG['exit_menu'])
+                    if archive_after_days is not None:
+                        archived = task_manager.archive_completed(
+                            archive_after_days)
+                        view.print_message(
+                            f"{LEXICON['archive_tasks_true']} {archived}")
+                    # сохраняем изменения, накопленные для группового сохранения
+                    task_manager.close()
+                    dump_metrics(os.environ.get('TASK_METRICS'))
                     print(f"{LEXICON['exit']} \n")
                     break
+            METRICS.observe('console_action_seconds',
+                            time.perf_counter() - started, action=choice)
 
         except (ValueError, NotInputError) as e:
             # Выводим информацию в логи и пользователю в зависимости от ошибок
-            logging.error(f"{LEXICON_LOG['exit_error']} {e}")
+            logging.error("%s %s", LEXICON_LOG['exit_error'], e)
             print(e)
 
 
+def dump_metrics(filename: str = None):
+    """ Записывает метрики в файл (формат Prometheus для расширения .prom, иначе JSON)
+
+    :param filename: Имя файла (None - ничего не записывать).
+    """
+    if not filename:
+        return
+    text = (METRICS.to_prometheus() if filename.endswith('.prom')
+            else METRICS.to_json())
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
 if __name__ == "__main__":
-    # Настройка логирования (cохраняются в файл "task.log").
-    logging.basicConfig(
-        filename='task.log',
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-    )
+    # Настройка логирования (cохраняются в файл "task.log" фоновым потоком).
+    from Task.logging_setup import setup_logging
+    setup_logging()
 
     task_console()
@@ -2,18 +2,50 @@
 Класс TaskManager представляет собой менеджер задач, предназначенный для работы с коллекцией 
 объектов типа Task.
 Он предоставляет методы для загрузки, сохранения, просмотра и обработки задач, хранящихся в файле формата JSON.
+Хранение вынесено в подключаемое хранилище (Task.storage): по умолчанию файл JSON, также доступны
+SQLite, каталог шардов по категориям (Task.sharded_storage) и хранилище в памяти (параметр storage).
 
 ### Конструктор:
 Метод __init__ инициализирует экземпляр класса TaskManager, устанавливая имя файла для хранения 
 задач (по умолчанию 'tasks_book.json'), пустой словарь для хранения задач и начальный идентификатор для новых задач. 
 Затем вызывается метод load_tasks для загрузки существующих задач из указанного файла.
+При journal=True изменения дописываются в журнал (файл '<filename>.journal') вместо
+перезаписи всего файла, а снимок обновляется только при компактизации журнала.
+Снимок записывается атомарно (временный файл, fsync, rename). Несколько изменений внутри блока
+`with task_manager.batch():` или в течение окна commit_delay секунд сохраняются одной записью.
+Вторичные индексы (категория, статус, приоритет -> id задач) обновляются при каждом изменении,
+поэтому просмотр и фильтрация стоят пропорционально размеру результата.
+Поиск по ключевому слову использует триграммный инвертированный индекс по названию и описанию,
+а ранжированный поиск с учетом опечаток - индекс слов с оценкой BM25 (Task.search_index).
+Упорядоченные индексы по сроку выполнения и приоритету отвечают на запросы "ближайшие задачи",
+"просроченные задачи" и "самые важные задачи" за O(log N + K).
+Файл задач читается потоково (по одному элементу массива), а при lazy=True загрузка идет
+в фоновом потоке: экземпляр доступен сразу, и первая операция с задачами дожидается окончания загрузки.
+При shared=True файл задач могут использовать несколько процессов: чтение и запись идут под
+блокировкой файла, перед записью подтягиваются только чужие изменения (новые записи журнала
+или отличающиеся задачи), а одновременные изменения одной задачи решаются политикой conflict_policy.
+При thread_safe=True экземпляр можно использовать из нескольких потоков: методы чтения выполняются
+параллельно под блокировкой чтения, изменения - по одному под блокировкой записи. Задачи не меняются
+на месте (изменение заменяет объект Task новым), поэтому snapshot() возвращает неизменяемый снимок,
+по которому можно долго итерироваться без блокировки и не задерживая запись.
 
 ### Методы:
-- load_tasks: загружает задачи из файла JSON. 
+- load_tasks: загружает задачи из файла JSON (потоковый разбор массива задач). 
+- wait_loaded: дожидается окончания фоновой загрузки (lazy=True).
+- refresh: применяет изменения, сделанные другими процессами (shared=True).
+- snapshot: неизменяемый снимок задач (id -> Task) для долгих просмотров без блокировки.
 - save_tasks: сохраняет текущие задачи в файл JSON. 
+- compact_journal: записывает новый снимок и очищает журнал изменений.
+- batch: контекстный менеджер для группировки нескольких изменений в одно сохранение.
+- flush: немедленно сохраняет накопленные изменения.
+- close: сохраняет накопленные изменения перед завершением работы.
+- _insert_task / _remove_task: единственные точки изменения словаря tasks, поддерживающие вторичные индексы.
 - checking_for_task_availability: проверяет наличие хотя бы одной задачи. Если задач нет, выбрасывается исключение DisplayError.
 - view_tasks_all: возвращает список всех активных (не выполненных) задач.
 - view_tasks_category: группирует активные задачи по категориям и возвращает словарь с активными задачами.
+- stats: сводка (по статусу, категории, приоритету, срокам), которая поддерживается счетчиками за O(1) на изменение.
+- query_cache: LRU-кэш результатов view_tasks_all, view_tasks_category и query/search_tasks
+  с точечной инвалидацией по категории, приоритету и статусу; статистика - query_cache.stats().
 - add_task: добавляет новую задачу в коллекцию задач. 
 - task_date_check: проверяет корректность даты выполнения задачи. 
 - checking_priority: проверяет, соответствует ли введенный приоритет одному из допустимых значений ("низкий", "средний", "высокий").
@@ -23,79 +55,576 @@
 - update_task: обновляет существующую задачу новыми данными. 
 - mark_task_completed: отмечает задачу с указанным идентификатором как выполненную. 
 - delete_task: удаляет задачу либо по её идентификатору, либо по категории. 
-- search_tasks: выполняет поиск задач по ключевому слову, категории или статусу. 
+- query: составной запрос (ключевое слово, категория, статус, приоритет, диапазон срока) с сортировкой и limit/offset.
+- query_count: количество задач, подходящих под условия query (без построения результата).
+- search_tasks: выполняет поиск задач по ключевому слову, категории, статусу, приоритету и сроку (условия через И). 
+- ranked_search: самые релевантные задачи по запросу (BM25, слова с опечатками находятся по триграммам).
+- tasks_due_between: задачи со сроком выполнения в заданном диапазоне в порядке срока.
+- next_due: ближайшие по сроку активные задачи.
+- overdue: просроченные активные задачи.
+- top_by_priority: активные задачи с наивысшим приоритетом.
+- overdue_count / due_within / weekly_histogram: аналитика по срокам над упакованным столбцом
+  ординалов дат (Task.date_column, NumPy при наличии).
+- archive_completed: переносит старые выполненные задачи в архив (Task.archive), который не загружается при запуске.
+- restore_archived: возвращает задачи из архива в книгу задач.
 
 
 Этот класс позволяет управлять задачами, обеспечивая их хранение, просмотр и фильтрацию по различным критериям.
 """
 
 import json
-import os
+import sys
+import heapq
 import logging
-from typing import List, Dict, Optional, Any
-from datetime import datetime
-from Task.tasks_class import Task
+import threading
+import functools
+from types import MappingProxyType
+from contextlib import contextmanager
+from typing import (List, Dict, Optional, Any, Iterable, Iterator, Callable,
+                    Mapping, ContextManager)
+from datetime import date
+from Task.tasks_class import Task, COMPLETED, PRIORITY_RANK, parse_date
+from Task.journal import TaskJournal
+from Task.storage import TaskStorage, JsonFileStorage, record_ids
+from Task.indexes import FieldIndex
+from Task.text_index import TrigramIndex
+from Task.search_index import SearchIndex
+from Task.query import TaskQuery, execute_query, count_query
+from Task.query_cache import QueryCache, MISSING, query_scope
+from Task.archive import TaskArchive
+from Task.aggregates import TaskAggregates
+from Task.date_column import DueDateColumn
+from Task.sorted_index import SortedIndex, due_key, priority_key
+from Task.concurrency import RWLock, NullRWLock, read_locked, write_locked
+from Task.metrics import METRICS, SIZE_BUCKETS, timed
 from Task.lexicon import LEXICON, LEXICON_LOG
 from Task.user_exception import (NotInputError, InvalidIDError, NotTaskError,
                                  DisplayError,
                                  InvalidTaskIntError, InvalidPriorityError,
-                                 YearTaskError)
+                                 YearTaskError, StorageError, ConflictError)
+
+
+def requires_loaded(method: Callable) -> Callable:
+    """ Декоратор: перед выполнением метода дожидается окончания фоновой загрузки задач """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.wait_loaded()
+        return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 class TaskManager:
-    def __init__(self, filename: str = 'tasks_book.json') -> None:
+    def __init__(self, filename: str = 'tasks_book.json',
+                 journal: bool = False, journal_max_records: int = 1000,
+                 journal_max_bytes: int = 1024 * 1024,
+                 commit_delay: float = 0.0, lazy: bool = False,
+                 load_chunk_size: int = 64 * 1024,
+                 storage: Optional[TaskStorage] = None,
+                 shared: bool = False,
+                 conflict_policy: str = 'ours',
+                 thread_safe: bool = False,
+                 cache_size: int = 256,
+                 archive_after_days: Optional[int] = None,
+                 archive_file: Optional[str] = None) -> None:
         """
         Инициализация экземпляра класса TaskManager.
 
         :param filename: Имя файла для хранения данных о задачах. По умолчанию 'tasks_book.json'.
+        :param journal: Включить журнал изменений вместо перезаписи файла при каждом изменении.
+        :param journal_max_records: Количество записей журнала, после которого выполняется компактизация.
+        :param journal_max_bytes: Размер журнала в байтах, после которого выполняется компактизация.
+        :param commit_delay: Окно группового сохранения в секундах (0 - сохранять каждое изменение сразу).
+        :param lazy: Загружать задачи в фоновом потоке, не блокируя создание экземпляра.
+        :param load_chunk_size: Размер блока потокового чтения файла задач в символах.
+        :param storage: Хранилище задач. По умолчанию файл JSON filename (с параметрами журнала выше).
+        :param shared: Файл задач используют несколько процессов (блокировка и подтягивание чужих изменений).
+        :param conflict_policy: Что делать при одновременном изменении задачи другим процессом:
+                                'ours' - сохранить свою версию, 'theirs' - принять чужую,
+                                'raise' - выбросить ConflictError.
+        :param thread_safe: Разрешить одновременную работу с экземпляром из нескольких потоков.
+        :param cache_size: Количество результатов просмотра и поиска в LRU-кэше (0 - без кэша).
+        :param archive_after_days: Выполненные задачи со сроком старше стольких дней переносятся
+                                   в архив при закрытии (None - только по вызову archive_completed).
+        :param archive_file: Файл архива (по умолчанию '<filename>.archive.jsonl.gz'; для хранилища
+                             без файла, например MemoryStorage, архив хранится в памяти).
         """
-        self.filename: str = filename
+        if conflict_policy not in ('ours', 'theirs', 'raise'):
+            raise ValueError(f"Неверная политика конфликтов - {conflict_policy}")
+        if storage is None:
+            storage = JsonFileStorage(filename, journal, journal_max_records,
+                                      journal_max_bytes, load_chunk_size,
+                                      shared)
+        self.conflict_policy: str = conflict_policy
+        self.storage: TaskStorage = storage
+        self.filename: str = getattr(storage, 'filename', filename)
         self.tasks: dict = {}
         self.next_id: int = 1
-        self.load_tasks()
+        self.category_index = FieldIndex('category')
+        self.status_index = FieldIndex('status')
+        self.priority_index = FieldIndex('priority')
+        self.text_index = TrigramIndex()
+        self.search_index = SearchIndex()
+        self.due_index = SortedIndex(('due_date', 'status'), due_key)
+        self.priority_order_index = SortedIndex(
+            ('priority', 'due_date', 'status'), priority_key)
+        self.aggregates = TaskAggregates()
+        self.due_column = DueDateColumn()
+        self.indexes: List[Any] = [self.category_index, self.status_index,
+                                   self.priority_index, self.text_index,
+                                   self.due_index, self.priority_order_index,
+                                   self.aggregates, self.due_column,
+                                   self.search_index]
+        self.commit_delay: float = commit_delay
+        self._pending: List[Dict[str, Any]] = []
+        self._batch_depth: int = 0
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.RLock()
+        self._loaded = threading.Event()
+        self.thread_safe: bool = thread_safe
+        self._rwlock = RWLock() if thread_safe else NullRWLock()
+        self._io_lock = threading.Lock()
+        METRICS.add_collector(self._collect_metrics)
+        self._snapshot: Optional[Mapping[int, Task]] = None
+        self.generation: int = 0  # номер версии задач, растет при каждом изменении
+        self.query_cache = QueryCache(cache_size)
+        self.archive_after_days: Optional[int] = archive_after_days
+        if archive_file is None and self.filename != ':memory:':
+            archive_file = f"{self.filename}.archive.jsonl.gz"
+        self.archive = TaskArchive(archive_file)
+        if lazy:
+            threading.Thread(target=self._load_in_background,
+                             daemon=True).start()
+        else:
+            self.load_tasks()
+            self._loaded.set()
+
+    @property
+    def journal(self) -> Optional[TaskJournal]:
+        """ Журнал изменений хранилища (если хранилище его ведет) """
+        return getattr(self.storage, 'journal', None)
 
+    def _load_in_background(self) -> None:
+        """ Загрузка задач в фоновом потоке (режим lazy) """
+        try:
+            self.load_tasks()
+        finally:
+            self._loaded.set()
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        """
+        Дожидается окончания загрузки задач.
+
+        :param timeout: Максимальное время ожидания в секундах (None - без ограничения).
+        :return: True, если задачи загружены.
+        """
+        if self._loaded.is_set():
+            return True
+        return self._loaded.wait(timeout)
+
+    @timed('load_tasks')
+    @write_locked
     def load_tasks(self) -> None:
         """
         Загружает книги из файла JSON.
 
         Метод пытается открыть указанный файл и загрузить данные о книгах в словарь tasks.
+        Массив задач разбирается потоково, поэтому в памяти не держится весь список словарей.
         Если файл не существует или возникает ошибка,записывает сообщение об ошибке в лог и 
         выводит сообщение пользователю.
         """
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r', encoding='utf-8') as f:
-                    data: List[Dict[str, Any]] = json.load(f)
-                    for task_data in data:
-                        task = Task.from_task_in_dict(task_data)
-                        self.tasks[task.id] = task
-                        if task.id >= self.next_id:
-                            self.next_id = task.id + 1
+            with self.storage.locked(shared=True), \
+                    self._storage_timer('load'):
+                for task_data in self.storage.load():
+                    task = Task.from_task_in_dict(task_data)
+                    self._insert_task(task)
+                    if task.id >= self.next_id:
+                        self.next_id = task.id + 1
+                if self.journal:
+                    changed_ids = set()
+                    for record in self.storage.load_changes():
+                        self._apply_record(record)
+                        changed_ids.update(record_ids([record]))
+                    self.storage.synced(self.tasks, changed_ids)
+                    logging.info(LEXICON_LOG['journal_replay'])
+            # id архивных задач не выдаются новым задачам
+            if self.archive.max_id >= self.next_id:
+                self.next_id = self.archive.max_id + 1
             logging.info(LEXICON_LOG['load_task_book'])
-        except (IOError, FileNotFoundError, json.JSONDecodeError) as e:
-            logging.error(f"{LEXICON_LOG['error_load_task_book']} {e}")
+        except (IOError, FileNotFoundError, json.JSONDecodeError,
+                StorageError) as e:
+            logging.error("%s %s", LEXICON_LOG['error_load_task_book'], e)
             print(LEXICON['error_load_task_book'])
 
+    @timed('save_tasks')
+    @requires_loaded
+    @write_locked
     def save_tasks(self):
         """
-        Сохраняет задачи в файл JSON.
+        Сохраняет задачи в файл JSON (полный снимок в хранилище).
 
-        Метод открывает файл для записи и сериализует данные о задачах из словаря tasks в формате JSON.
+        Для файла JSON данные записываются во временный файл, после чего он атомарно заменяет
+        прежний файл, поэтому сбой во время записи не портит книгу задач.
         Если при сохранении возникает ошибка, она записывается в лог и выводится сообщение об ошибке.
         """
         try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                data: List[Dict[str, Any]] = [task.to_dict() for task in
-                                              self.tasks.values()]
-                json.dump(data, f, ensure_ascii=False, indent=4)
-                logging.info(LEXICON_LOG['save_tasks'])
+            with self._io_lock, self.storage.locked(), self._flush_lock:
+                self._merge_external_changes()
+                with self._storage_timer('save_all'):
+                    self.storage.save_all(list(self.tasks.values()))
+                self._pending.clear()
+            logging.info(LEXICON_LOG['save_tasks'])
         except OSError as e:
-            logging.error(f"{LEXICON_LOG['error_save_tasks']} {e}")
+            logging.error("%s %s", LEXICON_LOG['error_save_tasks'], e)
             print(LEXICON['error_save_tasks'])
         except Exception as e:
-            logging.error(f"{LEXICON_LOG['error_save_tasks']} {e}")
+            logging.error("%s %s", LEXICON_LOG['error_save_tasks'], e)
             print(LEXICON['error_save_tasks'])
 
+    @timed('compact_journal')
+    @requires_loaded
+    def compact_journal(self) -> None:
+        """
+        Компактизация журнала: записывает новый снимок задач и очищает журнал.
+        """
+        self.save_tasks()
+        logging.info(LEXICON_LOG['journal_compact'])
+
+    @contextmanager
+    def batch(self) -> Iterator['TaskManager']:
+        """
+        Групповое сохранение: все изменения внутри блока сохраняются одной записью при выходе из него.
+
+        :return: Текущий экземпляр TaskManager.
+        """
+        with self._flush_lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._flush_lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self.flush()
+
+    @timed('flush')
+    @requires_loaded
+    def flush(self) -> None:
+        """
+        Сохраняет накопленные изменения одной операцией хранилища.
+
+        В режиме журнала записи дописываются в журнал (с компактизацией при превышении порога),
+        SQLite изменяет только затронутые строки, иначе переписывается весь файл задач.
+        При thread_safe=True блокировка записи держится только пока забираются накопленные
+        изменения и снимок задач, а сама запись в хранилище идет без неё: чтение и новые
+        изменения не ждут диска (если flush вызван не изнутри метода, меняющего задачи).
+        Если запись не удалась, изменения возвращаются в начало очереди и сохраняются
+        следующим вызовом flush.
+        """
+        records: List[Dict[str, Any]] = []
+        write_lock = self._rwlock.write()
+        write_lock.__enter__()
+        try:
+            with self._io_lock:
+                with self._flush_lock:
+                    if self._flush_timer is not None:
+                        self._flush_timer.cancel()
+                        self._flush_timer = None
+                    if not self._pending:
+                        return
+                try:
+                    with self.storage.locked():
+                        # чужие изменения подтягиваются до записи, чтобы не затереть их
+                        with self._flush_lock:
+                            self._merge_external_changes()
+                            records, self._pending = self._pending, []
+                        tasks = self.snapshot() if self.thread_safe else self.tasks
+                        write_lock.__exit__(None, None, None)
+                        write_lock = None
+                        with self._storage_timer('apply'):
+                            self.storage.apply(records, tasks)
+                        METRICS.inc('task_manager_records_saved_total',
+                                    len(records))
+                    logging.info(LEXICON_LOG['save_tasks'])
+                except (OSError, StorageError) as e:
+                    with self._flush_lock:
+                        self._pending[:0] = records
+                    logging.error("%s %s", LEXICON_LOG['error_save_tasks'], e)
+                    print(LEXICON['error_save_tasks'])
+        finally:
+            if write_lock is not None:
+                write_lock.__exit__(None, None, None)
+
+    @timed('refresh')
+    @requires_loaded
+    @write_locked
+    def refresh(self) -> int:
+        """
+        Применяет изменения, сделанные другими процессами с момента последней синхронизации.
+
+        Если книга задач не менялась, стоит две проверки stat файла.
+        :raises ConflictError: Если conflict_policy='raise' и задача изменена одновременно.
+        :return: Количество примененных записей изменений.
+        """
+        with self.storage.locked(shared=True):
+            with self._flush_lock:
+                count = self._merge_external_changes()
+        if count:
+            logging.info("%s %s", LEXICON_LOG['refresh_tasks'], count)
+        return count
+
+    @requires_loaded
+    @read_locked
+    def snapshot(self) -> Mapping[int, Task]:
+        """
+        Неизменяемый снимок задач на текущий момент.
+
+        Снимок копируется один раз после каждого изменения и разделяется всеми читателями.
+        Итерация по снимку не требует блокировки и не видит последующих изменений.
+        :return: Отображение id -> Task только для чтения.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = self._snapshot = MappingProxyType(dict(self.tasks))
+        return snapshot
+
+    def _storage_timer(self, operation: str) -> ContextManager:
+        """ Замер времени вызова хранилища (гистограмма storage_seconds) """
+        return METRICS.timer('storage', operation=operation,
+                             backend=type(self.storage).__name__)
+
+    def _collect_metrics(self) -> None:
+        """ Обновляет текущие значения метрик (количество задач, размеры индексов) перед выгрузкой """
+        book = self.filename
+        METRICS.set_gauge('task_manager_tasks', len(self.tasks), book=book)
+        METRICS.set_gauge('task_manager_pending_records', len(self._pending),
+                          book=book)
+        METRICS.set_gauge('task_manager_generation', self.generation,
+                          book=book)
+        for name, value in self.query_cache.stats().items():
+            METRICS.set_gauge(f'task_manager_query_cache_{name}', value,
+                              book=book)
+        for name, size in (('category', len(self.category_index.values)),
+                           ('status', len(self.status_index.values)),
+                           ('priority', len(self.priority_index.values)),
+                           ('trigram', len(self.text_index.postings)),
+                           ('search_words', len(self.search_index.postings)),
+                           ('due', len(self.due_index)),
+                           ('priority_order', len(self.priority_order_index))):
+            METRICS.set_gauge('task_manager_index_keys', size, book=book,
+                              index=name)
+
+    def _merge_external_changes(self) -> int:
+        """
+        Применяет чужие изменения к задачам с учетом несохраненных своих изменений (_pending).
+
+        Одновременно добавленные задачи с одинаковым id получают новый id у себя.
+        Для задач, измененных обеими сторонами, применяется conflict_policy.
+        Вызывается под блокировкой хранилища.
+        :raises ConflictError: Если conflict_policy='raise' и есть конфликт.
+        :return: Количество примененных записей изменений.
+        """
+        with self._storage_timer('external_changes'):
+            external = self.storage.external_changes()
+        if not external:
+            return 0
+        external_ids = set(record_ids(external))
+        added_here = {record['task']['id'] for record in self._pending
+                      if record['op'] == 'add'}
+        collisions = sorted(
+            record['task']['id'] for record in external
+            if record['op'] == 'add' and record['task']['id'] in added_here)
+        conflicts = external_ids & set(record_ids(self._pending)) - set(collisions)
+        if conflicts and self.conflict_policy == 'raise':
+            raise ConflictError(min(conflicts))
+        for task_id in collisions:
+            self._renumber_pending(task_id, external_ids)
+        ours = {task_id: (self.tasks[task_id].to_dict()
+                          if task_id in self.tasks else None)
+                for task_id in conflicts}
+        for record in external:
+            self._apply_record(record)
+        for task_id in conflicts:
+            if self.conflict_policy == 'theirs':
+                self._drop_pending(task_id)
+                task_data = (self.tasks[task_id].to_dict()
+                             if task_id in self.tasks else None)
+            else:
+                task_data = ours[task_id]
+                if task_data is not None:
+                    self._insert_task(Task.from_task_in_dict(task_data))
+                elif task_id in self.tasks:
+                    self._remove_task(task_id)
+            self._pending.append({'op': 'add', 'task': task_data}
+                                 if task_data is not None else
+                                 {'op': 'delete', 'ids': [task_id]})
+        self.storage.synced(self.tasks, external_ids - conflicts)
+        return len(external)
+
+    def _renumber_pending(self, task_id: int, taken_ids: set) -> None:
+        """
+        Переносит свою еще не сохраненную задачу на новый id, если такой id уже занят другим процессом.
+
+        :param task_id: Занятый id.
+        :param taken_ids: Идентификаторы, уже использованные другим процессом.
+        """
+        new_id = max(self.next_id, max(taken_ids) + 1)
+        task_data = self._remove_task(task_id).to_dict()
+        task_data['id'] = new_id
+        self._insert_task(Task.from_task_in_dict(task_data))
+        self.next_id = new_id + 1
+        for record in self._pending:
+            if record['op'] == 'add' and record['task']['id'] == task_id:
+                record['task'] = dict(record['task'], id=new_id)
+            elif record['op'] == 'delete':
+                record['ids'] = [new_id if i == task_id else i
+                                 for i in record['ids']]
+            elif record.get('id') == task_id:
+                record['id'] = new_id
+
+    def _drop_pending(self, task_id: int) -> None:
+        """ Убирает из несохраненных изменений все записи о задаче task_id """
+        pending = []
+        for record in self._pending:
+            if record['op'] == 'delete':
+                ids = [i for i in record['ids'] if i != task_id]
+                if ids:
+                    pending.append(dict(record, ids=ids))
+            elif record_ids([record]) != [task_id]:
+                pending.append(record)
+        self._pending = pending
+
+    def close(self) -> None:
+        """ Сохраняет все накопленные изменения (перенося старые выполненные задачи в архив) и закрывает хранилище """
+        if self.archive_after_days is not None:
+            self.archive_completed()
+        self.flush()
+        self.storage.close()
+
+    def _commit(self, record: Dict[str, Any]) -> None:
+        """
+        Регистрирует одно изменение задачи и сохраняет его сразу либо откладывает до группового сохранения.
+
+        :param record: Запись об изменении (add, patch, complete, delete).
+        """
+        with self._flush_lock:
+            self._pending.append(record)
+            if self._batch_depth:
+                return
+            if self.commit_delay > 0:
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.commit_delay,
+                                                        self.flush)
+                    self._flush_timer.start()
+                return
+        self.flush()
+
+    def _apply_record(self, record: Dict[str, Any]) -> None:
+        """
+        Применяет запись журнала к словарю задач.
+
+        :param record: Запись об изменении (add, patch, complete, delete).
+        """
+        op = record.get('op')
+        if op == 'add':
+            task = Task.from_task_in_dict(record['task'])
+            self._insert_task(task)
+            if task.id >= self.next_id:
+                self.next_id = task.id + 1
+        elif op == 'patch' and record['id'] in self.tasks:
+            task_data = self.tasks[record['id']].to_dict()
+            task_data.update(record['fields'])
+            self._insert_task(Task.from_task_in_dict(task_data))
+        elif op == 'complete' and record['id'] in self.tasks:
+            self._complete_task(self.tasks[record['id']])
+        elif op == 'delete':
+            for task_id in record['ids']:
+                if task_id in self.tasks:
+                    self._remove_task(task_id)
+
+    def _insert_task(self, task: Task) -> None:
+        """
+        Добавляет задачу в словарь задач (или заменяет задачу с тем же id) и во все индексы.
+
+        :param task: Задача.
+        """
+        self._snapshot = None
+        self.generation += 1
+        old_task = self.tasks.get(task.id)
+        self.query_cache.invalidate(old_task, task)
+        if old_task is not None:
+            for index in self.indexes:
+                index.remove(old_task)
+        self.tasks[task.id] = task
+        for index in self.indexes:
+            index.add(task)
+
+    def _remove_task(self, task_id: int) -> Task:
+        """
+        Удаляет задачу из словаря задач и из всех индексов.
+
+        :param task_id: ID задачи.
+        :return: Удаленная задача.
+        """
+        self._snapshot = None
+        self.generation += 1
+        task = self.tasks.pop(task_id)
+        self.query_cache.invalidate(task)
+        for index in self.indexes:
+            index.remove(task)
+        return task
+
+    def _complete_task(self, task: Task) -> Task:
+        """
+        Отмечает задачу выполненной с обновлением индексов, зависящих от статуса.
+
+        Задача не меняется на месте: в словарь задач помещается выполненная копия,
+        поэтому ранее выданные снимки и списки задач не меняются.
+        :param task: Задача.
+        :return: Выполненная задача.
+        """
+        self._snapshot = None
+        self.generation += 1
+        indexes = [index for index in self.indexes if 'status' in index.fields]
+        for index in indexes:
+            index.remove(task)
+        completed = Task.from_task_in_dict(task.to_dict())
+        completed.mark_completed()
+        self.query_cache.invalidate(task, completed)
+        self.tasks[task.id] = completed
+        for index in indexes:
+            index.add(completed)
+        return completed
+
+    def _cached(self, key: tuple, scope: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Результат запроса из кэша или вычисленный заново (и сохраненный в кэш).
+
+        :param key: Нормализованные параметры запроса.
+        :param scope: Область задач, от которой зависит результат (query_scope).
+        :param compute: Функция, вычисляющая результат.
+        :return: Результат запроса (общий с кэшем объект - вызывающий делает копию).
+        """
+        result = self.query_cache.get(key)
+        if result is MISSING:
+            result = compute()
+            self.query_cache.put(key, result, scope)
+        return result
+
+    def _tasks_by_ids(self, ids: Any) -> List[Task]:
+        """
+        Возвращает задачи по идентификаторам в порядке возрастания id.
+
+        :param ids: Идентификаторы задач.
+        :return: Список задач.
+        """
+        return [self.tasks[task_id] for task_id in sorted(ids)]
+
+    @requires_loaded
+    @read_locked
     def checking_for_task_availability(self):
         """ функция для проверки наличия задач
         
@@ -104,29 +633,53 @@ class TaskManager:
         if not self.tasks:
             raise DisplayError
 
+    @timed('view_tasks_all')
+    @requires_loaded
+    @read_locked
     def view_tasks_all(self) -> List[Task]:
         """ Просмотр всех текущих задач
         
         :return: Список активных задач.
         """
 
-        tasks_book = [task for task in self.tasks.values() if
-                      task.status == 'Не выполнена']
-        return tasks_book
+        tasks_book = self._cached(
+            ('view_tasks_all',), query_scope(status='Не выполнена'),
+            lambda: self._tasks_by_ids(self.status_index.get('Не выполнена')))
+        return list(tasks_book)
 
+    @timed('view_tasks_category')
+    @requires_loaded
+    @read_locked
     def view_tasks_category(self) -> Dict[str, Task]:
         """ Просмотр задач по категориям
         :return: Словарь активных задач с разбивкой по категориям.
         """
 
-        category = [task.category for task in self.tasks.values() if
-                    task.status == "Не выполнена"]
-        tasks_book = {}
-        for key in category:
-            tasks_book[key] = [task for task in self.tasks.values() if
-                               task.category == key]
-        return tasks_book
+        def group() -> Dict[str, List[Task]]:
+            groups = {}
+            for task in self._tasks_by_ids(self.status_index.get('Не выполнена')):
+                groups.setdefault(task.category, []).append(task)
+            return groups
+
+        tasks_book = self._cached(('view_tasks_category',),
+                                  query_scope(status='Не выполнена'), group)
+        return {category: list(tasks) for category, tasks in tasks_book.items()}
+
+    @timed('stats')
+    @requires_loaded
+    @read_locked
+    def stats(self, today: Any = None) -> Dict[str, Any]:
+        """ Сводка по книге задач без прохода по задачам (счетчики TaskAggregates)
+
+        :param today: Текущая дата (ГГГГ-ММ-ДД или date) для распределения по срокам.
+        :return: Количество задач всего, активных и выполненных, по статусу, категории,
+                 приоритету и срокам, просроченные задачи по приоритету.
+        """
+        return self.aggregates.stats(self._checking_date_arg(today, date.today()))
 
+    @timed('add_task')
+    @requires_loaded
+    @write_locked
     def add_task(self, title: str, description: str, category: str,
                  due_date: str, priority: str) -> str:
         """
@@ -141,22 +694,42 @@ class TaskManager:
         """
         task = Task(self.next_id, title, description, category, due_date,
                     priority)
-        self.tasks[self.next_id] = task
+        self._insert_task(task)
         self.next_id += 1
-        self.save_tasks()
+        self._commit({'op': 'add', 'task': task.to_dict()})
         return f"{LEXICON['task_add_true']} {task.title}\n"
 
+    @timed('add_tasks')
+    @requires_loaded
+    @write_locked
+    def add_tasks(self, tasks_data: List[Dict[str, str]]) -> range:
+        """
+        Массовое добавление уже проверенных задач одной группой сохранения.
+
+        id выделяются одним диапазоном начиная с next_id.
+        :param tasks_data: Данные задач (title, description, category, due_date, priority, status).
+        :return: Диапазон id добавленных задач.
+        """
+        ids = range(self.next_id, self.next_id + len(tasks_data))
+        self.next_id = ids.stop
+        with self.batch():
+            for task_id, task_data in zip(ids, tasks_data):
+                task = Task.from_task_in_dict({**task_data, 'id': task_id})
+                self._insert_task(task)
+                self._commit({'op': 'add', 'task': task.to_dict()})
+        return ids
+
     def task_date_check(self, data: str):
         """ Функция для проверки даты задач
         
         :raises ValueError: Если ошибка в формате даты.
         :raises YearTaskError: Если ошибка в периоде задачи (ранее текущей даты).
         """
-        try:
-            parsed_date = datetime.strptime(data, '%Y-%m-%d')
-        except ValueError as e:
+        parsed_date = parse_date(data)
+        if parsed_date is None:
             raise ValueError("Ошибка в формате даты")
-        if parsed_date < datetime.now():
+        # срок должен быть позже сегодняшнего дня
+        if parsed_date <= date.today():
             raise YearTaskError
 
     def checking_priority(self, data: Optional[str]):
@@ -165,7 +738,7 @@ class TaskManager:
         :param data: Данные от пользовтеля.
         :raises InvalidPriorityError: Если выбран не правильный приоритет
         """
-        if data.lower() not in ["низкий", "средний", "высокий"]:
+        if data.lower() not in PRIORITY_RANK:
             raise InvalidPriorityError(data)
 
     def checking_for_empty_data(self, data: Optional[str]):
@@ -186,6 +759,8 @@ class TaskManager:
         if not data.isdigit():
             raise InvalidTaskIntError(data)
 
+    @requires_loaded
+    @read_locked
     def checking_for_empty_id(self, task_id: str):
         """ Функция для проверки наличия задачи по id
         
@@ -196,6 +771,9 @@ class TaskManager:
         if task_id not in self.tasks:
             raise InvalidIDError(task_id)
 
+    @timed('update_task')
+    @requires_loaded
+    @write_locked
     def update_task(self, task_id: Optional[str],
                     update_data: Dict[str, str] = None) -> str:
         """ Функция для изменения задачи на новые данные
@@ -207,15 +785,20 @@ class TaskManager:
 
         task_id = int(task_id)
         update_task = self.tasks.get(task_id).to_dict()
+        fields = {}
         for key, value in update_data.items():
             if not value:
                 continue
             update_task[key] = update_data[key]
+            fields[key] = update_data[key]
         new_task = Task.from_task_in_dict(update_task)
-        self.tasks[task_id] = new_task
-        self.save_tasks()
+        self._insert_task(new_task)
+        self._commit({'op': 'patch', 'id': task_id, 'fields': fields})
         return f"{LEXICON['task_update_true']} {new_task.id} c названием - {new_task.title}"
 
+    @timed('mark_task_completed')
+    @requires_loaded
+    @write_locked
     def mark_task_completed(self, task_id: str) -> str:
         """
         Отметка задачи как выполненной по заданному идентификатору.
@@ -224,12 +807,14 @@ class TaskManager:
         :return: Сообщение об успешном обновлении статуса задачи.
         """
 
-        current_task: Task = self.tasks[int(task_id)]
-        current_task.mark_completed()
-        self.save_tasks()
+        current_task: Task = self._complete_task(self.tasks[int(task_id)])
+        self._commit({'op': 'complete', 'id': current_task.id})
         return (
             f"{LEXICON['task_update_status_true']} {current_task.id} c названием - {current_task.title} обновлен на - {current_task.status}")
 
+    @timed('delete_task')
+    @requires_loaded
+    @write_locked
     def delete_task(self, task_id: Optional[str] = None,
                     category: Optional[str] = None) -> str:
         """ Удаление задачи по идентификатору или категории 
@@ -241,43 +826,358 @@ class TaskManager:
         """
         if task_id.isdigit():
             task_id = int(task_id)
-            removed_task = self.tasks.pop(task_id)
-            self.save_tasks()
+            removed_task = self._remove_task(task_id)
+            self._commit({'op': 'delete', 'ids': [task_id]})
             return f"{LEXICON['delete_tasks_true_id']} {removed_task.id} c названием - {removed_task.title}"
         elif category:
-            removed_list_category = [task for task in self.tasks.values() if
-                                     task.category == category]
+            removed_list_category = self._tasks_by_ids(
+                self.category_index.get(category))
             for task in removed_list_category:
-                self.tasks.pop(task.id)
-            self.save_tasks()
+                self._remove_task(task.id)
+            self._commit({'op': 'delete',
+                          'ids': [task.id for task in removed_list_category]})
             return f"{LEXICON['delete_tasks_true_category']} {category}"
 
+    @timed('query')
+    @requires_loaded
+    @read_locked
+    def query(self, keyword: Optional[str] = None,
+              category: Optional[str] = None,
+              status: Optional[str] = None,
+              priority: Optional[str] = None,
+              due_from: Optional[str] = None,
+              due_to: Optional[str] = None,
+              order_by: str = 'id', descending: bool = False,
+              limit: Optional[int] = None, offset: int = 0,
+              include_archive: bool = False) -> List[Task]:
+        """ Составной запрос к задачам: все заданные условия объединяются через И
+
+        Планировщик начинает с самого селективного условия (по оценке индексов),
+        остальные условия проверяются только на найденных кандидатах.
+        Результаты повторных запросов берутся из кэша query_cache, пока не изменится
+        задача из области запроса (категории, приоритета или статуса).
+        Архив выполненных задач читается потоково, только если запрошен статус "Выполнена"
+        или include_archive=True.
+        :param keyword: Подстрока названия или описания.
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :param due_from: Начало диапазона срока выполнения (ГГГГ-ММ-ДД).
+        :param due_to: Конец диапазона срока выполнения (ГГГГ-ММ-ДД).
+        :param order_by: Поле сортировки (id, title, category, due_date, priority, status).
+        :param descending: Сортировка по убыванию.
+        :param limit: Максимальное количество задач.
+        :param offset: Количество пропускаемых задач.
+        :param include_archive: Искать также в архиве выполненных задач.
+        :raises ValueError: Если неверное поле сортировки или формат даты.
+        :return: Список найденных задач (может быть пустым).
+        """
+        history = include_archive or bool(status) and status.lower() == COMPLETED.lower()
+        task_query = TaskQuery(keyword, category, status, priority, due_from,
+                               due_to, order_by, descending, limit, offset)
+        key = ('query',) + tuple(
+            value.lower() if value else None
+            for value in (keyword, category, status, priority)) + (
+            task_query.due_from, task_query.due_to, order_by, descending,
+            limit, offset, history)
+        results = list(self._cached(
+            key, query_scope(category, priority, status),
+            lambda: execute_query(self, task_query, self._archived_tasks()
+                                  if history else ())))
+        METRICS.observe('task_manager_query_results', len(results),
+                        SIZE_BUCKETS)
+        return results
+
+    @timed('query_count')
+    @requires_loaded
+    @read_locked
+    def query_count(self, keyword: Optional[str] = None,
+                    category: Optional[str] = None,
+                    status: Optional[str] = None,
+                    priority: Optional[str] = None,
+                    due_from: Optional[str] = None,
+                    due_to: Optional[str] = None) -> int:
+        """ Количество задач, подходящих под условия query (для постраничной выдачи)
+
+        Запрос с одним условием по полю или сроку считается по индексу без перебора задач.
+        :raises ValueError: Если ошибка в формате даты.
+        :return: Количество задач.
+        """
+        task_query = TaskQuery(keyword, category, status, priority, due_from,
+                               due_to)
+        key = ('query_count',) + tuple(
+            value.lower() if value else None
+            for value in (keyword, category, status, priority)) + (
+            task_query.due_from, task_query.due_to)
+        return self._cached(key, query_scope(category, priority, status),
+                            lambda: count_query(self, task_query))
+
+    @timed('search_tasks')
+    @requires_loaded
+    @read_locked
     def search_tasks(self, keyword: Optional[str] = None,
                      category: Optional[str] = None,
-                     status: Optional[str] = None) -> List[Task]:
-        """ Поиск задач по ключевым словам, категории или статусу выполнения 
-        
+                     status: Optional[str] = None,
+                     priority: Optional[str] = None,
+                     due_from: Optional[str] = None,
+                     due_to: Optional[str] = None,
+                     include_archive: bool = False) -> List[Task]:
+        """ Поиск задач по ключевым словам, категории, статусу выполнения, приоритету и сроку
+
+        Все заданные условия объединяются через И.
+        Поиск по статусу "Выполнена" и при include_archive=True захватывает и архив.
         :param keyword: Строка, содержащая поисковый запрос. Используется для поиска по названию или описанию.
         :param category: Строка, данные категории.
         :param status: Строка, данные статуса.
-        :raises NotTaskError: Если не найдено ни одной книги по заданному запросу.
-        :return: Список найденных книг.
-        """
-
-        results: List[Task] = []
-        if keyword:
-            keyword = keyword.lower()
-            results = [task for task in self.tasks.values()
-                       if
-                       keyword in task.title.lower() or keyword in task.description.lower()]
-        if category:
-            results = [task for task in self.tasks.values() if
-                       task.category.lower() == category.lower()]
-        if status:
-            results = [task for task in self.tasks.values() if
-                       task.status.lower() == status.lower()]
+        :param priority: Строка, данные приоритета.
+        :param due_from: Начало диапазона срока выполнения (ГГГГ-ММ-ДД).
+        :param due_to: Конец диапазона срока выполнения (ГГГГ-ММ-ДД).
+        :param include_archive: Искать также в архиве выполненных задач.
+        :raises NotInputError: Если не задано ни одного условия поиска.
+        :raises NotTaskError: Если не найдено ни одной задачи по заданному запросу.
+        :return: Список найденных задач.
+        """
 
+        if not any((keyword, category, status, priority, due_from, due_to)):
+            raise NotInputError
+        results = self.query(keyword, category, status, priority, due_from,
+                             due_to, include_archive=include_archive)
         if not results:
             raise NotTaskError
 
         return results
+
+    @timed('ranked_search')
+    @requires_loaded
+    @read_locked
+    def ranked_search(self, text: str, limit: Optional[int] = 10,
+                      category: Optional[str] = None,
+                      status: Optional[str] = None,
+                      priority: Optional[str] = None) -> List[Task]:
+        """ Ранжированный поиск по названию и описанию с учетом опечаток
+
+        Оцениваются только задачи, в которых есть слова, похожие на слова запроса
+        (индекс search_index), и возвращаются самые релевантные первыми.
+        Оценка зависит от всей книги задач (частоты слов), поэтому результат в кэше
+        query_cache устаревает при любом изменении задач.
+        :param text: Поисковый запрос (одно или несколько слов).
+        :param limit: Количество задач (None - все найденные).
+        :param category: Категория задачи.
+        :param status: Статус задачи.
+        :param priority: Приоритет задачи.
+        :raises NotInputError: Если запрос пустой.
+        :raises NotTaskError: Если не найдено ни одной задачи по заданному запросу.
+        :return: Список задач по убыванию релевантности.
+        """
+        self.checking_for_empty_data(text)
+        filters = [(field, value.lower()) for field, value in
+                   (('category', category), ('status', status),
+                    ('priority', priority)) if value]
+
+        def accept(task_id: int) -> bool:
+            task = self.tasks[task_id]
+            return all(getattr(task, field).lower() == value
+                       for field, value in filters)
+
+        key = ('ranked_search', text.lower(), limit) + tuple(filters)
+        ids = self._cached(key, None, lambda: [
+            task_id for task_id, _ in self.search_index.search(
+                text, limit, accept if filters else None)])
+        if not ids:
+            raise NotTaskError
+        return [self.tasks[task_id] for task_id in ids]
+
+    def _archived_tasks(self) -> Iterator[Task]:
+        """ Задачи архива (потоковое чтение; задачи, уже вернувшиеся в книгу, пропускаются) """
+        for task_data in self.archive:
+            if task_data['id'] not in self.tasks:
+                yield Task.from_task_in_dict(task_data)
+
+    @timed('archive_completed')
+    @requires_loaded
+    @write_locked
+    def archive_completed(self, older_than_days: Optional[int] = None,
+                          today: Any = None) -> int:
+        """ Переносит выполненные задачи со сроком старше указанного возраста в архив
+
+        Задачи сначала дописываются в архив, затем удаляются из книги задач.
+        :param older_than_days: Возраст в днях (по умолчанию archive_after_days или 0).
+        :param today: Текущая дата (по умолчанию сегодня).
+        :return: Количество перенесенных задач.
+        """
+        if older_than_days is None:
+            older_than_days = self.archive_after_days or 0
+        today = self._checking_date_arg(today, date.today())
+        cutoff = today.toordinal() - older_than_days
+        tasks = [self.tasks[task_id] for task_id in
+                 self.due_index.ids((1, 0), (1, cutoff))
+                 if self.tasks[task_id].status == COMPLETED]
+        if not tasks:
+            return 0
+        with self.storage.locked():
+            self.archive.append([task.to_dict() for task in tasks])
+        with self.batch():
+            for task in tasks:
+                self._remove_task(task.id)
+            self._commit({'op': 'delete', 'ids': [task.id for task in tasks]})
+        logging.info("%s %s", LEXICON_LOG['archive_tasks'], len(tasks))
+        return len(tasks)
+
+    @timed('restore_archived')
+    @requires_loaded
+    @write_locked
+    def restore_archived(self, task_ids: Optional[Iterable[Any]] = None,
+                         category: Optional[str] = None) -> List[Task]:
+        """ Возвращает задачи из архива в книгу задач
+
+        :param task_ids: Идентификаторы задач (строки или числа).
+        :param category: Категория, все архивные задачи которой нужно вернуть.
+        :raises NotInputError: Если не указаны ни id, ни категория.
+        :raises NotTaskError: Если в архиве нет подходящих задач.
+        :return: Восстановленные задачи.
+        """
+        ids = {int(task_id) for task_id in task_ids or ()}
+        if not ids and not category:
+            raise NotInputError
+
+        def matches(task_data: Dict[str, Any]) -> bool:
+            return (task_data['id'] in ids or
+                    bool(category) and task_data['category'] == category)
+
+        tasks = [Task.from_task_in_dict(task_data) for task_data in self.archive
+                 if matches(task_data) and task_data['id'] not in self.tasks]
+        if not tasks:
+            raise NotTaskError
+        # сначала задачи сохраняются в книге, затем удаляются из архива
+        with self.batch():
+            for task in tasks:
+                self._insert_task(task)
+                self._commit({'op': 'add', 'task': task.to_dict()})
+        self.flush()  # даже внутри внешнего batch: архив очищается только после записи книги
+        with self.storage.locked():
+            self.archive.remove(matches)
+        logging.info("%s %s", LEXICON_LOG['restore_tasks'], len(tasks))
+        return tasks
+
+    @staticmethod
+    def _checking_date_arg(data: Any, default: Optional[date] = None) -> Optional[date]:
+        """ Преобразует аргумент-дату (строка ГГГГ-ММ-ДД или date) в date
+
+        :raises ValueError: Если ошибка в формате даты.
+        """
+        if not data:
+            return default
+        if isinstance(data, date):
+            return data
+        parsed = parse_date(data)
+        if parsed is None:
+            raise ValueError("Ошибка в формате даты")
+        return parsed
+
+    @timed('tasks_due_between')
+    @requires_loaded
+    @read_locked
+    def tasks_due_between(self, date_from: Any = None, date_to: Any = None,
+                          include_completed: bool = False,
+                          limit: Optional[int] = None) -> List[Task]:
+        """ Задачи со сроком выполнения в диапазоне дат (включительно) в порядке срока
+
+        :param date_from: Начало диапазона (ГГГГ-ММ-ДД или date), None - без ограничения.
+        :param date_to: Конец диапазона (ГГГГ-ММ-ДД или date), None - без ограничения.
+        :param include_completed: Учитывать выполненные задачи.
+        :param limit: Максимальное количество задач.
+        :return: Список задач.
+        """
+        date_from = self._checking_date_arg(date_from)
+        date_to = self._checking_date_arg(date_to)
+        lo = date_from.toordinal() if date_from else 0
+        hi = date_to.toordinal() + 1 if date_to else sys.maxsize
+        ids = self.due_index.ids((0, lo), (0, hi), limit)
+        if include_completed:
+            done_ids = self.due_index.ids((1, lo), (1, hi), limit)
+            keys = self.due_index.task_keys
+            ids = [task_id for task_id in heapq.merge(
+                ids, done_ids, key=lambda task_id: keys[task_id][1:])][:limit]
+        return [self.tasks[task_id] for task_id in ids]
+
+    @timed('next_due')
+    @requires_loaded
+    @read_locked
+    def next_due(self, limit: int = 20, from_date: Any = None) -> List[Task]:
+        """ Ближайшие по сроку активные задачи, начиная с указанной даты
+
+        :param limit: Количество задач.
+        :param from_date: Дата отсчета (по умолчанию сегодня).
+        :return: Список задач в порядке срока выполнения.
+        """
+        from_date = self._checking_date_arg(from_date, date.today())
+        return self.tasks_due_between(from_date, None, limit=limit)
+
+    @timed('overdue')
+    @requires_loaded
+    @read_locked
+    def overdue(self, today: Any = None,
+                limit: Optional[int] = None) -> List[Task]:
+        """ Просроченные активные задачи (срок раньше указанной даты)
+
+        :param today: Текущая дата (по умолчанию сегодня).
+        :param limit: Максимальное количество задач.
+        :return: Список задач в порядке срока выполнения.
+        """
+        today = self._checking_date_arg(today, date.today())
+        return self.tasks_due_between(None, date.fromordinal(today.toordinal() - 1),
+                                      limit=limit)
+
+    @timed('overdue_count')
+    @requires_loaded
+    @read_locked
+    def overdue_count(self, today: Any = None,
+                      priority: Optional[str] = None) -> int:
+        """ Количество просроченных активных задач (векторно по столбцу сроков)
+
+        :param today: Текущая дата (по умолчанию сегодня).
+        :param priority: Учитывать только задачи с этим приоритетом или выше.
+        :raises ValueError: Если ошибка в формате даты или неизвестный приоритет.
+        :return: Количество задач.
+        """
+        today = self._checking_date_arg(today, date.today())
+        return self.due_column.overdue_count(today, priority)
+
+    @timed('due_within')
+    @requires_loaded
+    @read_locked
+    def due_within(self, days: int, today: Any = None,
+                   priority: Optional[str] = None) -> int:
+        """ Количество активных задач со сроком в ближайшие days дней (векторно по столбцу сроков)
+
+        :param days: Количество дней.
+        :param today: Текущая дата (по умолчанию сегодня).
+        :param priority: Учитывать только задачи с этим приоритетом или выше.
+        :raises ValueError: Если ошибка в формате даты или неизвестный приоритет.
+        :return: Количество задач.
+        """
+        today = self._checking_date_arg(today, date.today())
+        return self.due_column.due_within_count(days, today, priority)
+
+    @timed('weekly_histogram')
+    @requires_loaded
+    @read_locked
+    def weekly_histogram(self, include_completed: bool = False) -> Dict[date, int]:
+        """ Количество задач по неделям срока выполнения (векторно по столбцу сроков)
+
+        :param include_completed: Учитывать выполненные задачи.
+        :return: Понедельник недели -> количество задач.
+        """
+        return self.due_column.weekly_histogram(include_completed)
+
+    @timed('top_by_priority')
+    @requires_loaded
+    @read_locked
+    def top_by_priority(self, limit: int = 20) -> List[Task]:
+        """ Активные задачи с наивысшим приоритетом (при равном приоритете - по сроку)
+
+        :param limit: Количество задач.
+        :return: Список задач.
+        """
+        ids = self.priority_order_index.ids((0,), (1,), limit)
+        return [self.tasks[task_id] for task_id in ids]
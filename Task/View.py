@@ -7,11 +7,26 @@
 2. Получения данных от пользователя по выбору пункта меню
 3. Получения данных от пользователя для передачи в другие функции (id и тд)
 4. Вывод пользователю информацию о задачах
+
+Задачи выводятся постранично (show_tasks): форматируется только видимая страница, и она
+записывается в stdout одним вызовом. Между страницами пользователь листает вперед (Enter),
+назад ('p') или заканчивает просмотр ('q'). Источником задач может быть список или генератор -
+из генератора читается только то, что уже было показано. Размер страницы и табличный вид
+(столбцы выровнены по ширине значений видимой страницы) задаются параметрами или переменными
+окружения TASK_PAGE_SIZE и TASK_TABLE=1.
 """
 
-from typing import Dict, List, Any
+import os
+import sys
+from itertools import islice
+from typing import Dict, List, Any, IO, Iterable, Optional
 from Task.lexicon import LEXICON
 
+PAGE_SIZE = int(os.environ.get('TASK_PAGE_SIZE', 20))
+TABLE = os.environ.get('TASK_TABLE') == '1'
+# Максимальная ширина столбца таблицы (длинные значения обрезаются)
+MAX_COLUMN_WIDTH = 40
+
 
 def menu() -> int:
     print(f"\n{LEXICON.get('main_menu')[0]}")
@@ -43,12 +58,129 @@ def actions_with_tasks(message: str) -> Dict[str, Any]:
     return new
 
 
-def show_tasks(tasks_shows: List[Any], message: str = None):
-    if message:
-        print('=' * 30)
-        print(' ' * 15 + message)
-    for task in tasks_shows:
-        print(
+class TaskPages:
+    def __init__(self, tasks: Iterable[Any], page_size: int) -> None:
+        """
+        Постраничный доступ к задачам.
+
+        Список нарезается без копирования всего списка; из генератора задачи читаются
+        по мере листания и запоминаются, чтобы можно было вернуться на прежнюю страницу.
+        :param tasks: Список или итератор задач.
+        :param page_size: Количество задач на странице.
+        """
+        self.page_size: int = max(page_size, 1)
+        self._sequence = tasks if hasattr(tasks, '__getitem__') else None
+        self._iterator = None if self._sequence is not None else iter(tasks)
+        self._seen: List[Any] = []
+
+    @property
+    def total(self) -> Optional[int]:
+        """ Общее количество задач (None для генератора) """
+        return len(self._sequence) if self._sequence is not None else None
+
+    def page(self, number: int) -> List[Any]:
+        """ Задачи страницы number (с нуля) """
+        start = number * self.page_size
+        stop = start + self.page_size
+        if self._sequence is not None:
+            return list(self._sequence[start:stop])
+        if len(self._seen) < stop:
+            self._seen.extend(islice(self._iterator, stop - len(self._seen)))
+        return self._seen[start:stop]
+
+    def has_page(self, number: int) -> bool:
+        if self._sequence is not None:
+            return number * self.page_size < len(self._sequence)
+        return bool(self.page(number))
+
+
+def _clip(value: Any) -> str:
+    text = str(value)
+    if len(text) > MAX_COLUMN_WIDTH:
+        return text[:MAX_COLUMN_WIDTH - 1] + '…'
+    return text
+
+
+def format_tasks(tasks: List[Any], table: bool = False) -> str:
+    """
+    Форматирует одну страницу задач.
+
+    :param tasks: Задачи страницы.
+    :param table: Табличный вид (ширина столбцов по значениям этой страницы).
+    :return: Текст страницы.
+    """
+    if not table:
+        return ''.join(
             f"ID: {task.id}, Название: {task.title}, Описание: {task.description}, "
             f"Категория: {task.category}, Срок выполнения: {task.due_date}, "
-            f"Приоритет: {task.priority}, Статус: {task.status} \n")
+            f"Приоритет: {task.priority}, Статус: {task.status} \n\n"
+            for task in tasks)
+    rows = [LEXICON['table_header']]
+    rows.extend([_clip(task.id), _clip(task.title), _clip(task.description),
+                 _clip(task.category), task.due_date, task.priority,
+                 task.status] for task in tasks)
+    widths = [max(len(row[column]) for row in rows)
+              for column in range(len(rows[0]))]
+    lines = [' | '.join(value.ljust(width) for value, width in
+                        zip(row, widths)) for row in rows]
+    lines.insert(1, '-+-'.join('-' * width for width in widths))
+    return '\n'.join(lines) + '\n'
+
+
+def show_tasks(tasks_shows: Iterable[Any], message: str = None,
+               page_size: int = None, table: bool = None,
+               stream: IO[str] = None) -> bool:
+    """
+    Постраничный вывод задач с переходом между страницами.
+
+    :param tasks_shows: Список или итератор задач.
+    :param message: Заголовок (например, название категории).
+    :param page_size: Количество задач на странице (по умолчанию PAGE_SIZE).
+    :param table: Табличный вид (по умолчанию TABLE).
+    :param stream: Поток вывода (по умолчанию stdout).
+    :return: False, если пользователь закончил просмотр ('q'), иначе True.
+    """
+    stream = stream or sys.stdout
+    pages = TaskPages(tasks_shows, page_size or PAGE_SIZE)
+    table = TABLE if table is None else table
+    header = f"{'=' * 30}\n{' ' * 15}{message}\n" if message else ''
+    number = 0
+    while True:
+        tasks = pages.page(number)
+        has_next = pages.has_page(number + 1)
+        text = header + format_tasks(tasks, table)
+        if number or has_next:
+            total = pages.total
+            text += LEXICON['page_info'].format(
+                page=number + 1, first=number * pages.page_size + 1,
+                last=number * pages.page_size + len(tasks),
+                total='' if total is None else f" из {total}") + '\n'
+        # вся страница записывается одним вызовом
+        stream.write(text)
+        stream.flush()
+        if not number and not has_next:
+            return True
+        answer = input(LEXICON['page_navigation']).strip().lower()
+        if answer == 'q':
+            return False
+        if answer == 'p':
+            number = max(number - 1, 0)
+        elif has_next:
+            number += 1
+        else:
+            return True
+
+
+def show_stats(stats: Dict[str, Any], stream: IO[str] = None):
+    """ Вывод сводки TaskManager.stats одним вызовом записи """
+    lines = [LEXICON['stats_summary'].format(**stats),
+             LEXICON['stats_due'].format(**stats['due'])]
+    if stats['overdue_by_priority']:
+        lines.append(LEXICON['stats_overdue_priority'] + ', '.join(
+            f"{priority} - {count}"
+            for priority, count in stats['overdue_by_priority'].items()))
+    lines.append(LEXICON['stats_category'])
+    for category, counts in stats['by_category'].items():
+        opened = counts.get('Не выполнена', 0)
+        lines.append(f"\t{category}: {opened} / {sum(counts.values()) - opened}")
+    (stream or sys.stdout).write('\n'.join(lines) + '\n')
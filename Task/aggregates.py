@@ -0,0 +1,110 @@
+"""
+Модуль содержит класс TaskAggregates - счетчики и сводки по книге задач, которые
+поддерживаются инкрементально.
+
+TaskAggregates подключается к TaskManager как вторичный индекс: при каждом изменении задачи
+вызываются remove (старая версия) и add (новая версия), и каждый вызов меняет несколько
+счетчиков за O(1):
+- количество задач по статусу;
+- количество задач по категории и статусу;
+- количество задач по приоритету и статусу;
+- количество активных задач по сроку выполнения (ординал даты) и приоритету.
+
+Сводка stats() не проходит по задачам: счетчики копируются как есть, а распределение
+активных задач по срокам (просрочено, сегодня, 7 дней, позже, без даты) вычисляется
+по различным датам срока, которых намного меньше, чем задач.
+"""
+
+from datetime import date
+from typing import Any, Dict, Iterable, Optional
+
+OPEN = 'Не выполнена'
+DUE_WINDOW_DAYS = 7
+
+
+def _add(counter: Dict[Any, int], key: Any, delta: int) -> None:
+    value = counter.get(key, 0) + delta
+    if value:
+        counter[key] = value
+    else:
+        del counter[key]
+
+
+class TaskAggregates:
+    def __init__(self) -> None:
+        """ Инициализация пустых счетчиков """
+        self.fields = ('category', 'status', 'priority', 'due_date')
+        self.total: int = 0
+        self.by_status: Dict[str, int] = {}
+        self.by_category: Dict[str, Dict[str, int]] = {}
+        self.by_priority: Dict[str, Dict[str, int]] = {}
+        # активные задачи: приоритет -> ординал срока (None - некорректная дата) -> количество
+        self.open_due: Dict[str, Dict[Optional[int], int]] = {}
+
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Any]) -> 'TaskAggregates':
+        """ Счетчики, вычисленные заново полным проходом по задачам (для проверки) """
+        aggregates = cls()
+        for task in tasks:
+            aggregates.add(task)
+        return aggregates
+
+    def _update(self, task: Any, delta: int) -> None:
+        self.total += delta
+        _add(self.by_status, task.status, delta)
+        _add(self.by_category.setdefault(task.category, {}), task.status, delta)
+        if not self.by_category[task.category]:
+            del self.by_category[task.category]
+        _add(self.by_priority.setdefault(task.priority, {}), task.status, delta)
+        if not self.by_priority[task.priority]:
+            del self.by_priority[task.priority]
+        if task.status == OPEN:
+            _add(self.open_due.setdefault(task.priority, {}), task.due_ordinal,
+                 delta)
+            if not self.open_due[task.priority]:
+                del self.open_due[task.priority]
+
+    def add(self, task: Any) -> None:
+        """ Учитывает задачу в счетчиках """
+        self._update(task, 1)
+
+    def remove(self, task: Any) -> None:
+        """ Убирает задачу из счетчиков """
+        self._update(task, -1)
+
+    def stats(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Сводка по книге задач.
+
+        :param today: Текущая дата для распределения по срокам (по умолчанию сегодня).
+        :return: Словарь счетчиков: total, open, completed, by_status, by_category,
+                 by_priority, due (активные задачи по срокам), overdue_by_priority.
+        """
+        today = (today or date.today()).toordinal()
+        due = {'overdue': 0, 'today': 0, 'week': 0, 'later': 0, 'no_date': 0}
+        overdue_by_priority: Dict[str, int] = {}
+        for priority, ordinals in self.open_due.items():
+            for ordinal, count in ordinals.items():
+                if ordinal is None:
+                    bucket = 'no_date'
+                elif ordinal < today:
+                    bucket = 'overdue'
+                    overdue_by_priority[priority] = (
+                        overdue_by_priority.get(priority, 0) + count)
+                elif ordinal == today:
+                    bucket = 'today'
+                elif ordinal <= today + DUE_WINDOW_DAYS:
+                    bucket = 'week'
+                else:
+                    bucket = 'later'
+                due[bucket] += count
+        open_count = self.by_status.get(OPEN, 0)
+        return {'total': self.total, 'open': open_count,
+                'completed': self.total - open_count,
+                'by_status': dict(self.by_status),
+                'by_category': {category: dict(counts) for category, counts
+                                in sorted(self.by_category.items())},
+                'by_priority': {priority: dict(counts) for priority, counts
+                                in sorted(self.by_priority.items())},
+                'due': due,
+                'overdue_by_priority': overdue_by_priority}
@@ -0,0 +1,128 @@
+"""
+Модуль содержит класс TaskArchive - архив (холодный уровень хранения) выполненных задач.
+
+Выполненные задачи со сроком старше заданного возраста переносятся из книги задач в архив,
+поэтому загрузка, сохранение и просмотр книги не платят за накопившуюся историю.
+
+Архив - файл JSON lines, сжатый gzip ('<книга задач>.archive.jsonl.gz'): одна задача - одна
+строка, каждая порция архивируемых задач дописывается отдельным членом gzip (дописывание
+не переписывает прежние данные). Рядом хранится маленький файл '<архив>.meta' с
+количеством задач и наибольшим id, который читается при запуске вместо архива, чтобы
+новые задачи не получали id архивных.
+
+Архив не загружается в память: поиск читает его потоково только тогда, когда запрос
+касается истории (статус "Выполнена" или явный поиск по архиву). Восстановление задач
+переписывает архив без восстановленных задач.
+
+Архив без имени файла (filename=None) хранится в памяти - для книг задач без файла
+(MemoryStorage), чтобы архивирование не создавало файлов на диске.
+"""
+
+import os
+import gzip
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from Task.file_utils import atomic_open
+from Task.metrics import METRICS
+
+
+class TaskArchive:
+    def __init__(self, filename: str) -> None:
+        """
+        Инициализация архива.
+
+        :param filename: Имя файла архива (None - архив в памяти).
+        """
+        self.filename: Optional[str] = filename
+        self.meta_filename: Optional[str] = f"{filename}.meta" if filename else None
+        self.count: int = 0
+        self.max_id: int = 0
+        self._memory: Optional[List[Dict[str, Any]]] = None
+        if filename is None:
+            self._memory = []
+            return
+        try:
+            with open(self.meta_filename, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self.count = meta['count']
+            self.max_id = meta['max_id']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def _write_meta(self) -> None:
+        if self._memory is not None:
+            return
+        with atomic_open(self.meta_filename, 'w', encoding='utf-8') as f:
+            json.dump({'count': self.count, 'max_id': self.max_id}, f)
+
+    @staticmethod
+    def _encode(tasks_data: Iterable[Dict[str, Any]]) -> bytes:
+        return ''.join(json.dumps(task_data, ensure_ascii=False,
+                                  separators=(',', ':')) + '\n'
+                       for task_data in tasks_data).encode('utf-8')
+
+    def append(self, tasks_data: List[Dict[str, Any]]) -> None:
+        """
+        Дописывает задачи в архив (одним членом gzip с fsync).
+
+        :param tasks_data: Словари задач (формат Task.to_dict).
+        """
+        if not tasks_data:
+            return
+        if self._memory is not None:
+            self._memory.extend(dict(task_data) for task_data in tasks_data)
+        else:
+            self._write(tasks_data)
+        self.count += len(tasks_data)
+        self.max_id = max(self.max_id, max(task_data['id']
+                                           for task_data in tasks_data))
+        self._write_meta()
+
+    def _write(self, tasks_data: List[Dict[str, Any]]) -> None:
+        data = gzip.compress(self._encode(tasks_data))
+        with open(self.filename, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        METRICS.inc('storage_written_bytes_total', len(data), backend='archive')
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """ Потоково возвращает словари задач архива (повторы одного id пропускаются) """
+        if self._memory is not None:
+            yield from (dict(task_data) for task_data in self._memory)
+            return
+        if not os.path.exists(self.filename):
+            return
+        seen = set()
+        with gzip.open(self.filename, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                task_data = json.loads(line)
+                if task_data['id'] not in seen:
+                    seen.add(task_data['id'])
+                    yield task_data
+
+    def remove(self, matches: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """
+        Удаляет из архива задачи, подходящие под условие (архив переписывается атомарно).
+
+        :param matches: Условие для словаря задачи.
+        :return: Удаленные словари задач.
+        """
+        kept: List[Dict[str, Any]] = []
+        removed: List[Dict[str, Any]] = []
+        for task_data in self:
+            (removed if matches(task_data) else kept).append(task_data)
+        if not removed:
+            return removed
+        if self._memory is not None:
+            self._memory = kept
+            self.count = len(kept)
+            return removed
+        with atomic_open(self.filename, 'wb') as f:
+            with gzip.GzipFile(fileobj=f, mode='wb') as archive:
+                archive.write(self._encode(kept))
+        self.count = len(kept)
+        self._write_meta()
+        return removed
@@ -0,0 +1,228 @@
+"""
+Модуль содержит двоичный формат снимка книги задач и хранилище на его основе.
+
+Структура файла (все числа little-endian):
+- заголовок: сигнатура b'TMBS', версия (u16), резерв (u16), количество задач (u32),
+  смещение таблицы (u64);
+- записи задач: длина записи (u32), id (i64) и поля title, description, category,
+  due_date, priority, status, каждое - длина (u32) и байты UTF-8;
+- таблица смещений: для каждой задачи id (i64), смещение записи (u64), длина записи (u32),
+  отсортирована по id.
+
+Класс BinarySnapshot открывает файл через mmap: при открытии читается только заголовок,
+а задача по id находится двоичным поиском по таблице и декодируется отдельно от остальных,
+поэтому операционная система подгружает только реально прочитанные страницы файла.
+Выборочное чтение (get) предназначено для инструментов, которым нужны отдельные задачи.
+TaskManager при загрузке через BinarySnapshotStorage декодирует все записи: вторичные
+индексы строятся по всем полям каждой задачи, поэтому отложить декодирование нельзя.
+При запуске формат экономит только разбор JSON (поля читаются по длинам, без парсера).
+Поврежденная запись приводит к StorageError, как и в остальных хранилищах.
+Функции json_to_binary и binary_to_json конвертируют снимок из JSON и обратно.
+
+Запуск конвертера: python -m Task.binary_snapshot to-binary|to-json <откуда> <куда>
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from Task.file_utils import atomic_open
+from Task.json_stream import iter_json_array
+from Task.storage import TaskStorage
+from Task.user_exception import StorageError
+
+MAGIC = b'TMBS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIQ')
+ENTRY = struct.Struct('<qQI')
+LENGTH = struct.Struct('<I')
+TASK_ID = struct.Struct('<q')
+STRING_FIELDS = ('title', 'description', 'category', 'due_date', 'priority',
+                 'status')
+
+
+def _encode_task(task_data: Dict[str, Any]) -> bytes:
+    parts = [TASK_ID.pack(task_data['id'])]
+    for field in STRING_FIELDS:
+        value = str(task_data[field]).encode('utf-8')
+        parts.append(LENGTH.pack(len(value)))
+        parts.append(value)
+    return b''.join(parts)
+
+
+def _decode_task(buffer: Any, offset: int, end: int) -> Dict[str, Any]:
+    task_data: Dict[str, Any] = {'id': TASK_ID.unpack_from(buffer, offset)[0]}
+    offset += TASK_ID.size
+    for field in STRING_FIELDS:
+        size = LENGTH.unpack_from(buffer, offset)[0]
+        offset += LENGTH.size
+        if offset + size > end:
+            raise ValueError("поле выходит за границу записи")
+        task_data[field] = bytes(buffer[offset:offset + size]).decode('utf-8')
+        offset += size
+    return task_data
+
+
+def write_snapshot(filename: str, tasks: Iterable[Dict[str, Any]]) -> int:
+    """
+    Атомарно записывает двоичный снимок задач.
+
+    :param filename: Имя файла снимка.
+    :param tasks: Словари задач (формат Task.to_dict).
+    :return: Количество записанных задач.
+    """
+    entries: List[tuple] = []
+    with atomic_open(filename, 'wb') as f:
+        f.write(b'\0' * HEADER.size)
+        offset = HEADER.size
+        for task_data in tasks:
+            record = _encode_task(task_data)
+            f.write(LENGTH.pack(len(record)))
+            f.write(record)
+            entries.append((task_data['id'], offset, len(record)))
+            offset += LENGTH.size + len(record)
+        entries.sort()
+        for entry in entries:
+            f.write(ENTRY.pack(*entry))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(entries), offset))
+    return len(entries)
+
+
+class BinarySnapshot:
+    def __init__(self, filename: str) -> None:
+        """
+        Открывает двоичный снимок через mmap.
+
+        :param filename: Имя файла снимка.
+        :raises StorageError: Если файл поврежден или имеет неизвестный формат.
+        """
+        self.filename: str = filename
+        self._file = open(filename, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+            if len(self._map) < HEADER.size:
+                raise ValueError("слишком короткий файл")
+            magic, version, _, self.count, self.table_offset = \
+                HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("неизвестный формат файла")
+            if self.table_offset + self.count * ENTRY.size > len(self._map):
+                raise ValueError("поврежденная таблица смещений")
+        except (OSError, ValueError) as e:
+            self._file.close()
+            raise StorageError(filename, e)
+
+    def _entry(self, position: int) -> tuple:
+        return ENTRY.unpack_from(self._map,
+                                 self.table_offset + position * ENTRY.size)
+
+    def _read(self, offset: int) -> Dict[str, Any]:
+        try:
+            size = LENGTH.unpack_from(self._map, offset)[0]
+            start = offset + LENGTH.size
+            if start + size > self.table_offset:
+                raise ValueError("запись выходит за границу данных")
+            return _decode_task(self._map, start, start + size)
+        except (struct.error, ValueError) as e:
+            raise StorageError(self.filename, e)
+
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Возвращает задачу по id без декодирования остальных записей.
+
+        :param task_id: ID задачи.
+        :raises StorageError: Если запись задачи повреждена.
+        :return: Словарь задачи или None, если задачи нет.
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            middle = (lo + hi) // 2
+            entry_id, offset, _ = self._entry(middle)
+            if entry_id == task_id:
+                return self._read(offset)
+            if entry_id < task_id:
+                lo = middle + 1
+            else:
+                hi = middle
+        return None
+
+    def ids(self) -> List[int]:
+        """ Возвращает id всех задач снимка по возрастанию """
+        return [self._entry(position)[0] for position in range(self.count)]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for position in range(self.count):
+            _, offset, _ = self._entry(position)
+            yield self._read(offset)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class BinarySnapshotStorage(TaskStorage):
+    def __init__(self, filename: str = 'tasks_book.bin') -> None:
+        """
+        Инициализация хранилища в двоичном снимке.
+
+        :param filename: Имя файла снимка.
+        """
+        self.filename: str = filename
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.filename):
+            return
+        with BinarySnapshot(self.filename) as snapshot:
+            yield from snapshot
+
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        write_snapshot(self.filename, (task.to_dict() for task in tasks))
+
+
+def json_to_binary(source: str, target: str) -> int:
+    """
+    Конвертирует книгу задач из JSON в двоичный снимок.
+
+    :param source: Файл JSON.
+    :param target: Файл двоичного снимка.
+    :return: Количество задач.
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        return write_snapshot(target, iter_json_array(f))
+
+
+def binary_to_json(source: str, target: str) -> int:
+    """
+    Конвертирует двоичный снимок в книгу задач JSON.
+
+    :param source: Файл двоичного снимка.
+    :param target: Файл JSON.
+    :return: Количество задач.
+    """
+    with BinarySnapshot(source) as snapshot:
+        data = list(snapshot)
+    with atomic_open(target, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    return len(data)
+
+
+if __name__ == "__main__":
+    commands = {'to-binary': json_to_binary, 'to-json': binary_to_json}
+    if len(sys.argv) != 4 or sys.argv[1] not in commands:
+        print("Использование: python -m Task.binary_snapshot to-binary|to-json <откуда> <куда>")
+        sys.exit(2)
+    count = commands[sys.argv[1]](sys.argv[2], sys.argv[3])
+    print(f"Сконвертировано задач: {count}")
@@ -0,0 +1,241 @@
+"""
+Модуль содержит потоковый массовый импорт и экспорт задач в форматах JSON lines, CSV и JSON.
+
+Импорт читает файл построчно и обрабатывает строки блоками по chunk_size: строки блока
+проверяются без выбрасывания исключений (ошибки собираются по номерам строк и не прерывают
+импорт; если файл CSV или JSON-массив поврежден так, что дальше читать нельзя, ошибка
+записывается с номером строки и импорт заканчивается на ней), корректные задачи получают id одним диапазоном от next_id (TaskManager.add_tasks).
+Весь импорт сохраняется в хранилище одной операцией (одна группа TaskManager.batch).
+
+Экспорт записывает задачи по одной в порядке id, не собирая весь файл в памяти.
+
+Поля строки: title, description, category, due_date, priority и необязательный status
+("Не выполнена" по умолчанию). id из файла не используется - задачи получают новые id.
+
+Форматы определяются по расширению файла: .jsonl/.ndjson - JSON lines, .csv - CSV,
+.json - JSON-массив (формат книги задач).
+"""
+
+import csv
+import sys
+import json
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from Task.file_utils import atomic_open
+from Task.json_stream import iter_json_array
+from Task.tasks_class import PRIORITY_RANK, parse_date
+from Task.user_exception import (NotInputError, InvalidPriorityError,
+                                 YearTaskError)
+
+FIELDS = ('title', 'description', 'category', 'due_date', 'priority', 'status')
+EXPORT_FIELDS = ('id',) + FIELDS
+STATUSES = ('Не выполнена', 'Выполнена')
+FORMATS = ('jsonl', 'csv', 'json')
+PARSE_ERRORS = {'jsonl': "Некорректный JSON", 'json': "Некорректный JSON",
+                'csv': "Некорректная строка CSV"}
+
+
+class ImportResult:
+    def __init__(self, max_errors: int) -> None:
+        """
+        Итог импорта.
+
+        :param max_errors: Сколько ошибок хранить подробно (остальные только считаются).
+        """
+        self.imported: int = 0
+        self.first_id: Optional[int] = None
+        self.last_id: Optional[int] = None
+        self.rows: int = 0
+        self.error_count: int = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.max_errors: int = max_errors
+
+    def add_error(self, row: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'error': message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'rows': self.rows, 'imported': self.imported,
+                'first_id': self.first_id, 'last_id': self.last_id,
+                'error_count': self.error_count, 'errors': self.errors}
+
+
+def detect_format(path: str, default: str = 'jsonl') -> str:
+    """ Формат файла по расширению ('-' и неизвестные расширения - default) """
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        return 'csv'
+    if lower.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lower.endswith('.json'):
+        return 'json'
+    return default
+
+
+def validate_row(row: Any, today: date,
+                 allow_past_due: bool = False) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+    """
+    Проверяет строку импорта без выбрасывания исключений (те же правила, что в интерактивном меню).
+
+    :param row: Словарь полей строки.
+    :param today: Текущая дата (срок выполнения должен быть позже неё).
+    :param allow_past_due: Разрешить срок выполнения в прошлом (перенос истории).
+    :return: (данные задачи, None) для корректной строки или (None, сообщение об ошибке).
+    """
+    if not isinstance(row, dict):
+        return None, "Строка должна быть объектом с полями задачи"
+    title = row.get('title')
+    if not title:
+        return None, str(NotInputError())
+    due = parse_date(row.get('due_date'))
+    if due is None:
+        return None, "Ошибка в формате даты"
+    if due <= today and not allow_past_due:
+        return None, str(YearTaskError())
+    priority = str(row.get('priority') or '').lower()
+    if priority not in PRIORITY_RANK:
+        return None, str(InvalidPriorityError(row.get('priority')))
+    status = row.get('status') or STATUSES[0]
+    if status not in STATUSES:
+        return None, f"Неизвестный статус - {status}"
+    return {'title': str(title),
+            'description': str(row.get('description') or ''),
+            'category': str(row.get('category') or ''),
+            'due_date': due.isoformat(), 'priority': priority,
+            'status': status}, None
+
+
+def _iter_rows(stream: IO[str], file_format: str) -> Iterator[Tuple[int, Any]]:
+    """ Номера и содержимое строк файла (ошибка разбора строки возвращается как исключение) """
+    if file_format in ('csv', 'json'):
+        rows = (csv.DictReader(stream) if file_format == 'csv'
+                else iter_json_array(stream))
+        number = 0
+        try:
+            for number, row in enumerate(rows, 1):
+                yield number, row
+        except (csv.Error, ValueError) as e:
+            # после ошибки разбора продолжить чтение нельзя: ошибка - последняя строка
+            yield number + 1, e
+    else:
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError as e:
+                yield number, e
+
+
+def import_tasks(task_manager: Any, source: Any, file_format: Optional[str] = None,
+                 chunk_size: int = 10_000, allow_past_due: bool = False,
+                 max_errors: int = 1000) -> ImportResult:
+    """
+    Потоково импортирует задачи в TaskManager.
+
+    :param task_manager: Менеджер задач.
+    :param source: Путь к файлу, '-' (стандартный ввод) или открытый текстовый поток.
+    :param file_format: jsonl, csv или json (по умолчанию по расширению файла).
+    :param chunk_size: Количество строк, обрабатываемых за один блок.
+    :param allow_past_due: Разрешить срок выполнения в прошлом.
+    :param max_errors: Сколько ошибок хранить подробно.
+    :raises ValueError: Если неизвестный формат.
+    :return: Итог импорта (количество задач, диапазон id, ошибки по строкам).
+    """
+    if isinstance(source, str):
+        file_format = file_format or detect_format(source)
+    file_format = file_format or 'jsonl'
+    if file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат - {file_format}")
+    result = ImportResult(max_errors)
+    today = date.today()
+    stream = _open(source, 'r')
+    try:
+        rows = _iter_rows(stream, file_format)
+        with task_manager.batch():
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                valid = []
+                for number, row in chunk:
+                    result.rows += 1
+                    if isinstance(row, Exception):
+                        result.add_error(number, f"{PARSE_ERRORS[file_format]}: {row}")
+                        continue
+                    task_data, error = validate_row(row, today, allow_past_due)
+                    if error:
+                        result.add_error(number, error)
+                    else:
+                        valid.append(task_data)
+                if valid:
+                    ids = task_manager.add_tasks(valid)
+                    if result.first_id is None:
+                        result.first_id = ids[0]
+                    result.last_id = ids[-1]
+                    result.imported += len(ids)
+    finally:
+        if stream is not source and stream is not sys.stdin:
+            stream.close()
+    return result
+
+
+def export_tasks(task_manager: Any, target: Any,
+                 file_format: Optional[str] = None,
+                 tasks: Optional[Iterable[Any]] = None) -> int:
+    """
+    Потоково экспортирует задачи в порядке id.
+
+    :param task_manager: Менеджер задач.
+    :param target: Путь к файлу (записывается атомарно), '-' (стандартный вывод) или текстовый поток.
+    :param file_format: jsonl, csv или json (по умолчанию по расширению файла).
+    :param tasks: Экспортируемые задачи (по умолчанию все задачи снимка).
+    :raises ValueError: Если неизвестный формат.
+    :return: Количество экспортированных задач.
+    """
+    if isinstance(target, str):
+        file_format = file_format or detect_format(target)
+    file_format = file_format or 'jsonl'
+    if file_format not in FORMATS:
+        raise ValueError(f"Неизвестный формат - {file_format}")
+    if tasks is None:
+        snapshot = task_manager.snapshot()
+        tasks = (snapshot[task_id] for task_id in sorted(snapshot))
+    if isinstance(target, str) and target != '-':
+        with atomic_open(target, 'w', encoding='utf-8') as f:
+            return _write(f, file_format, tasks)
+    return _write(sys.stdout if target == '-' else target, file_format, tasks)
+
+
+def _write(stream: IO[str], file_format: str, tasks: Iterable[Any]) -> int:
+    count = 0
+    if file_format == 'csv':
+        writer = csv.DictWriter(stream, EXPORT_FIELDS)
+        writer.writeheader()
+        for task in tasks:
+            writer.writerow(task.to_dict())
+            count += 1
+        return count
+    if file_format == 'json':
+        stream.write('[')
+    for task in tasks:
+        line = json.dumps(task.to_dict(), ensure_ascii=False)
+        if file_format == 'json':
+            stream.write(',\n' if count else '\n')
+            stream.write(line)
+        else:
+            stream.write(line + '\n')
+        count += 1
+    if file_format == 'json':
+        stream.write('\n]\n')
+    return count
+
+
+def _open(source: Any, mode: str) -> IO[str]:
+    if source == '-':
+        return sys.stdin
+    if isinstance(source, str):
+        return open(source, mode, encoding='utf-8', newline='')
+    return source
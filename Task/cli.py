@@ -0,0 +1,347 @@
+"""
+Модуль содержит неинтерактивный интерфейс командной строки для TaskManager.
+
+Подкоманды: add, update, complete, delete, search, list, import, export (потоковый
+массовый импорт и экспорт в JSON lines, CSV и JSON - модуль bulk_io), archive и restore
+(перенос выполненных задач в архив и обратно). Результат каждой
+команды выводится одной строкой JSON ({"ok": true, "command": ..., ...} или
+{"ok": false, "error": ...}), поэтому вывод удобно разбирать в скриптах; --format text
+выводит то же самое в читаемом виде.
+
+Режим --batch читает команды (по одной в строке, в том же синтаксисе, что и подкоманды)
+из файла или стандартного ввода ('-'): книга задач загружается один раз, все изменения
+сохраняются одной записью в конце, а ошибка в одной команде не прерывает остальные
+(--help в строке пакета возвращает справку результатом этой строки: {"ok": true, "help": ...}).
+
+Примеры:
+    python main.py add --title "Отчет" --category Работа --due-date 2030-01-31 --priority высокий
+    python main.py list --category Работа
+    python main.py --batch commands.txt
+    python main.py --profile search отчет
+    python main.py search --ranked "отчот квартал" --limit 5
+"""
+
+import sys
+import json
+import shlex
+import argparse
+import logging
+from contextlib import nullcontext
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional
+from Task.TaskManager import TaskManager
+from Task.tasks_class import Task
+from Task.bulk_io import FORMATS, import_tasks, export_tasks
+from Task.metrics import profiled
+from Task.user_exception import TaskError, NotTaskError, NotInputError
+
+
+class _HelpRequested(Exception):
+    """ Запрошена справка (--help): текст справки вместо завершения процесса """
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    """ Парсер, который выбрасывает исключения вместо вывода и завершения процесса """
+
+    def error(self, message: str) -> None:
+        raise ValueError(message)
+
+    def print_help(self, file: Optional[IO[str]] = None) -> None:
+        raise _HelpRequested(self.format_help())
+
+    def exit(self, status: int = 0, message: Optional[str] = None) -> None:
+        raise ValueError(message or f"завершение с кодом {status}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """ Создает парсер аргументов командной строки со всеми подкомандами """
+    parser = _ArgumentParser(prog='main.py',
+                             description="Менеджер задач (без аргументов - интерактивное меню)")
+    parser.add_argument('--file', default='tasks_book.json',
+                        help="файл книги задач")
+    parser.add_argument('--journal', action='store_true',
+                        help="сохранять изменения через журнал")
+    parser.add_argument('--format', choices=['json', 'text'], default='json',
+                        help="формат вывода")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="выполнить команды из файла ('-' - из стандартного ввода)")
+    parser.add_argument('--profile', action='store_true',
+                        help="вывести профиль (cProfile, tracemalloc) в stderr")
+    commands = parser.add_subparsers(dest='command', parser_class=_ArgumentParser)
+
+    add = commands.add_parser('add', help="добавить задачу")
+    add.add_argument('--title', required=True)
+    add.add_argument('--description', default='')
+    add.add_argument('--category', required=True)
+    add.add_argument('--due-date', required=True, help="ГГГГ-ММ-ДД")
+    add.add_argument('--priority', required=True,
+                     help="низкий, средний или высокий")
+
+    update = commands.add_parser('update', help="изменить задачу")
+    update.add_argument('id')
+    for field in ('title', 'description', 'category', 'due-date', 'priority'):
+        update.add_argument(f'--{field}')
+
+    complete = commands.add_parser('complete', help="отметить задачу выполненной")
+    complete.add_argument('id')
+
+    delete = commands.add_parser('delete', help="удалить задачу или категорию")
+    target = delete.add_mutually_exclusive_group(required=True)
+    target.add_argument('--id')
+    target.add_argument('--category')
+
+    for name, help_text in (('search', "найти задачи"),
+                            ('list', "показать задачи")):
+        command = commands.add_parser(name, help=help_text)
+        if name == 'search':
+            command.add_argument('keyword', nargs='?')
+            command.add_argument('--ranked', action='store_true',
+                                 help="по релевантности с учетом опечаток")
+        command.add_argument('--category')
+        command.add_argument('--status')
+        command.add_argument('--priority')
+        command.add_argument('--due-from')
+        command.add_argument('--due-to')
+        command.add_argument('--order-by', default='id')
+        command.add_argument('--descending', action='store_true')
+        command.add_argument('--limit', type=int)
+        command.add_argument('--offset', type=int, default=0)
+        command.add_argument('--archive', action='store_true',
+                             help="искать также в архиве выполненных задач")
+        if name == 'list':
+            command.add_argument('--all', action='store_true',
+                                 help="включая выполненные задачи")
+
+    archive = commands.add_parser('archive',
+                                  help="перенести старые выполненные задачи в архив")
+    archive.add_argument('--older-than', type=int, default=0, metavar='DAYS',
+                         help="возраст срока выполнения в днях")
+
+    restore = commands.add_parser('restore', help="вернуть задачи из архива")
+    restore.add_argument('ids', nargs='*')
+    restore.add_argument('--category')
+
+    import_command = commands.add_parser('import', help="импортировать задачи")
+    import_command.add_argument('path', help="файл JSON lines, CSV или JSON ('-' - стандартный ввод)")
+    import_command.add_argument('--file-format', choices=FORMATS,
+                                help="формат файла (по умолчанию по расширению)")
+    import_command.add_argument('--chunk-size', type=int, default=10_000,
+                                help="количество строк, проверяемых за один блок")
+    import_command.add_argument('--allow-past', action='store_true',
+                                help="разрешить срок выполнения в прошлом")
+
+    export = commands.add_parser('export', help="экспортировать задачи")
+    export.add_argument('path', nargs='?', default='-',
+                        help="файл JSON lines, CSV или JSON ('-' - стандартный вывод)")
+    export.add_argument('--file-format', choices=FORMATS,
+                        help="формат файла (по умолчанию по расширению)")
+    return parser
+
+
+def _check_task_id(task_manager: TaskManager, task_id: str) -> None:
+    task_manager.checking_isdigit(task_id)
+    task_manager.checking_for_empty_id(task_id)
+
+
+def _add(task_manager: TaskManager, task_data: Dict[str, Any]) -> Task:
+    """ Проверяет данные задачи так же, как интерактивное меню, и добавляет задачу """
+    task_manager.checking_for_empty_data(task_data.get('title'))
+    task_manager.task_date_check(task_data.get('due_date'))
+    task_manager.checking_priority(task_data.get('priority'))
+    task_id = task_manager.next_id
+    task_manager.add_task(task_data['title'], task_data.get('description', ''),
+                          task_data['category'], task_data['due_date'],
+                          task_data['priority'])
+    return task_manager.tasks[task_id]
+
+
+def execute(task_manager: TaskManager, args: argparse.Namespace,
+            stdin: IO[str] = sys.stdin,
+            stdout: IO[str] = sys.stdout) -> Dict[str, Any]:
+    """
+    Выполняет одну разобранную команду.
+
+    :param task_manager: Менеджер задач.
+    :param args: Разобранные аргументы подкоманды.
+    :param stdin: Стандартный ввод (для import -).
+    :param stdout: Стандартный вывод (для export -).
+    :raises TaskError: Если данные задачи неверны или задача не найдена.
+    :raises ValueError: Если неверный формат даты или аргументов.
+    :return: Результат команды (словарь для вывода).
+    """
+    command = args.command
+    if command == 'add':
+        task = _add(task_manager, {'title': args.title,
+                                   'description': args.description,
+                                   'category': args.category,
+                                   'due_date': args.due_date,
+                                   'priority': args.priority})
+        return {'task': task.to_dict()}
+    if command == 'update':
+        _check_task_id(task_manager, args.id)
+        fields = {field: getattr(args, field) for field in
+                  ('title', 'description', 'category', 'due_date', 'priority')
+                  if getattr(args, field)}
+        if 'due_date' in fields:
+            task_manager.task_date_check(fields['due_date'])
+        if 'priority' in fields:
+            task_manager.checking_priority(fields['priority'])
+        task_manager.update_task(args.id, fields)
+        return {'task': task_manager.tasks[int(args.id)].to_dict()}
+    if command == 'complete':
+        _check_task_id(task_manager, args.id)
+        task_manager.mark_task_completed(args.id)
+        return {'task': task_manager.tasks[int(args.id)].to_dict()}
+    if command == 'delete':
+        if args.id is not None:
+            _check_task_id(task_manager, args.id)
+            task_manager.delete_task(args.id)
+            return {'deleted': [int(args.id)]}
+        ids = sorted(task_manager.category_index.get(args.category))
+        task_manager.delete_task('', args.category)
+        return {'deleted': ids}
+    if command in ('search', 'list'):
+        status = args.status
+        if command == 'search' and not any((args.keyword, args.category, status,
+                                            args.priority, args.due_from,
+                                            args.due_to)):
+            raise NotInputError
+        if getattr(args, 'ranked', False):
+            try:
+                tasks = task_manager.ranked_search(args.keyword, args.limit,
+                                                   args.category, status,
+                                                   args.priority)
+            except NotTaskError:
+                tasks = []
+            return {'count': len(tasks),
+                    'tasks': [task.to_dict() for task in tasks]}
+        if command == 'list' and not args.all and status is None:
+            status = 'Не выполнена'
+        tasks = task_manager.query(getattr(args, 'keyword', None),
+                                   args.category, status, args.priority,
+                                   args.due_from, args.due_to, args.order_by,
+                                   args.descending, args.limit, args.offset,
+                                   args.archive)
+        return {'count': len(tasks), 'tasks': [task.to_dict() for task in tasks]}
+    if command == 'archive':
+        return {'archived': task_manager.archive_completed(args.older_than)}
+    if command == 'restore':
+        for task_id in args.ids:
+            task_manager.checking_isdigit(task_id)
+        tasks = task_manager.restore_archived(args.ids, args.category)
+        return {'count': len(tasks), 'tasks': [task.to_dict() for task in tasks]}
+    if command == 'import':
+        result = import_tasks(task_manager,
+                              stdin if args.path == '-' else args.path,
+                              args.file_format, args.chunk_size,
+                              args.allow_past)
+        return result.to_dict()
+    if command == 'export':
+        count = export_tasks(task_manager,
+                             stdout if args.path == '-' else args.path,
+                             args.file_format)
+        return {'exported': count}
+    raise ValueError("Не указана команда")
+
+
+def _result(command: Optional[str], func: Any) -> Dict[str, Any]:
+    """ Выполняет команду и оборачивает результат или ошибку в словарь ответа """
+    try:
+        return {'ok': True, 'command': command, **func()}
+    except (TaskError, ValueError, OSError) as e:
+        logging.error("%s %s", command, e)
+        return {'ok': False, 'command': command, 'error': str(e)}
+
+
+def run_batch(task_manager: TaskManager, lines: Iterable[str],
+              stdin: IO[str] = sys.stdin,
+              stdout: IO[str] = sys.stdout) -> Iterator[Dict[str, Any]]:
+    """
+    Выполняет команды (по одной в строке) одной группой сохранения.
+
+    Пустые строки и строки, начинающиеся с '#', пропускаются.
+    :param task_manager: Менеджер задач.
+    :param lines: Строки команд.
+    :return: Итератор результатов команд.
+    """
+    parser = build_parser()
+    with task_manager.batch():
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            try:
+                args = parser.parse_args(shlex.split(line))
+            except _HelpRequested as e:
+                yield {'ok': True, 'command': line.split()[0], 'help': str(e)}
+                continue
+            except ValueError as e:
+                yield {'ok': False, 'command': line.split()[0], 'error': str(e)}
+                continue
+            yield _result(args.command,
+                          lambda: execute(task_manager, args, stdin, stdout))
+
+
+def _print(result: Dict[str, Any], output_format: str, stdout: IO[str]) -> None:
+    if output_format == 'json':
+        stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+        return
+    if not result['ok']:
+        stdout.write(f"Ошибка ({result['command']}): {result['error']}\n")
+        return
+    if 'help' in result:
+        stdout.write(result['help'])
+        return
+    for task in result.get('tasks', [result['task']] if 'task' in result else []):
+        stdout.write(f"{task['id']}\t{task['title']}\t{task['category']}\t"
+                     f"{task['due_date']}\t{task['priority']}\t{task['status']}\n")
+    for key in ('count', 'deleted', 'archived', 'imported', 'exported', 'errors'):
+        if key in result:
+            stdout.write(f"{key}: {result[key]}\n")
+
+
+def main(argv: Optional[List[str]] = None, stdin: IO[str] = sys.stdin,
+         stdout: IO[str] = sys.stdout, stderr: IO[str] = sys.stderr) -> int:
+    """
+    Точка входа командной строки.
+
+    :param argv: Аргументы (по умолчанию sys.argv[1:]).
+    :return: Код завершения: 0 - все команды успешны, 1 - были ошибки, 2 - неверные аргументы.
+    """
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except _HelpRequested as e:
+        stdout.write(str(e))
+        return 0
+    except ValueError as e:
+        stderr.write(f"{parser.format_usage()}{parser.prog}: ошибка: {e}\n")
+        return 2
+    if args.command is None and args.batch is None:
+        stderr.write(parser.format_usage())
+        return 2
+    task_manager = TaskManager(args.file, journal=args.journal)
+    ok = True
+    with profiled(memory=True) if args.profile else nullcontext() as profile:
+        if args.batch is not None:
+            source = stdin if args.batch == '-' else open(args.batch,
+                                                          encoding='utf-8')
+            try:
+                for result in run_batch(task_manager, source, stdin, stdout):
+                    ok = ok and result['ok']
+                    _print(result, args.format, stdout)
+            finally:
+                if source is not stdin:
+                    source.close()
+        else:
+            with task_manager.batch():
+                result = _result(args.command, lambda: execute(
+                    task_manager, args, stdin, stdout))
+            ok = result['ok']
+            if args.command != 'export' or args.path != '-':
+                _print(result, args.format, stdout)
+    task_manager.close()
+    if profile is not None:
+        stderr.write(profile.text)
+        stderr.write(f"Пик памяти: {profile.memory_peak} байт\n")
+        stderr.writelines(line + '\n' for line in profile.top_allocations)
+    return 0 if ok else 1
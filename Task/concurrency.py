@@ -0,0 +1,119 @@
+"""
+Модуль содержит блокировку чтения/записи RWLock и декораторы read_locked / write_locked
+для методов TaskManager.
+
+RWLock допускает одновременную работу многих читателей, а писатели выполняются по одному.
+Ожидающий писатель блокирует вход новых читателей, поэтому поток записей не голодает
+при постоянном чтении. Блокировка реентерабельна: поток, уже владеющий блокировкой
+на чтение или на запись, может захватить её повторно (например, search_tasks вызывает query),
+а владелец блокировки на запись может также читать. Повышение блокировки с чтения
+до записи не поддерживается.
+
+NullRWLock - пустая блокировка с тем же интерфейсом для однопоточного режима.
+"""
+
+import functools
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, Optional
+
+
+class RWLock:
+    def __init__(self) -> None:
+        """ Инициализация блокировки чтения/записи """
+        self._condition = threading.Condition(threading.Lock())
+        self._readers: int = 0
+        self._writer: Optional[int] = None
+        self._writer_depth: int = 0
+        self._writers_waiting: int = 0
+        self._local = threading.local()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """ Захватывает блокировку на чтение на время выполнения блока with """
+        me = threading.get_ident()
+        depth = getattr(self._local, 'depth', 0)
+        if depth or self._writer == me:
+            # повторный вход читателя или чтение внутри записи
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        with self._condition:
+            while self._writer is not None or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """
+        Захватывает блокировку на запись на время выполнения блока with.
+
+        :raises RuntimeError: Если поток держит блокировку только на чтение.
+        """
+        me = threading.get_ident()
+        with self._condition:
+            if self._writer == me:
+                self._writer_depth += 1
+            else:
+                if getattr(self._local, 'depth', 0):
+                    raise RuntimeError("Нельзя повысить блокировку чтения до записи")
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._condition.wait()
+                finally:
+                    self._writers_waiting -= 1
+                self._writer = me
+                self._writer_depth = 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._condition.notify_all()
+
+
+class NullRWLock:
+    """ Пустая блокировка чтения/записи (однопоточный режим) """
+
+    def read(self) -> ContextManager:
+        return nullcontext()
+
+    def write(self) -> ContextManager:
+        return nullcontext()
+
+
+def read_locked(method: Callable) -> Callable:
+    """ Декоратор: выполняет метод под блокировкой self._rwlock на чтение """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._rwlock.read():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def write_locked(method: Callable) -> Callable:
+    """ Декоратор: выполняет метод под блокировкой self._rwlock на запись """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._rwlock.write():
+            return method(self, *args, **kwargs)
+
+    return wrapper
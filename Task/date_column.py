@@ -0,0 +1,188 @@
+"""
+Модуль содержит класс DueDateColumn - упакованный столбец сроков выполнения задач
+для векторных выборок по датам.
+
+Для каждой задачи в отдельных плотных массивах хранятся ординал срока выполнения
+(0 - некорректная дата), состояние (активна, выполнена, свободная ячейка) и ранг приоритета.
+Задача занимает одну ячейку; ячейки удаленных задач переиспользуются. Если установлен NumPy,
+массивы - numpy.ndarray, и выборки (маска просроченных задач, количество задач со сроком
+в ближайшие N дней, гистограмма по неделям) вычисляются векторно за один проход по массиву
+без создания объектов Python на каждую задачу. Без NumPy используются массивы модуля array
+(тот же компактный формат в памяти) и обычные циклы.
+
+Столбец подключается к TaskManager как вторичный индекс (add / remove) и обновляется при
+каждом изменении задачи. Формат файла задач на диске не меняется.
+"""
+
+from array import array
+from datetime import date
+from typing import Any, Dict, List, Optional
+from Task.tasks_class import PRIORITY_RANK
+
+try:
+    import numpy
+except ImportError:  # NumPy необязателен
+    numpy = None
+
+OPEN, DONE, FREE = 0, 1, -1
+NO_DATE = 0
+
+
+class DueDateColumn:
+    def __init__(self, use_numpy: Optional[bool] = None,
+                 capacity: int = 1024) -> None:
+        """
+        Инициализация пустого столбца.
+
+        :param use_numpy: Использовать NumPy (None - если установлен).
+        :param capacity: Начальная емкость массивов NumPy (растет удвоением).
+        """
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy не установлен")
+        self.numpy: bool = numpy is not None if use_numpy is None else use_numpy
+        self.fields = ('due_date', 'status', 'priority')
+        self._slots: Dict[int, int] = {}
+        self._free: List[int] = []
+        self._size: int = 0
+        capacity = max(capacity, 1)
+        if self.numpy:
+            self.ordinals = numpy.zeros(capacity, dtype=numpy.int32)
+            self.states = numpy.full(capacity, FREE, dtype=numpy.int8)
+            self.ranks = numpy.zeros(capacity, dtype=numpy.int8)
+            self.ids = numpy.zeros(capacity, dtype=numpy.int64)
+        else:
+            self.ordinals = array('i')
+            self.states = array('b')
+            self.ranks = array('b')
+            self.ids = array('q')
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _allocate(self) -> int:
+        if self._free:
+            return self._free.pop()
+        slot = self._size
+        self._size += 1
+        if not self.numpy:
+            self.ordinals.append(NO_DATE)
+            self.states.append(FREE)
+            self.ranks.append(0)
+            self.ids.append(0)
+        elif slot == len(self.ordinals):
+            self.ordinals = numpy.concatenate(
+                [self.ordinals, numpy.zeros_like(self.ordinals)])
+            self.states = numpy.concatenate(
+                [self.states, numpy.full_like(self.states, FREE)])
+            self.ranks = numpy.concatenate(
+                [self.ranks, numpy.zeros_like(self.ranks)])
+            self.ids = numpy.concatenate([self.ids, numpy.zeros_like(self.ids)])
+        return slot
+
+    def add(self, task: Any) -> None:
+        """ Записывает задачу в свободную ячейку """
+        slot = self._allocate()
+        self._slots[task.id] = slot
+        self.ordinals[slot] = task.due_ordinal or NO_DATE
+        self.states[slot] = OPEN if task.status == 'Не выполнена' else DONE
+        self.ranks[slot] = PRIORITY_RANK.get(task.priority.lower(), 0)
+        self.ids[slot] = task.id
+
+    def remove(self, task: Any) -> None:
+        """ Освобождает ячейку задачи """
+        slot = self._slots.pop(task.id, None)
+        if slot is None:
+            return
+        self.states[slot] = FREE
+        self._free.append(slot)
+
+    def _min_rank(self, priority: Optional[str]) -> int:
+        if priority is None:
+            return 0
+        if priority.lower() not in PRIORITY_RANK:
+            raise ValueError(f"Такого приоритета нет - {priority}")
+        return PRIORITY_RANK[priority.lower()]
+
+    def overdue_mask(self, today: date, priority: Optional[str] = None) -> Any:
+        """
+        Маска ячеек активных просроченных задач (срок раньше today).
+
+        :param today: Текущая дата.
+        :param priority: Учитывать только задачи с этим приоритетом или выше.
+        :return: numpy.ndarray из bool или список bool (без NumPy) по ячейкам столбца.
+        """
+        size, lo = self._size, self._min_rank(priority)
+        ordinal = today.toordinal()
+        if self.numpy:
+            ordinals = self.ordinals[:size]
+            return ((self.states[:size] == OPEN) & (ordinals != NO_DATE) &
+                    (ordinals < ordinal) & (self.ranks[:size] >= lo))
+        return [state == OPEN and NO_DATE != due < ordinal and rank >= lo
+                for state, due, rank in zip(self.states, self.ordinals,
+                                            self.ranks)]
+
+    def overdue_count(self, today: date, priority: Optional[str] = None) -> int:
+        """ Количество активных просроченных задач """
+        mask = self.overdue_mask(today, priority)
+        return int(mask.sum()) if self.numpy else sum(mask)
+
+    def overdue_ids(self, today: date, priority: Optional[str] = None) -> List[int]:
+        """ Идентификаторы активных просроченных задач по возрастанию """
+        mask = self.overdue_mask(today, priority)
+        if self.numpy:
+            return sorted(self.ids[:self._size][mask].tolist())
+        return sorted(task_id for task_id, hit in zip(self.ids, mask) if hit)
+
+    def due_within_count(self, days: int, today: date,
+                         priority: Optional[str] = None) -> int:
+        """
+        Количество активных задач со сроком от today до today + days (включительно).
+
+        :param days: Количество дней.
+        :param today: Текущая дата.
+        :param priority: Учитывать только задачи с этим приоритетом или выше.
+        """
+        size, lo = self._size, self._min_rank(priority)
+        start = today.toordinal()
+        end = start + days
+        if self.numpy:
+            ordinals = self.ordinals[:size]
+            return int(((self.states[:size] == OPEN) & (ordinals >= start) &
+                        (ordinals <= end) & (self.ranks[:size] >= lo)).sum())
+        return sum(1 for state, due, rank in zip(self.states, self.ordinals,
+                                                 self.ranks)
+                   if state == OPEN and start <= due <= end and rank >= lo)
+
+    def weekly_histogram(self, include_completed: bool = False) -> Dict[date, int]:
+        """
+        Количество задач по неделям срока выполнения.
+
+        :param include_completed: Учитывать выполненные задачи.
+        :return: Понедельник недели -> количество задач (по возрастанию даты, задачи без даты не учитываются).
+        """
+        size = self._size
+        # ординал 1 (01.01.0001) - понедельник, поэтому (ординал - 1) // 7 - номер недели
+        if self.numpy:
+            states = self.states[:size]
+            mask = (states == OPEN) | ((states == DONE) & include_completed)
+            ordinals = self.ordinals[:size]
+            weeks = (ordinals[mask & (ordinals != NO_DATE)] - 1) // 7
+            numbers, counts = numpy.unique(weeks, return_counts=True)
+            pairs = zip(numbers.tolist(), counts.tolist())
+        else:
+            histogram: Dict[int, int] = {}
+            for state, due in zip(self.states, self.ordinals):
+                if due != NO_DATE and (state == OPEN or
+                                       state == DONE and include_completed):
+                    week = (due - 1) // 7
+                    histogram[week] = histogram.get(week, 0) + 1
+            pairs = sorted(histogram.items())
+        return {date.fromordinal(week * 7 + 1): count for week, count in pairs}
+
+    def nbytes(self) -> int:
+        """ Размер массивов столбца в байтах """
+        if self.numpy:
+            return sum(column.nbytes for column in
+                       (self.ordinals, self.states, self.ranks, self.ids))
+        return sum(column.itemsize * len(column) for column in
+                   (self.ordinals, self.states, self.ranks, self.ids))
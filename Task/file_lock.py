@@ -0,0 +1,52 @@
+"""
+Модуль содержит класс FileLock - рекомендательную (advisory) блокировку файла между процессами.
+
+Блокировка берется на отдельном файле '<имя>.lock' через fcntl.flock (Linux, macOS)
+или msvcrt.locking (Windows). Поддерживаются разделяемая блокировка для чтения
+(несколько читателей одновременно) и исключительная для записи. На Windows любая
+блокировка исключительная.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    def __init__(self, filename: str) -> None:
+        """
+        Инициализация блокировки.
+
+        :param filename: Имя файла блокировки.
+        """
+        self.filename: str = filename
+
+    @contextmanager
+    def acquire(self, shared: bool = False) -> Iterator[None]:
+        """
+        Захватывает блокировку на время выполнения блока with (ожидая её освобождения).
+
+        :param shared: Разделяемая блокировка (для чтения) вместо исключительной.
+        """
+        fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
@@ -0,0 +1,58 @@
+"""
+Модуль содержит вспомогательные функции для надёжной записи файлов.
+
+Функция atomic_open открывает временный файл рядом с целевым, а после успешной записи
+выполняет fsync и атомарно заменяет им целевой файл (os.replace). Если во время записи
+произошла ошибка или сбой, прежний файл остаётся нетронутым, а временный файл удаляется.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator
+
+
+def fsync_directory(path: str) -> None:
+    """
+    Сбрасывает на диск запись каталога (нужно, чтобы переименование пережило сбой питания).
+
+    :param path: Путь к каталогу.
+    """
+    if os.name != 'posix':
+        return
+    fd = os.open(path or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(filename: str, mode: str = 'w',
+                encoding: str = 'utf-8') -> Iterator[IO]:
+    """
+    Открывает файл для атомарной записи через временный файл, fsync и rename.
+
+    :param filename: Имя целевого файла.
+    :param mode: Режим открытия ('w' или 'wb').
+    :param encoding: Кодировка для текстового режима.
+    :return: Файловый объект временного файла.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{os.path.basename(filename)}.", suffix='.tmp', dir=directory)
+    try:
+        if 'b' in mode:
+            f = os.fdopen(fd, mode)
+        else:
+            f = os.fdopen(fd, mode, encoding=encoding)
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, filename)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+    fsync_directory(directory)
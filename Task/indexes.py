@@ -0,0 +1,80 @@
+"""
+Модуль содержит класс FieldIndex - вторичный хеш-индекс по одному полю задачи.
+
+Индекс хранит соответствие "значение поля -> идентификаторы задач" и обновляется
+инкрементально методами add и remove при каждом изменении книги задач в TaskManager.
+Поэтому выборки по категории, статусу или приоритету стоят пропорционально размеру
+результата, а не количеству всех задач.
+
+Для хранения идентификаторов используется словарь со значениями None (упорядоченное множество).
+"""
+
+from typing import Dict, List, Any
+
+
+class FieldIndex:
+    def __init__(self, field: str) -> None:
+        """
+        Инициализация индекса.
+
+        :param field: Название поля задачи (category, status, priority).
+        """
+        self.field: str = field
+        self.fields = (field,)
+        self.values: Dict[str, Dict[int, None]] = {}
+
+    def add(self, task: Any) -> None:
+        """ Добавляет задачу в индекс """
+        value = getattr(task, self.field)
+        self.values.setdefault(value, {})[task.id] = None
+
+    def remove(self, task: Any) -> None:
+        """ Удаляет задачу из индекса """
+        value = getattr(task, self.field)
+        ids = self.values.get(value)
+        if ids is None:
+            return
+        ids.pop(task.id, None)
+        if not ids:
+            del self.values[value]
+
+    def clear(self) -> None:
+        """ Очищает индекс """
+        self.values.clear()
+
+    def get(self, value: str) -> Dict[int, None]:
+        """
+        Возвращает идентификаторы задач с точным значением поля.
+
+        :param value: Значение поля.
+        :return: Упорядоченное множество идентификаторов.
+        """
+        return self.values.get(value, {})
+
+    def get_casefold(self, value: str) -> List[int]:
+        """
+        Возвращает идентификаторы задач, у которых значение поля совпадает без учета регистра.
+
+        Перебираются только различные значения поля, а не все задачи.
+        :param value: Значение поля.
+        :return: Список идентификаторов.
+        """
+        value = value.lower()
+        ids: List[int] = []
+        for key, key_ids in self.values.items():
+            if key.lower() == value:
+                ids.extend(key_ids)
+        return ids
+
+    def estimate_casefold(self, value: str) -> int:
+        """ Возвращает количество задач, у которых значение поля совпадает без учета регистра """
+        value = value.lower()
+        return sum(len(ids) for key, ids in self.values.items()
+                   if key.lower() == value)
+
+    def count(self, value: str) -> int:
+        """ Возвращает количество задач с точным значением поля """
+        return len(self.values.get(value, ()))
+
+    def __len__(self) -> int:
+        return len(self.values)
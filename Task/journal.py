@@ -0,0 +1,141 @@
+"""
+Модуль содержит класс TaskJournal - журнал изменений (append-only) для книги задач.
+
+Вместо перезаписи всего файла tasks_book.json при каждом изменении TaskManager
+дописывает в журнал одну компактную запись (одна строка JSON) на каждую операцию:
+- {"op": "add", "task": {...}} - добавление задачи;
+- {"op": "patch", "id": 1, "fields": {...}} - изменение полей задачи;
+- {"op": "complete", "id": 1} - отметка задачи как выполненной;
+- {"op": "delete", "ids": [1, 2]} - удаление задач.
+
+При загрузке TaskManager сначала читает снимок (tasks_book.json), затем повторяет
+записи журнала. Когда журнал превышает порог по количеству записей или по размеру,
+выполняется компактизация: записывается новый снимок, а журнал очищается.
+Все операции идемпотентны, поэтому повторное применение журнала поверх нового снимка
+(например, после сбоя между записью снимка и очисткой журнала) безопасно.
+"""
+
+import json
+import os
+import logging
+from typing import Any, Dict, Iterable, Iterator
+from Task.lexicon import LEXICON_LOG
+from Task.metrics import METRICS
+
+
+class TaskJournal:
+    def __init__(self, filename: str, max_records: int = 1000,
+                 max_bytes: int = 1024 * 1024) -> None:
+        """
+        Инициализация журнала изменений.
+
+        :param filename: Имя файла журнала.
+        :param max_records: Количество записей, после которого нужна компактизация.
+        :param max_bytes: Размер журнала в байтах, после которого нужна компактизация.
+        """
+        self.filename: str = filename
+        self.max_records: int = max_records
+        self.max_bytes: int = max_bytes
+        self.records: int = 0
+        self.size: int = 0
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """
+        Дописывает одну запись в конец журнала.
+
+        :param record: Запись об изменении задачи.
+        """
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """
+        Дописывает группу записей в конец журнала одной записью на диск с fsync.
+        Если журнал заканчивается недописанной строкой (сбой во время записи), перед записями
+        добавляется перевод строки.
+
+        :param records: Записи об изменениях задач.
+        """
+        lines = [json.dumps(record, ensure_ascii=False,
+                            separators=(',', ':')) + '\n'
+                 for record in records]
+        if not lines:
+            return
+        data = ''.join(lines).encode('utf-8')
+        with open(self.filename, 'a+b') as f:
+            # после сбоя журнал может заканчиваться недописанной строкой: новая запись
+            # начинается с новой строки, чтобы не склеиться с ней и не потеряться при replay
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    data = b'\n' + data
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.records += len(lines)
+        self.size += len(data)
+        METRICS.inc('storage_written_bytes_total', len(data), backend='journal')
+
+    def replay(self, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Последовательно возвращает записи журнала.
+
+        Недописанная (повреждённая) запись пропускается и записывается в лог.
+        :param offset: Смещение в байтах, с которого читать журнал (0 - с начала).
+        :return: Итератор записей журнала.
+        """
+        if offset == 0:
+            self.records = 0
+        self.size = offset
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                self.size += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                    logging.error("%s %s", LEXICON_LOG['error_journal_record'], e)
+                    continue
+                self.records += 1
+                yield record
+
+    def file_size(self) -> int:
+        """ Текущий размер файла журнала на диске (0, если журнала нет) """
+        try:
+            return os.path.getsize(self.filename)
+        except OSError:
+            return 0
+
+    def needs_compaction(self) -> bool:
+        """ Проверяет, превышен ли порог журнала по записям или размеру """
+        return self.records >= self.max_records or self.size >= self.max_bytes
+
+    def truncate(self) -> None:
+        """ Очищает журнал после записи нового снимка """
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+        self.records = 0
+        self.size = 0
+
+
+def apply_record_to_dicts(data: Dict[int, Dict[str, Any]],
+                          record: Dict[str, Any]) -> None:
+    """
+    Применяет запись журнала к словарю задач в виде словарей (id -> Task.to_dict()).
+
+    :param data: Словарь задач.
+    :param record: Запись об изменении (add, patch, complete, delete).
+    """
+    op = record.get('op')
+    if op == 'add':
+        data[record['task']['id']] = dict(record['task'])
+    elif op == 'patch' and record['id'] in data:
+        data[record['id']].update(record['fields'])
+    elif op == 'complete' and record['id'] in data:
+        data[record['id']]['status'] = 'Выполнена'
+    elif op == 'delete':
+        for task_id in record['ids']:
+            data.pop(task_id, None)
@@ -0,0 +1,91 @@
+"""
+Модуль содержит функцию iter_json_array для потокового чтения JSON-массива из файла.
+
+Файл читается блоками фиксированного размера, а элементы массива разбираются по одному
+через json.JSONDecoder.raw_decode. В памяти одновременно находится только текущий блок
+текста и один разобранный элемент, а не весь список словарей, как при json.load.
+Разбор так же строг, как json.load: запятая перед ']' и любые данные после массива,
+кроме пробельных символов, - ошибка.
+"""
+
+import json
+from typing import Any, IO, Iterator
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Последовательно возвращает элементы JSON-массива из текстового файла.
+
+    :param f: Файл, открытый в текстовом режиме.
+    :param chunk_size: Размер блока чтения в символах.
+    :raises json.JSONDecodeError: Если файл не является корректным JSON-массивом.
+    :return: Итератор элементов массива.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        # Отбрасываем уже разобранную часть буфера
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not fill():
+                return False
+
+    if not skip_whitespace() or buffer[pos] != '[':
+        raise json.JSONDecodeError("Ожидается JSON-массив", buffer, pos)
+    pos += 1
+    expect_value = True
+    empty = True
+    while True:
+        if not skip_whitespace():
+            raise json.JSONDecodeError("Незавершенный JSON-массив", buffer, pos)
+        char = buffer[pos]
+        if char == ']':
+            if expect_value and not empty:
+                raise json.JSONDecodeError("Лишняя ',' перед ']'", buffer, pos)
+            pos += 1
+            if skip_whitespace():
+                raise json.JSONDecodeError("Лишние данные после JSON-массива",
+                                           buffer, pos)
+            return
+        if char == ',' and not expect_value:
+            pos += 1
+            expect_value = True
+            continue
+        if not expect_value:
+            raise json.JSONDecodeError("Ожидается ',' или ']'", buffer, pos)
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fill():
+                    continue
+                raise
+            # Значение, упирающееся в конец буфера (например, число), может быть неполным
+            if end == len(buffer) and fill():
+                continue
+            break
+        pos = end
+        expect_value = False
+        empty = False
+        yield value
@@ -5,6 +5,7 @@ LEXICON: dict[str, str] = {
                   'Изменить задачу',
                   'Удалить задачу',
                   'Искать задачу',
+                  'Статистика',
                   'Выход'],
     
     "choice_menu": "Выберите действие из меню: ", 
@@ -26,7 +27,9 @@ LEXICON: dict[str, str] = {
     'choice_update': "Нажмите '1', чтобы изменить запись и или '2', чтобы изменить статус записи: ",
     'choice_search': "Нажмите '1' - поиск по ключевому слову \n"
                     "Нажмите '2' - поиск по категории \n"
-                    "Нажмите '3' - поиск по статусу \n",
+                    "Нажмите '3' - поиск по статусу \n"
+                    "Нажмите '4' - составной поиск (несколько условий сразу) \n"
+                    "Нажмите '5' - поиск по релевантности (с учетом опечаток) \n",
     
     'task_add_true': "Добавлена задача - ",
     
@@ -38,8 +41,28 @@ LEXICON: dict[str, str] = {
     "search_tasks_keyword": 'Введите ключевое слово для поиска: ',
     "search_tasks_category": 'Введите категорию для поиска: ',
     "search_tasks_status": 'Введите статус для поиска: ',
+    "search_tasks_ranked": 'Введите слова для поиска (допускаются опечатки): ',
+    "search_tasks_query": {'keyword': 'Введите ключевое слово (или оставьте пустым): ',
+                           'category': 'Введите категорию (или оставьте пустым): ',
+                           'status': 'Введите статус (или оставьте пустым): ',
+                           'priority': 'Введите приоритет (или оставьте пустым): ',
+                           'due_from': 'Срок выполнения с (ГГГГ-ММ-ДД, или оставьте пустым): ',
+                           'due_to': 'Срок выполнения по (ГГГГ-ММ-ДД, или оставьте пустым): '},
     "search_tasks_true": 'Найдены следующие задачи: ',
 
+    "archive_tasks_true": 'Выполненные задачи перенесены в архив, задач:',
+    "stats_title": 'Статистика задач',
+    "stats_summary": "Всего задач: {total}, активных: {open}, выполненных: {completed}",
+    "stats_due": "Активные по срокам: просрочено {overdue}, сегодня {today}, "
+                 "в ближайшие 7 дней {week}, позже {later}, без даты {no_date}",
+    "stats_overdue_priority": "Просроченные по приоритету: ",
+    "stats_category": "По категориям (активные / выполненные):",
+
+    "page_info": "Страница {page} (задачи {first}-{last}{total})",
+    "page_navigation": "Enter - следующая страница, 'p' - предыдущая, 'q' - закончить просмотр: ",
+    "table_header": ['ID', 'Название', 'Описание', 'Категория', 'Срок выполнения',
+                     'Приоритет', 'Статус'],
+
     "update_task_id": "Введите ID задачи для изменения: ",
     "task_update_true": "Обновлена задача с ID № ",
     "task_update_status_true": "Статус задачи обновлен с ID № ",
@@ -59,6 +82,16 @@ LEXICON_LOG: dict[str, str] = {
     "error_load_task_book":"Ошибка при открытии файла книги задач: ",
     'save_tasks': "Задача успешна сохранена",
     "error_save_tasks":"Ошибка при записи файла: ",
+    "journal_replay": 'Журнал изменений применен к книге задач',
+    "journal_compact": 'Журнал изменений компактизирован в новый снимок',
+    "error_journal_record": "Пропущена поврежденная запись журнала: ",
+    "error_missing_shard": "Пропущен отсутствующий шард из манифеста: ",
+    "refresh_tasks": 'Применены изменения из других процессов, записей: ',
+    "archive_tasks": 'Выполненные задачи перенесены в архив, задач: ',
+    "restore_tasks": 'Задачи восстановлены из архива, задач: ',
+    "server_start": 'Сервер задач запущен: ',
+    "server_stop": 'Сервер задач остановлен',
+    "server_request_error": "Ошибка обработки запроса к серверу: ",
     
     "display_tasks": 'Открыт раздел меню - Отображать задачи',
     "tasks_display_true": 'Задачи успешно показаны',
@@ -80,6 +113,9 @@ LEXICON_LOG: dict[str, str] = {
     "task_update_error": "Ошибка обновления статуса ",
     "task_update_true": 'Статус задачи успешно изменен',
     
+    "stats": 'Открыт раздел меню - Статистика',
+    "stats_true": 'Статистика показана',
+
     "exit_menu": 'Пользователь нажал выход ',
     "exit_error": 'Ошибка меню - '
     }
\ No newline at end of file
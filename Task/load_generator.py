@@ -0,0 +1,186 @@
+"""
+Модуль содержит генератор нагрузки для сервера задач (Task.server) и простой клиент HTTP/1.1.
+
+Генератор открывает заданное количество постоянных (keep-alive) соединений и отправляет
+по ним запросы вперемешку: список задач, поиск, добавление, изменение и отметку выполнения.
+По итогам печатаются запросы в секунду и задержки (p50, p99, максимум) в миллисекундах.
+
+Запуск (сервер должен быть запущен): python -m Task.load_generator [--port 8080]
+[--connections 50] [--requests 10000] [--write-ratio 0.2]
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import urlencode
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class HttpClient:
+    def __init__(self, host: str = '127.0.0.1', port: int = 8080,
+                 unix_path: Optional[str] = None) -> None:
+        """
+        Клиент одного keep-alive соединения с сервером задач.
+
+        :param host: Адрес сервера.
+        :param port: Порт сервера.
+        :param unix_path: Путь Unix-сокета (вместо TCP).
+        """
+        self.host: str = host
+        self.port: int = port
+        self.unix_path: Optional[str] = unix_path
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self) -> None:
+        if self.unix_path:
+            self._reader, self._writer = await asyncio.open_unix_connection(
+                self.unix_path)
+        else:
+            self._reader, self._writer = await asyncio.open_connection(
+                self.host, self.port)
+
+    async def request(self, method: str, path: str, data: Any = None,
+                      headers: Optional[Dict[str, str]] = None
+                      ) -> Tuple[int, Dict[str, str], Any]:
+        """
+        Отправляет запрос и читает ответ по тому же соединению.
+
+        :param method: Метод HTTP.
+        :param path: Путь с параметрами запроса.
+        :param data: Тело запроса (сериализуется в JSON).
+        :param headers: Дополнительные заголовки.
+        :return: Код ответа, заголовки (имена в нижнем регистре) и тело (разобранный JSON, текст или None).
+        """
+        if self._writer is None:
+            await self.connect()
+        body = b'' if data is None else json.dumps(
+            data, ensure_ascii=False).encode('utf-8')
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}",
+                 f"Content-Length: {len(body)}"]
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        self._writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8') + body)
+        await self._writer.drain()
+        head = await self._reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+        length = int(response_headers.get('content-length', 0))
+        payload = await self._reader.readexactly(length) if length else b''
+        if response_headers.get('connection') == 'close':
+            await self.close()
+        if response_headers.get('content-type', '').startswith('application/json'):
+            body = json.loads(payload)
+        else:
+            body = payload.decode('utf-8') if payload else None
+        return int(status_line.split(' ')[1]), response_headers, body
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = self._reader = None
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+async def _client_loop(client: HttpClient, count: int, write_ratio: float,
+                       rnd: random.Random, latencies: List[float]) -> None:
+    known_ids: List[int] = []
+    for i in range(count):
+        if rnd.random() < write_ratio or not known_ids:
+            action = rnd.choice(('add', 'add', 'update', 'complete'))
+        else:
+            action = rnd.choice(('list', 'search'))
+        if action in ('update', 'complete') and not known_ids:
+            action = 'add'
+        start = time.perf_counter()
+        if action == 'add':
+            _, _, body = await client.request('POST', '/tasks', {
+                'title': f"Задача {i}", 'description': "Нагрузочный тест",
+                'category': f"Категория {i % 10}", 'due_date': '2030-12-31',
+                'priority': rnd.choice(('низкий', 'средний', 'высокий'))})
+            known_ids.append(body['task']['id'])
+        elif action == 'update':
+            await client.request('PATCH', f"/tasks/{rnd.choice(known_ids)}",
+                                 {'title': f"Изменена {i}"})
+        elif action == 'complete':
+            await client.request('POST',
+                                 f"/tasks/{rnd.choice(known_ids)}/complete")
+        elif action == 'list':
+            await client.request('GET', '/tasks?' + urlencode(
+                {'status': 'Не выполнена', 'page': rnd.randint(1, 5),
+                 'per_page': 20}))
+        else:
+            await client.request('GET', '/search?' + urlencode(
+                {'keyword': f"задача {rnd.randint(1, 99)}"}))
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(host: str = '127.0.0.1', port: int = 8080,
+                   unix_path: Optional[str] = None, connections: int = 50,
+                   requests: int = 10000, write_ratio: float = 0.2,
+                   seed: int = 0) -> Dict[str, float]:
+    """
+    Выполняет нагрузочный прогон против запущенного сервера задач.
+
+    :param host: Адрес сервера.
+    :param port: Порт сервера.
+    :param unix_path: Путь Unix-сокета (вместо TCP).
+    :param connections: Количество одновременных keep-alive соединений.
+    :param requests: Общее количество запросов.
+    :param write_ratio: Доля запросов, изменяющих задачи.
+    :param seed: Зерно генератора случайных чисел.
+    :return: Словарь с количеством запросов, запросами в секунду и задержками в миллисекундах.
+    """
+    rnd = random.Random(seed)
+    latencies: List[float] = []
+    clients = [HttpClient(host, port, unix_path) for _ in range(connections)]
+    per_client = [requests // connections + (i < requests % connections)
+                  for i in range(connections)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _client_loop(client, count, write_ratio,
+                         random.Random(rnd.random()), latencies)
+            for client, count in zip(clients, per_client)))
+    finally:
+        for client in clients:
+            await client.close()
+    elapsed = time.perf_counter() - start
+    return {'requests': len(latencies),
+            'requests_per_second': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': _percentile(latencies, 50) * 1000,
+            'p99_ms': _percentile(latencies, 99) * 1000,
+            'max_ms': max(latencies, default=0.0) * 1000}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Генератор нагрузки для сервера задач")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help="путь Unix-сокета вместо TCP")
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=10000)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+    report = asyncio.run(run_load(args.host, args.port, args.unix,
+                                  args.connections, args.requests,
+                                  args.write_ratio))
+    print(f"Запросов: {report['requests']}")
+    print(f"Запросов в секунду: {report['requests_per_second']:.0f}")
+    print(f"Задержка p50: {report['p50_ms']:.2f} мс, p99: {report['p99_ms']:.2f} мс, "
+          f"максимум: {report['max_ms']:.2f} мс")
@@ -0,0 +1,100 @@
+"""
+Модуль настраивает неблокирующее логирование через очередь (QueueHandler / QueueListener).
+
+Вызов logging.info(...) в рабочем потоке только кладет запись в очередь; форматирование
+сообщения и запись в файл выполняет фоновый поток QueueListener. Сообщения передаются
+в стиле %-форматирования (logging.error("%s %s", LEXICON_LOG['...'], e)), поэтому для
+отключенных уровней строка не собирается вовсе, а для включенных - собирается в фоновом потоке.
+
+Файл лога ротируется по размеру (RotatingFileHandler). Формат - обычный текст или
+структурированный JSON lines (одна запись - один объект JSON в строке).
+"""
+
+import json
+import queue
+import atexit
+import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """ Форматирует запись лога в одну строку JSON """
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+                'level': record.levelname,
+                'logger': record.name,
+                'message': record.getMessage(),
+                'module': record.module,
+                'line': record.lineno,
+                'thread': record.threadName}
+        if record.exc_info:
+            data['exception'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler, который не форматирует запись в вызывающем потоке.
+
+    Стандартный QueueHandler.prepare собирает сообщение до постановки в очередь (чтобы запись
+    можно было передать в другой процесс). Очередь здесь внутри процесса, поэтому запись
+    передается как есть, и сообщение собирает поток QueueListener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging(filename: str = 'task.log', level: int = logging.INFO,
+                  json_lines: bool = False,
+                  max_bytes: int = 5 * 1024 * 1024,
+                  backup_count: int = 3) -> QueueListener:
+    """
+    Настраивает корневой логгер на запись в файл через очередь и фоновый поток.
+
+    Повторный вызов заменяет прежнюю настройку.
+    :param filename: Имя файла лога.
+    :param level: Минимальный уровень записей.
+    :param json_lines: Писать записи в формате JSON lines вместо текста.
+    :param max_bytes: Размер файла, после которого он ротируется (0 - без ротации).
+    :param backup_count: Количество хранимых старых файлов лога.
+    :return: Запущенный QueueListener.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+    file_handler = RotatingFileHandler(filename, maxBytes=max_bytes,
+                                       backupCount=backup_count,
+                                       encoding='utf-8', delay=True)
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines
+                              else logging.Formatter(TEXT_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = DeferredQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    _listener = QueueListener(log_queue, file_handler)
+    _listener.start()
+    return _listener
+
+
+def stop_logging() -> None:
+    """ Дописывает записи из очереди, останавливает фоновый поток и снимает обработчик """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,85 @@
+"""
+Модуль для оценки расхода памяти на одну задачу в TaskManager.
+
+Сравнивает прежнее представление задачи (обычный объект с __dict__ и строковыми полями)
+с текущим классом Task (__slots__, интернированные строки, срок выполнения как ординал).
+Задачи создаются из JSON, как при загрузке книги задач, поэтому одинаковые строки
+категорий и статусов изначально являются разными объектами.
+
+Запуск: python -m Task.memory_report [количество задач]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+from Task.tasks_class import Task
+
+
+class LegacyTask:
+    """ Прежнее представление задачи (для сравнения) """
+
+    def __init__(self, book_id: int, title: str, description: str,
+                 category: str, due_date: str, priority: str):
+        self.id = book_id
+        self.title = title
+        self.description = description
+        self.category = category
+        self.due_date = due_date
+        self.priority = priority
+        self.status = 'Не выполнена'
+
+
+def _sample_book(count: int) -> str:
+    priorities = ["низкий", "средний", "высокий"]
+    data = [{"id": i, "title": f"Задача {i}", "description": "Описание задачи",
+             "category": f"Категория {i % 20}",
+             "due_date": f"2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+             "priority": priorities[i % 3],
+             "status": "Выполнена" if i % 4 == 0 else "Не выполнена"}
+            for i in range(1, count + 1)]
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _measure(raw: str, factory: Callable[[Dict[str, Any]], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    data = json.loads(raw)
+    tasks: List[Any] = [factory(task_data) for task_data in data]
+    del data
+    gc.collect()
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tasks
+    return used
+
+
+def _legacy_factory(task_data: Dict[str, Any]) -> LegacyTask:
+    task = LegacyTask(task_data['id'], task_data['title'],
+                      task_data['description'], task_data['category'],
+                      task_data['due_date'], task_data['priority'])
+    task.status = task_data['status']
+    return task
+
+
+def memory_report(count: int = 100_000) -> Dict[str, float]:
+    """
+    Измеряет память на одну задачу для прежнего и текущего представления.
+
+    :param count: Количество задач.
+    :return: Словарь с количеством байт на задачу.
+    """
+    raw = _sample_book(count)
+    legacy = _measure(raw, _legacy_factory)
+    current = _measure(raw, Task.from_task_in_dict)
+    return {"tasks": count,
+            "legacy_bytes_per_task": legacy / count,
+            "slots_bytes_per_task": current / count}
+
+
+if __name__ == "__main__":
+    report = memory_report(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    print(f"Задач: {report['tasks']}")
+    print(f"Прежний Task (__dict__): {report['legacy_bytes_per_task']:.0f} байт на задачу")
+    print(f"Task (__slots__): {report['slots_bytes_per_task']:.0f} байт на задачу")
@@ -0,0 +1,315 @@
+"""
+Модуль содержит встроенные метрики TaskManager: счетчики, текущие значения (gauge) и гистограммы
+задержек, а также захват профиля (cProfile и tracemalloc) для одной операции.
+
+Все метрики собираются в реестр METRICS (MetricsRegistry):
+- timer / timed - время операции в гистограмму '<имя>_seconds' с метками (например operation);
+- inc - счетчик (количество вызовов, ошибок, записанных байт);
+- observe - произвольная гистограмма (например, количество найденных задач);
+- set_gauge и сборщики (add_collector) - текущие значения, например размеры индексов,
+  которые вычисляются только при выгрузке метрик.
+
+Метрики выгружаются в JSON (to_dict / to_json) или в текстовом формате Prometheus (to_prometheus).
+Сбор можно отключить целиком: METRICS.enabled = False.
+
+Профиль одной операции:
+    with profiled(memory=True) as profile:
+        task_manager.search_tasks('отчет')
+    print(profile.text)
+"""
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import functools
+import threading
+import tracemalloc
+import weakref
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# Границы корзин гистограмм задержек (секунды) и размеров (штуки)
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0,
+                   5.0, 10.0)
+SIZE_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        """
+        Гистограмма с фиксированными границами корзин.
+
+        :param buckets: Верхние границы корзин по возрастанию.
+        """
+        self.buckets: Tuple[float, ...] = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """ Оценка квантиля по верхней границе корзины (для последней корзины - максимум) """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'count': self.count, 'sum': self.sum, 'max': self.max,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99),
+                'buckets': {str(bound): count for bound, count in
+                            zip(self.buckets, self.counts)},
+                'overflow': self.counts[-1]}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        """ Инициализация пустого реестра метрик """
+        self.enabled: bool = True
+        self.counters: Dict[_Key, float] = {}
+        self.gauges: Dict[_Key, float] = {}
+        self.histograms: Dict[_Key, Histogram] = {}
+        self._collectors: List[Callable[[], Optional[Callable]]] = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> _Key:
+        return name, tuple(sorted((key, str(value))
+                                  for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """ Увеличивает счетчик name с метками labels на value """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """ Устанавливает текущее значение name с метками labels """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name: str, value: float,
+                buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+                **labels: Any) -> None:
+        """ Добавляет значение в гистограмму name с метками labels """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels: Any) -> Iterator[None]:
+        """
+        Замеряет время блока with в гистограмму '<name>_seconds'.
+
+        Исключения в блоке дополнительно считаются в счетчике '<name>_errors_total'.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start,
+                         **labels)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """
+        Регистрирует функцию, обновляющую gauge перед выгрузкой метрик.
+
+        Для связанных методов хранится слабая ссылка: сборщик удаляется вместе с объектом.
+        """
+        ref = (weakref.WeakMethod(collector) if hasattr(collector, '__self__')
+               else lambda: collector)
+        with self._lock:
+            self._collectors.append(ref)
+
+    def collect(self) -> None:
+        """ Вызывает зарегистрированные сборщики (удаляя сборщики уничтоженных объектов) """
+        # сборщики вызываются без блокировки: они сами обновляют gauge под ней
+        with self._lock:
+            refs = list(self._collectors)
+        dead = set()
+        for ref in refs:
+            collector = ref()
+            if collector is None:
+                dead.add(id(ref))
+            else:
+                collector()
+        if dead:
+            with self._lock:
+                self._collectors = [ref for ref in self._collectors
+                                    if id(ref) not in dead]
+
+    def reset(self) -> None:
+        """ Очищает все метрики (сборщики сохраняются) """
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    @staticmethod
+    def _label_dict(key: _Key) -> Dict[str, str]:
+        return dict(key[1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """ Метрики в виде словаря (для выгрузки в JSON) """
+        self.collect()
+        with self._lock:
+            return {
+                'counters': [{'name': key[0], 'labels': self._label_dict(key),
+                              'value': value}
+                             for key, value in sorted(self.counters.items())],
+                'gauges': [{'name': key[0], 'labels': self._label_dict(key),
+                            'value': value}
+                           for key, value in sorted(self.gauges.items())],
+                'histograms': [{'name': key[0],
+                                'labels': self._label_dict(key),
+                                **histogram.to_dict()}
+                               for key, histogram in
+                               sorted(self.histograms.items(),
+                                      key=lambda item: item[0])]}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=4)
+
+    def to_prometheus(self) -> str:
+        """ Метрики в текстовом формате Prometheus (exposition format 0.0.4) """
+        self.collect()
+
+        def labels_text(labels: Tuple[Tuple[str, str], ...],
+                        extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = labels + extra
+            if not pairs:
+                return ''
+            return '{' + ','.join(f'{key}="{_escape(value)}"'
+                                  for key, value in pairs) + '}'
+
+        lines: List[str] = []
+        with self._lock:
+            typed = set()
+            for kind, metrics in (('counter', self.counters),
+                                  ('gauge', self.gauges)):
+                for (name, labels), value in sorted(metrics.items()):
+                    if name not in typed:
+                        lines.append(f"# TYPE {name} {kind}")
+                        typed.add(name)
+                    lines.append(f"{name}{labels_text(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items(),
+                                                    key=lambda item: item[0]):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket"
+                                 f"{labels_text(labels, (('le', str(bound)),))}"
+                                 f" {cumulative}")
+                lines.append(f"{name}_bucket"
+                             f"{labels_text(labels, (('le', '+Inf'),))}"
+                             f" {histogram.count}")
+                lines.append(f"{name}_sum{labels_text(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{labels_text(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+METRICS = MetricsRegistry()
+
+
+def timed(name: str) -> Callable:
+    """
+    Декоратор: замеряет время метода в гистограмму 'task_manager_operation_seconds'.
+
+    :param name: Имя операции (метка operation).
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with METRICS.timer('task_manager_operation', operation=name):
+                return method(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class ProfileReport:
+    """ Результат захвата профиля: текст отчета cProfile и пики памяти tracemalloc """
+
+    def __init__(self) -> None:
+        self.text: str = ''
+        self.elapsed: float = 0.0
+        self.memory_peak: Optional[int] = None
+        self.top_allocations: List[str] = []
+
+
+@contextmanager
+def profiled(memory: bool = False, sort: str = 'cumulative',
+             limit: int = 25) -> Iterator[ProfileReport]:
+    """
+    Захватывает профиль блока with (cProfile и, по желанию, tracemalloc).
+
+    :param memory: Дополнительно отслеживать выделения памяти (tracemalloc).
+    :param sort: Поле сортировки отчета cProfile.
+    :param limit: Количество строк отчета и мест выделения памяти.
+    :return: ProfileReport, который заполняется по выходу из блока.
+    """
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    started_tracemalloc = memory and not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        report.elapsed = time.perf_counter() - start
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            report.memory_peak = tracemalloc.get_traced_memory()[1]
+            report.top_allocations = [
+                str(stat) for stat in
+                snapshot.statistics('lineno')[:limit]]
+            if started_tracemalloc:
+                tracemalloc.stop()
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        report.text = stream.getvalue()
@@ -0,0 +1,76 @@
+"""
+Модуль для переноса книги задач между хранилищами (JSON, SQLite, память).
+
+Исходное хранилище читается напрямую (снимок и затем журнал изменений), после чего все
+задачи одним снимком записываются в целевое хранилище. Ошибка чтения источника прерывает
+перенос (StorageError), а непустое целевое хранилище перезаписывается только при overwrite=True,
+поэтому поврежденный источник не может стереть существующую книгу задач.
+
+Запуск: python -m Task.migrate tasks_book.json tasks_book.db [--overwrite]
+Журнал исходной книги ('<файл>.journal') применяется автоматически, если он есть.
+"""
+
+import os
+import sys
+import argparse
+from typing import Any, Dict
+from Task.tasks_class import Task
+from Task.journal import apply_record_to_dicts
+from Task.storage import TaskStorage, open_storage
+from Task.user_exception import StorageError
+
+
+def migrate_storage(source: TaskStorage, target: TaskStorage,
+                    overwrite: bool = False) -> int:
+    """
+    Переносит все задачи из одного хранилища в другое.
+
+    :param source: Исходное хранилище.
+    :param target: Целевое хранилище.
+    :param overwrite: Перезаписать целевое хранилище, даже если в нем уже есть задачи.
+    :raises StorageError: Если источник не читается или целевое хранилище не пустое.
+    :return: Количество перенесенных задач.
+    """
+    tasks: Dict[int, Dict[str, Any]] = {}
+    try:
+        with source.locked(shared=True):
+            for task_data in source.load():
+                tasks[task_data['id']] = task_data
+            for record in source.load_changes():
+                apply_record_to_dicts(tasks, record)
+    except (OSError, ValueError, KeyError) as e:
+        raise StorageError(getattr(source, 'filename', ''), e)
+    if not overwrite and next(iter(target.load()), None) is not None:
+        raise StorageError(getattr(target, 'filename', ''),
+                           "хранилище не пустое (перезапись - overwrite)")
+    target.save_all(Task.from_task_in_dict(tasks[task_id])
+                    for task_id in sorted(tasks))
+    return len(tasks)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Перенос книги задач между хранилищами")
+    parser.add_argument('source', help="исходное хранилище")
+    parser.add_argument('target', help="целевое хранилище")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="перезаписать непустое целевое хранилище")
+    args = parser.parse_args(argv)
+    # незакомпактированные изменения источника лежат в журнале рядом с файлом
+    journal = os.path.exists(f"{args.source}.journal")
+    source_storage = open_storage(args.source, journal=journal)
+    target_storage = open_storage(args.target)
+    try:
+        count = migrate_storage(source_storage, target_storage, args.overwrite)
+    except StorageError as e:
+        print(e)
+        return 1
+    finally:
+        source_storage.close()
+        target_storage.close()
+    print(f"Перенесено задач: {count} ({args.source} -> {args.target})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Модуль содержит класс TaskQuery (составной запрос к книге задач) и функции планирования
+и выполнения запросов по индексам TaskManager.
+
+Запрос объединяет условия через логическое И: ключевое слово, категорию, статус,
+приоритет и диапазон срока выполнения. Планировщик оценивает селективность каждого
+условия по индексам (количество подходящих id) и начинает с самого селективного:
+только оно выбирает id задач через свой индекс, остальные условия проверяются на
+уже найденных кандидатах. Диапазон срока выполнения выбирается через упорядоченный индекс due_index.
+Результат сортируется по выбранному полю и обрезается параметрами offset и limit
+(при заданном limit выбираются только offset + limit первых задач, без сортировки всех).
+count_query считает подходящие задачи без построения и сортировки результата: оценки
+индексов по полю и по сроку точны, поэтому запрос с одним таким условием считается по индексу.
+"""
+
+import heapq
+import sys
+from itertools import chain
+from datetime import date
+from typing import Any, Callable, Iterable, List, Optional
+from Task.tasks_class import PRIORITY_RANK, parse_date
+
+
+class TaskQuery:
+    ORDER_FIELDS = ('id', 'title', 'category', 'due_date', 'priority', 'status')
+
+    def __init__(self, keyword: Optional[str] = None,
+                 category: Optional[str] = None,
+                 status: Optional[str] = None,
+                 priority: Optional[str] = None,
+                 due_from: Optional[str] = None,
+                 due_to: Optional[str] = None,
+                 order_by: str = 'id', descending: bool = False,
+                 limit: Optional[int] = None, offset: int = 0) -> None:
+        """
+        Инициализация запроса. Пустые условия не участвуют в отборе.
+
+        :param keyword: Подстрока названия или описания (без учета регистра).
+        :param category: Категория (без учета регистра).
+        :param status: Статус (без учета регистра).
+        :param priority: Приоритет (без учета регистра).
+        :param due_from: Начало диапазона срока выполнения 'ГГГГ-ММ-ДД' (включительно).
+        :param due_to: Конец диапазона срока выполнения 'ГГГГ-ММ-ДД' (включительно).
+        :param order_by: Поле сортировки результата.
+        :param descending: Сортировка по убыванию.
+        :param limit: Максимальное количество задач в результате.
+        :param offset: Количество пропускаемых задач в начале результата.
+        :raises ValueError: Если неверное поле сортировки или формат даты.
+        """
+        if order_by not in self.ORDER_FIELDS:
+            raise ValueError(f"Неверное поле сортировки - {order_by}")
+        self.keyword = keyword or None
+        self.category = category or None
+        self.status = status or None
+        self.priority = priority or None
+        self.due_from = self._checking_date(due_from)
+        self.due_to = self._checking_date(due_to)
+        self.order_by = order_by
+        self.descending = descending
+        self.limit = limit
+        self.offset = offset
+
+    @staticmethod
+    def _checking_date(data: Optional[str]) -> Optional[date]:
+        if not data:
+            return None
+        parsed = parse_date(data)
+        if parsed is None:
+            raise ValueError("Ошибка в формате даты")
+        return parsed
+
+
+class Predicate:
+    def __init__(self, name: str, estimate: int,
+                 fetch: Callable[[], Iterable[int]],
+                 matches: Callable[[Any], bool]) -> None:
+        """
+        Условие запроса для планировщика.
+
+        :param name: Название условия.
+        :param estimate: Оценка количества подходящих задач.
+        :param fetch: Функция, возвращающая id подходящих задач через индекс.
+        :param matches: Функция проверки одной задачи.
+        """
+        self.name = name
+        self.estimate = estimate
+        self.fetch = fetch
+        self.matches = matches
+
+
+def _field_predicate(index: Any, value: str) -> Predicate:
+    lowered = value.lower()
+    return Predicate(index.field, index.estimate_casefold(value),
+                     lambda: index.get_casefold(value),
+                     lambda task: getattr(task, index.field).lower() == lowered)
+
+
+def _keyword_predicate(manager: Any, keyword: str) -> Predicate:
+    lowered = keyword.lower()
+    return Predicate('keyword',
+                     manager.text_index.estimate(keyword, len(manager.tasks)),
+                     lambda: manager.text_index.search(keyword, manager.tasks),
+                     lambda task: (lowered in task.title.lower()
+                                   or lowered in task.description.lower()))
+
+
+def _due_predicate(manager: Any, query: TaskQuery) -> Predicate:
+    # Диапазон ключей упорядоченного индекса отдельно для активных (0) и остальных (1) задач
+    lo = query.due_from.toordinal() if query.due_from else 0
+    hi = query.due_to.toordinal() + 1 if query.due_to else sys.maxsize
+
+    def matches(task: Any) -> bool:
+        ordinal = task.due_ordinal
+        return ordinal is not None and lo <= ordinal < hi
+
+    ranges = [((flag, lo), (flag, hi)) for flag in (0, 1)]
+    index = manager.due_index
+    return Predicate('due_date',
+                     sum(index.count(start, end) for start, end in ranges),
+                     lambda: [task_id for start, end in ranges
+                              for task_id in index.ids(start, end)],
+                     matches)
+
+
+def plan_query(manager: Any, query: TaskQuery) -> List[Predicate]:
+    """
+    Строит план выполнения запроса: условия в порядке возрастания оценки количества задач.
+
+    :param manager: Экземпляр TaskManager.
+    :param query: Запрос.
+    :return: Список условий, первое из которых выбирает кандидатов через индекс.
+    """
+    predicates: List[Predicate] = []
+    if query.keyword:
+        predicates.append(_keyword_predicate(manager, query.keyword))
+    if query.category:
+        predicates.append(_field_predicate(manager.category_index,
+                                           query.category))
+    if query.status:
+        predicates.append(_field_predicate(manager.status_index, query.status))
+    if query.priority:
+        predicates.append(_field_predicate(manager.priority_index,
+                                           query.priority))
+    if query.due_from or query.due_to:
+        predicates.append(_due_predicate(manager, query))
+    predicates.sort(key=lambda predicate: predicate.estimate)
+    return predicates
+
+
+def _sort_key(order_by: str) -> Callable[[Any], Any]:
+    if order_by == 'priority':
+        return lambda task: (PRIORITY_RANK.get(task.priority.lower(), 0), task.id)
+    if order_by == 'id':
+        return lambda task: task.id
+    return lambda task: (getattr(task, order_by), task.id)
+
+
+def execute_query(manager: Any, query: TaskQuery,
+                  extra: Iterable[Any] = ()) -> List[Any]:
+    """
+    Выполняет запрос к задачам TaskManager.
+
+    :param manager: Экземпляр TaskManager.
+    :param query: Запрос.
+    :param extra: Дополнительные задачи вне индексов (например, из архива) - проверяются
+                  всеми условиями запроса по очереди и сортируются вместе с остальными.
+    :return: Список найденных задач с учетом сортировки, offset и limit.
+    """
+    predicates = plan_query(manager, query)
+    if predicates:
+        first, rest = predicates[0], predicates[1:]
+        tasks: Iterable[Any] = [manager.tasks[task_id]
+                                for task_id in first.fetch()]
+        for predicate in rest:
+            if not tasks:
+                break
+            tasks = [task for task in tasks if predicate.matches(task)]
+    else:
+        # без условий задачи не копируются в отдельный список до отбора limit
+        tasks = manager.tasks.values()
+    tasks = chain(tasks, (task for task in extra
+                          if all(predicate.matches(task)
+                                 for predicate in predicates)))
+
+    key = _sort_key(query.order_by)
+    if query.limit is not None:
+        count = query.offset + query.limit
+        if query.descending:
+            selected = heapq.nlargest(count, tasks, key=key)
+        else:
+            selected = heapq.nsmallest(count, tasks, key=key)
+        return selected[query.offset:]
+    result = sorted(tasks, key=key, reverse=query.descending)
+    return result[query.offset:]
+
+
+def count_query(manager: Any, query: TaskQuery) -> int:
+    """
+    Считает задачи TaskManager, подходящие под условия запроса (сортировка и limit не учитываются).
+
+    :param manager: Экземпляр TaskManager.
+    :param query: Запрос.
+    :return: Количество задач.
+    """
+    predicates = plan_query(manager, query)
+    if not predicates:
+        return len(manager.tasks)
+    first, rest = predicates[0], predicates[1:]
+    if not rest and first.name != 'keyword':
+        return first.estimate
+    return sum(1 for task_id in first.fetch()
+               if all(predicate.matches(manager.tasks[task_id])
+                      for predicate in rest))
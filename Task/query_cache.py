@@ -0,0 +1,117 @@
+"""
+Модуль содержит класс QueryCache - ограниченный LRU-кэш результатов просмотра и поиска задач.
+
+Ключ записи - нормализованные параметры запроса (пустые условия -> None, категория, статус,
+приоритет и ключевое слово без учета регистра, как и в самом запросе). Каждая запись
+привязана к области (scope), от которой зависит её результат: категории, приоритету,
+статусу или всей книге задач (None). TaskManager при каждом изменении задачи вызывает
+invalidate со старой и новой версией задачи: номера версий затронутых областей растут,
+и записи, сохраненные при прежнем номере, считаются устаревшими при следующем обращении.
+Поэтому изменение задачи категории "Дом" не сбрасывает закэшированные выборки категории "Работа".
+
+Статистика (попадания, промахи, вытеснения, устаревшие записи) доступна через stats()
+и в метриках TaskManager (task_manager_query_cache_*).
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Область записи: (поле, значение в нижнем регистре) или None - вся книга задач
+Scope = Optional[Tuple[str, str]]
+SCOPE_FIELDS = ('category', 'priority', 'status')
+MISSING = object()
+
+
+def query_scope(category: Optional[str] = None, priority: Optional[str] = None,
+                status: Optional[str] = None) -> Scope:
+    """
+    Самая узкая область, от которой зависит результат запроса.
+
+    Задача может войти в результат с условием category=c или выйти из него, только если
+    её категория до или после изменения равна c, поэтому достаточно одной области.
+    :return: Область записи кэша.
+    """
+    for field, value in zip(SCOPE_FIELDS, (category, priority, status)):
+        if value:
+            return field, value.lower()
+    return None
+
+
+class QueryCache:
+    def __init__(self, maxsize: int = 256) -> None:
+        """
+        Инициализация кэша.
+
+        :param maxsize: Максимальное количество записей (0 - кэш отключен).
+        """
+        self.maxsize: int = maxsize
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, Scope, int]]' = OrderedDict()
+        self._generations: Dict[Scope, int] = {}
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.stale: int = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Результат запроса из кэша.
+
+        :param key: Нормализованные параметры запроса.
+        :return: Сохраненный результат или MISSING.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, scope, generation = entry
+                if generation == self._generations.get(scope, 0):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.stale += 1
+            self.misses += 1
+            return MISSING
+
+    def put(self, key: Hashable, value: Any, scope: Scope) -> None:
+        """
+        Сохраняет результат запроса, вытесняя самую давно использованную запись при переполнении.
+
+        :param key: Нормализованные параметры запроса.
+        :param value: Результат запроса.
+        :param scope: Область, от которой зависит результат.
+        """
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, scope, self._generations.get(scope, 0))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *tasks: Any) -> None:
+        """ Отмечает устаревшими записи областей, к которым относятся задачи (и всей книги) """
+        with self._lock:
+            scopes = {None}
+            for task in tasks:
+                if task is not None:
+                    scopes.update((field, getattr(task, field).lower())
+                                  for field in SCOPE_FIELDS)
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def clear(self) -> None:
+        """ Удаляет все записи (статистика сохраняется) """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """ Статистика кэша для подбора размера """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {'size': len(self._entries), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses,
+                    'hit_ratio': self.hits / requests if requests else 0.0,
+                    'evictions': self.evictions, 'stale': self.stale}
@@ -0,0 +1,180 @@
+"""
+Модуль содержит класс SearchIndex - инвертированный индекс слов названия и описания задач
+для ранжированного поиска с учетом опечаток.
+
+Название и описание приводятся к нижнему регистру и разбиваются на слова. Индекс хранит:
+- для каждого слова - задачи, где оно встречается, и частоту слова в задаче (слово названия
+  считается TITLE_WEIGHT раз, поэтому совпадение в названии весит больше);
+- длину каждой задачи в словах и общую длину (для средней длины задачи);
+- словарь триграмм слов "триграмма -> слова" для поиска похожих слов.
+
+Каждое слово запроса сопоставляется со словами индекса, похожими на него по триграммам
+(сходство - доля общих триграмм слов, дополненных пробелами, как в pg_trgm), не ниже
+порога min_similarity. Похожие слова находятся по словарю триграмм, а не перебором словаря.
+Вклад слова в оценку задачи - BM25 (k1, b), умноженный на сходство со словом запроса;
+для каждого слова запроса учитывается лучшее совпадение в задаче. Оцениваются только
+задачи, в которых есть похожие слова, и из них выбираются top-K по убыванию оценки.
+
+Индекс подключается к TaskManager как вторичный индекс (add / remove) и обновляется при
+каждом изменении задачи.
+"""
+
+import re
+import math
+import heapq
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+TITLE_WEIGHT = 2
+WORD = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Разбивает строку на слова в нижнем регистре.
+
+    :param text: Строка.
+    :return: Список слов.
+    """
+    return WORD.findall(text.lower())
+
+
+def word_trigrams(word: str) -> Set[str]:
+    """
+    Триграммы слова, дополненного двумя пробелами в начале и одним в конце.
+
+    :param word: Слово в нижнем регистре.
+    :return: Множество триграмм.
+    """
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    fields = ('title', 'description')
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75,
+                 min_similarity: float = 0.3) -> None:
+        """
+        Инициализация пустого индекса.
+
+        :param k1: Параметр насыщения частоты слова BM25.
+        :param b: Параметр нормализации по длине задачи BM25.
+        :param min_similarity: Минимальное сходство слова индекса со словом запроса (0..1).
+        """
+        self.k1: float = k1
+        self.b: float = b
+        self.min_similarity: float = min_similarity
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.total_length: int = 0
+        self.vocabulary: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    @staticmethod
+    def _frequencies(task: Any) -> Dict[str, int]:
+        frequencies: Dict[str, int] = {}
+        for word in tokenize(task.title):
+            frequencies[word] = frequencies.get(word, 0) + TITLE_WEIGHT
+        for word in tokenize(task.description):
+            frequencies[word] = frequencies.get(word, 0) + 1
+        return frequencies
+
+    def add(self, task: Any) -> None:
+        """ Добавляет задачу в индекс """
+        frequencies = self._frequencies(task)
+        for word, count in frequencies.items():
+            if word not in self.postings:
+                self.postings[word] = {}
+                for gram in word_trigrams(word):
+                    self.vocabulary.setdefault(gram, set()).add(word)
+            self.postings[word][task.id] = count
+        length = sum(frequencies.values())
+        self.lengths[task.id] = length
+        self.total_length += length
+
+    def remove(self, task: Any) -> None:
+        """ Удаляет задачу из индекса """
+        if self.lengths.get(task.id) is None:
+            return
+        for word in self._frequencies(task):
+            documents = self.postings.get(word)
+            if documents is None:
+                continue
+            documents.pop(task.id, None)
+            if not documents:
+                del self.postings[word]
+                for gram in word_trigrams(word):
+                    words = self.vocabulary[gram]
+                    words.discard(word)
+                    if not words:
+                        del self.vocabulary[gram]
+        self.total_length -= self.lengths.pop(task.id)
+
+    def similar_words(self, word: str) -> Dict[str, float]:
+        """
+        Слова индекса, похожие на слово запроса.
+
+        :param word: Слово запроса в нижнем регистре.
+        :return: Слово индекса -> сходство (1.0 - точное совпадение).
+        """
+        grams = word_trigrams(word)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self.vocabulary.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        similar = {}
+        for candidate, common in shared.items():
+            similarity = common / (len(grams) + len(word_trigrams(candidate)) -
+                                   common)
+            if similarity >= self.min_similarity:
+                similar[candidate] = similarity
+        return similar
+
+    def scores(self, text: str) -> Dict[int, float]:
+        """
+        Оценки BM25 задач, в которых есть слова, похожие на слова запроса.
+
+        :param text: Поисковый запрос.
+        :return: id задачи -> оценка релевантности.
+        """
+        count = len(self.lengths)
+        if not count:
+            return {}
+        average = self.total_length / count or 1
+        scores: Dict[int, float] = {}
+        for word in set(tokenize(text)):
+            best: Dict[int, float] = {}
+            for candidate, similarity in self.similar_words(word).items():
+                documents = self.postings[candidate]
+                idf = math.log(1 + (count - len(documents) + 0.5) /
+                               (len(documents) + 0.5))
+                for task_id, frequency in documents.items():
+                    norm = self.k1 * (1 - self.b + self.b *
+                                      self.lengths[task_id] / average)
+                    score = (idf * similarity * frequency * (self.k1 + 1) /
+                             (frequency + norm))
+                    if score > best.get(task_id, 0.0):
+                        best[task_id] = score
+            for task_id, score in best.items():
+                scores[task_id] = scores.get(task_id, 0.0) + score
+        return scores
+
+    def search(self, text: str, limit: Optional[int] = 10,
+               accept: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """
+        Самые релевантные задачи по запросу.
+
+        :param text: Поисковый запрос.
+        :param limit: Количество задач (None - все найденные).
+        :param accept: Дополнительное условие для id задачи (фильтры запроса).
+        :return: Список пар (id задачи, оценка) по убыванию оценки (при равенстве - по id).
+        """
+        scores = self.scores(text)
+        hits = ((task_id, score) for task_id, score in scores.items()
+                if accept is None or accept(task_id))
+        key = lambda hit: (-hit[1], hit[0])
+        if limit is None:
+            return sorted(hits, key=key)
+        return heapq.nsmallest(limit, hits, key=key)
@@ -0,0 +1,400 @@
+"""
+Модуль содержит класс TaskServer - сетевой API для TaskManager на asyncio (только стандартная библиотека).
+
+Сервер принимает запросы HTTP/1.1 с телами в формате JSON по TCP или Unix-сокету:
+- GET /tasks - список задач с фильтрами (keyword, category, status, priority, due_from, due_to),
+  сортировкой (order_by, descending) и постраничной выдачей (page, per_page);
+- GET /search - то же, что GET /tasks;
+- GET /tasks/<id> - одна задача;
+- POST /tasks - добавление задачи (title, description, category, due_date, priority);
+- PATCH /tasks/<id> - изменение полей задачи;
+- POST /tasks/<id>/complete - отметка задачи выполненной;
+- DELETE /tasks/<id> - удаление задачи, DELETE /tasks?category=<категория> - удаление категории;
+- GET /stats - сводка по книге задач (TaskManager.stats);
+- GET /metrics - метрики в текстовом формате Prometheus (GET /metrics?format=json - в JSON).
+
+Соединения поддерживаются открытыми между запросами (keep-alive) до закрытия клиентом,
+заголовка "Connection: close" или простоя дольше idle_timeout. Ответы на GET содержат ETag
+с номером версии задач (TaskManager.generation): если он совпадает с If-None-Match,
+возвращается 304 без тела и без выполнения запроса.
+
+Запросы к задачам выполняются вне цикла событий: чтение - в пуле потоков чтения (параллельно
+под блокировкой чтения TaskManager), изменения - в отдельном потоке записи. Поэтому ни
+ожидание блокировки, ни сохранение в хранилище не останавливают цикл событий и остальные
+соединения. TaskManager должен быть создан с thread_safe=True; при commit_delay > 0 запись
+на диск дополнительно группируется.
+
+Запуск: python -m Task.server [--host 127.0.0.1] [--port 8080] [--unix путь] [--file tasks_book.json]
+"""
+
+import json
+import asyncio
+import logging
+import argparse
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qsl
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from Task.TaskManager import TaskManager
+from Task.lexicon import LEXICON_LOG
+from Task.metrics import METRICS
+from Task.user_exception import TaskError, InvalidIDError
+
+TASK_FIELDS = ('title', 'description', 'category', 'due_date', 'priority')
+FILTERS = ('keyword', 'category', 'status', 'priority', 'due_from', 'due_to')
+
+
+class _HttpError(Exception):
+    """ Ошибка запроса, которая отправляется клиенту ответом с кодом status """
+
+    def __init__(self, status: int, message: str = '') -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message or HTTPStatus(status).phrase
+
+
+class TaskServer:
+    def __init__(self, task_manager: TaskManager, host: str = '127.0.0.1',
+                 port: int = 8080, unix_path: Optional[str] = None,
+                 idle_timeout: float = 30.0, max_body: int = 1024 * 1024,
+                 per_page: int = 50, max_per_page: int = 500,
+                 readers: int = 4) -> None:
+        """
+        Инициализация сервера.
+
+        :param task_manager: Менеджер задач (созданный с thread_safe=True).
+        :param host: Адрес для TCP.
+        :param port: Порт для TCP (0 - выбрать свободный).
+        :param unix_path: Путь Unix-сокета (вместо TCP).
+        :param idle_timeout: Время простоя соединения keep-alive в секундах.
+        :param max_body: Максимальный размер тела запроса в байтах.
+        :param per_page: Размер страницы списка по умолчанию.
+        :param max_per_page: Максимальный размер страницы списка.
+        :param readers: Количество потоков чтения.
+        """
+        self.task_manager: TaskManager = task_manager
+        self.host: str = host
+        self.port: int = port
+        self.unix_path: Optional[str] = unix_path
+        self.idle_timeout: float = idle_timeout
+        self.max_body: int = max_body
+        self.per_page: int = per_page
+        self.max_per_page: int = max_per_page
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        # один поток записи: изменения применяются по очереди и не блокируют цикл событий
+        self._writer = ThreadPoolExecutor(max_workers=1,
+                                          thread_name_prefix='task-writer')
+        # чтение идет под блокировкой TaskManager, поэтому тоже выполняется вне цикла событий
+        self._readers = ThreadPoolExecutor(max_workers=readers,
+                                           thread_name_prefix='task-reader')
+
+    async def start(self) -> None:
+        """ Запускает прием соединений (port обновляется, если был выбран свободный порт) """
+        if self.unix_path:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, self.unix_path)
+            address = self.unix_path
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+            address = f"{self.host}:{self.port}"
+        logging.info("%s %s", LEXICON_LOG['server_start'], address)
+
+    async def serve_forever(self) -> None:
+        """ Запускает сервер и обслуживает запросы до отмены задачи """
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        """ Останавливает сервер и сохраняет накопленные изменения """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._writer, self.task_manager.flush)
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        logging.info(LEXICON_LOG['server_stop'])
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """ Обслуживает одно соединение: запросы читаются по очереди, пока соединение открыто """
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except _HttpError as e:
+                    writer.write(self._response(e.status, {'error': e.message},
+                                                {}, False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                with METRICS.timer('server_request', method=method):
+                    status, payload, extra = await self._dispatch(
+                        method, target, headers, body)
+                METRICS.inc('server_responses_total', status=status)
+                writer.write(self._response(status, payload, extra,
+                                            keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            # соединение закрыто клиентом или сервер останавливается
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader
+                            ) -> Optional[Tuple[str, str, Dict[str, str], bytes, bool]]:
+        """
+        Читает один запрос HTTP.
+
+        :raises _HttpError: Если запрос некорректен или слишком велик.
+        :return: Метод, цель, заголовки, тело и признак keep-alive (None - соединение закрыто).
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'),
+                                          self.idle_timeout)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError,
+                ConnectionError):
+            return None
+        except asyncio.LimitOverrunError:
+            raise _HttpError(431)
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise _HttpError(400, "Некорректная строка запроса")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise _HttpError(400, "Некорректный Content-Length")
+        if length > self.max_body:
+            raise _HttpError(413)
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            return None
+        connection = headers.get('connection', '').lower()
+        keep_alive = (connection != 'close' if version == 'HTTP/1.1'
+                      else connection == 'keep-alive')
+        return method.upper(), target, headers, body, keep_alive
+
+    @staticmethod
+    def _response(status: int, payload: Any, headers: Dict[str, str],
+                  keep_alive: bool) -> bytes:
+        """ Формирует ответ HTTP с телом JSON (строка отправляется как обычный текст) """
+        if isinstance(payload, str):
+            body = payload.encode('utf-8')
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body = b'' if payload is None else json.dumps(
+                payload, ensure_ascii=False).encode('utf-8')
+            content_type = "application/json; charset=utf-8"
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                 f"Content-Length: {len(body)}",
+                 f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if payload is not None:
+            lines.append(f"Content-Type: {content_type}")
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+    async def _dispatch(self, method: str, target: str, headers: Dict[str, str],
+                        body: bytes) -> Tuple[int, Any, Dict[str, str]]:
+        """
+        Выполняет запрос.
+
+        :return: Код ответа, тело ответа (None - без тела) и дополнительные заголовки.
+        """
+        url = urlsplit(target)
+        params = dict(parse_qsl(url.query))
+        parts = [part for part in url.path.split('/') if part]
+        try:
+            if parts == ['metrics'] and method == 'GET':
+                if params.get('format') == 'json':
+                    return 200, METRICS.to_dict(), {}
+                return 200, METRICS.to_prometheus(), {}
+            if parts == ['stats'] and method == 'GET':
+                return 200, await self._read(self.task_manager.stats), {}
+            if parts in (['tasks'], ['search']) and method == 'GET':
+                return await self._conditional(headers, self._list_tasks,
+                                               params)
+            if len(parts) == 2 and parts[0] == 'tasks' and method == 'GET':
+                return await self._conditional(headers, self._get_task,
+                                               self._task_id(parts[1]))
+            if parts == ['tasks'] and method == 'POST':
+                return 201, await self._write(self._add_task,
+                                              self._json(body)), {}
+            if parts == ['tasks'] and method == 'DELETE':
+                return 200, await self._write(self._delete_category,
+                                              params.get('category')), {}
+            if len(parts) == 2 and parts[0] == 'tasks':
+                task_id = self._task_id(parts[1])
+                if method == 'PATCH':
+                    return 200, await self._write(self._update_task, task_id,
+                                                  self._json(body)), {}
+                if method == 'DELETE':
+                    return 200, await self._write(self._delete_task,
+                                                  task_id), {}
+                raise _HttpError(405)
+            if (len(parts) == 3 and parts[0] == 'tasks'
+                    and parts[2] == 'complete' and method == 'POST'):
+                return 200, await self._write(self._complete_task,
+                                              self._task_id(parts[1])), {}
+            raise _HttpError(404)
+        except _HttpError as e:
+            return e.status, {'error': e.message}, {}
+        except InvalidIDError as e:
+            return 404, {'error': str(e)}, {}
+        except (TaskError, ValueError) as e:
+            return 400, {'error': str(e)}, {}
+        except Exception as e:
+            logging.error("%s %s", LEXICON_LOG['server_request_error'], e)
+            return 500, {'error': HTTPStatus(500).phrase}, {}
+
+    async def _conditional(self, headers: Dict[str, str], handler: Callable,
+                           *args: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """ Условный GET: при совпадении ETag с If-None-Match отвечает 304 без выполнения запроса """
+        etag = f'"{self.task_manager.generation}"'
+        if headers.get('if-none-match') == etag:
+            return 304, None, {'ETag': etag}
+        return 200, await self._read(handler, *args), {'ETag': etag}
+
+    async def _read(self, handler: Callable, *args: Any) -> Any:
+        """ Выполняет чтение задач в пуле потоков чтения, не блокируя цикл событий """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, handler, *args)
+
+    async def _write(self, handler: Callable, *args: Any) -> Any:
+        """ Выполняет изменение задач в потоке записи, не блокируя цикл событий """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, handler, *args)
+
+    @staticmethod
+    def _json(body: bytes) -> Dict[str, Any]:
+        try:
+            data = json.loads(body or b'{}')
+        except ValueError:
+            raise _HttpError(400, "Тело запроса должно быть JSON")
+        if not isinstance(data, dict):
+            raise _HttpError(400, "Тело запроса должно быть объектом JSON")
+        return data
+
+    @staticmethod
+    def _task_id(value: str) -> int:
+        if not value.isdigit():
+            raise _HttpError(404)
+        return int(value)
+
+    def _page(self, params: Dict[str, str]) -> Tuple[int, int]:
+        """ Номер и размер страницы из параметров запроса """
+        try:
+            page = max(int(params.get('page', 1)), 1)
+            per_page = int(params.get('per_page', self.per_page))
+        except ValueError:
+            raise _HttpError(400, "page и per_page должны быть числами")
+        return page, min(max(per_page, 1), self.max_per_page)
+
+    def _list_tasks(self, params: Dict[str, str]) -> Dict[str, Any]:
+        page, per_page = self._page(params)
+        filters = {key: params[key] for key in FILTERS if params.get(key)}
+        # выбирается только запрошенная страница, общее количество - отдельным подсчетом
+        results = self.task_manager.query(
+            **filters, order_by=params.get('order_by', 'id'),
+            descending=params.get('descending', '').lower() in ('1', 'true'),
+            limit=per_page, offset=(page - 1) * per_page)
+        return {'items': [task.to_dict() for task in results],
+                'page': page, 'per_page': per_page,
+                'total': self.task_manager.query_count(**filters),
+                'generation': self.task_manager.generation}
+
+    def _get_task(self, task_id: int) -> Dict[str, Any]:
+        task = self.task_manager.tasks.get(task_id)
+        if task is None:
+            raise InvalidIDError(task_id)
+        return task.to_dict()
+
+    def _add_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        manager = self.task_manager
+        task_data = {field: str(data.get(field) or '') for field in TASK_FIELDS}
+        manager.checking_for_empty_data(task_data['title'])
+        manager.task_date_check(task_data['due_date'])
+        manager.checking_priority(task_data['priority'])
+        task_id = manager.next_id
+        message = manager.add_task(**task_data)
+        return {'message': message.strip(), 'task': self._get_task(task_id)}
+
+    def _update_task(self, task_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        manager = self.task_manager
+        manager.checking_for_empty_id(str(task_id))
+        fields = {field: str(data[field]) for field in TASK_FIELDS
+                  if data.get(field)}
+        if 'due_date' in fields:
+            manager.task_date_check(fields['due_date'])
+        if 'priority' in fields:
+            manager.checking_priority(fields['priority'])
+        message = manager.update_task(str(task_id), fields)
+        return {'message': message, 'task': self._get_task(task_id)}
+
+    def _complete_task(self, task_id: int) -> Dict[str, Any]:
+        self.task_manager.checking_for_empty_id(str(task_id))
+        message = self.task_manager.mark_task_completed(str(task_id))
+        return {'message': message, 'task': self._get_task(task_id)}
+
+    def _delete_task(self, task_id: int) -> Dict[str, Any]:
+        self.task_manager.checking_for_empty_id(str(task_id))
+        return {'message': self.task_manager.delete_task(str(task_id))}
+
+    def _delete_category(self, category: Optional[str]) -> Dict[str, Any]:
+        self.task_manager.checking_for_empty_data(category)
+        return {'message': self.task_manager.delete_task('', category)}
+
+
+def main(argv: Optional[list] = None) -> None:
+    parser = argparse.ArgumentParser(description="Сетевой API менеджера задач")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--unix', help="путь Unix-сокета вместо TCP")
+    parser.add_argument('--file', default='tasks_book.json',
+                        help="файл книги задач")
+    parser.add_argument('--commit-delay', type=float, default=0.05,
+                        help="окно группового сохранения в секундах")
+    args = parser.parse_args(argv)
+    task_manager = TaskManager(filename=args.file, journal=True,
+                               commit_delay=args.commit_delay,
+                               thread_safe=True)
+    server = TaskServer(task_manager, args.host, args.port, args.unix)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    from Task.logging_setup import setup_logging
+    setup_logging(json_lines=True)
+    main()
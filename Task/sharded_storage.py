@@ -0,0 +1,196 @@
+"""
+Модуль содержит хранилище задач ShardedStorage - книгу задач, разбитую по категориям.
+
+Структура каталога (например, 'tasks_book.shards'):
+- manifest.json - манифест: для каждой категории имя файла шарда и количество задач;
+- <хеш категории>.json - шард: JSON-массив задач одной категории (формат книги задач).
+
+Загрузка разбирает шарды параллельно в пуле процессов (если шардов несколько и их общий
+размер не меньше min_parallel_bytes, иначе - последовательно в текущем процессе).
+Сохранение группы изменений (apply) переписывает только шарды категорий, которых коснулись
+изменения (для перенесенной в другую категорию задачи - оба шарда), и манифест. Удаление
+всех задач категории удаляет файл её шарда. Все файлы записываются атомарно (atomic_open).
+
+Порядок записи рассчитан на сбой посередине: сначала записываются новые шарды, затем
+манифест, и только после этого удаляются файлы опустевших шардов, поэтому манифест не
+ссылается на удаленный файл. Если файла шарда из манифеста все же нет (например, его
+удалили вручную), загрузка пропускает его с записью в лог, а не прерывается.
+
+Хранилище подключается к TaskManager как любое другое, публичный API менеджера не меняется:
+    TaskManager(storage=ShardedStorage('tasks_book.shards'))
+"""
+
+import os
+import json
+import logging
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from Task.file_utils import atomic_open
+from Task.lexicon import LEXICON_LOG
+from Task.metrics import METRICS
+from Task.storage import TaskStorage
+from Task.user_exception import StorageError
+
+MANIFEST = 'manifest.json'
+MANIFEST_VERSION = 1
+
+
+def shard_filename(category: str) -> str:
+    """ Имя файла шарда категории (хеш, чтобы имя не зависело от символов категории) """
+    return hashlib.sha1(category.encode('utf-8')).hexdigest()[:16] + '.json'
+
+
+def _read_shard(path: str) -> List[Dict[str, Any]]:
+    """ Читает один шард (выполняется в процессе пула) """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class ShardedStorage(TaskStorage):
+    def __init__(self, directory: str = 'tasks_book.shards',
+                 processes: Optional[int] = None,
+                 min_parallel_bytes: int = 1024 * 1024) -> None:
+        """
+        Инициализация хранилища с шардами по категориям.
+
+        :param directory: Каталог шардов и манифеста (создается при первом сохранении).
+        :param processes: Количество процессов для загрузки (None - по числу процессоров).
+        :param min_parallel_bytes: Общий размер шардов, начиная с которого загрузка идет в пуле процессов.
+        """
+        self.filename: str = directory
+        self.directory: str = directory
+        self.processes: Optional[int] = processes
+        self.min_parallel_bytes: int = min_parallel_bytes
+        self.manifest: Dict[str, Dict[str, Any]] = {}
+        # Текущее размещение задач по шардам: категория -> id и id -> категория
+        self._members: Dict[str, Dict[int, None]] = {}
+        self._categories: Dict[int, str] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._path(MANIFEST), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            raise StorageError(self._path(MANIFEST), e)
+        return data.get('shards', {})
+
+    def _place(self, task_id: int, category: Optional[str]) -> None:
+        """ Переносит задачу в шард категории category (None - задача удалена) """
+        old = self._categories.pop(task_id, None)
+        if old is not None:
+            self._members[old].pop(task_id, None)
+        if category is not None:
+            self._categories[task_id] = category
+            self._members.setdefault(category, {})[task_id] = None
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        self.manifest = self._read_manifest()
+        self._members.clear()
+        self._categories.clear()
+        paths = []
+        for category, shard in list(self.manifest.items()):
+            path = self._path(shard['file'])
+            if not os.path.exists(path):
+                logging.error("%s %s (%s)", LEXICON_LOG['error_missing_shard'],
+                              path, category)
+                del self.manifest[category]
+                continue
+            paths.append(path)
+        try:
+            size = sum(os.path.getsize(path) for path in paths)
+            if len(paths) > 1 and size >= self.min_parallel_bytes and \
+                    self.processes != 1:
+                with ProcessPoolExecutor(self.processes) as pool:
+                    shards: Iterable[List[Dict[str, Any]]] = list(
+                        pool.map(_read_shard, paths))
+            else:
+                shards = map(_read_shard, paths)
+            for shard in shards:
+                for task_data in shard:
+                    self._place(task_data['id'], task_data['category'])
+                    yield task_data
+        except (OSError, ValueError) as e:
+            raise StorageError(self.directory, e)
+
+    def _write_shard(self, category: str, tasks: Any) -> Optional[str]:
+        """
+        Переписывает шард категории по текущим задачам или убирает его из манифеста,
+        если категория пуста.
+
+        :param category: Категория.
+        :param tasks: Все задачи (id -> задача).
+        :return: Путь файла опустевшего шарда (удаляется после записи манифеста) или None.
+        """
+        ids = self._members.get(category)
+        name = shard_filename(category)
+        if not ids:
+            self._members.pop(category, None)
+            self.manifest.pop(category, None)
+            return self._path(name)
+        data = [tasks[task_id].to_dict() for task_id in sorted(ids)]
+        with atomic_open(self._path(name), 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        METRICS.inc('storage_written_bytes_total',
+                    os.path.getsize(self._path(name)), backend='sharded')
+        self.manifest[category] = {'file': name, 'count': len(data)}
+        return None
+
+    def _write_manifest(self, obsolete: Iterable[Optional[str]] = ()) -> None:
+        """ Записывает манифест, а затем удаляет файлы опустевших шардов obsolete """
+        with atomic_open(self._path(MANIFEST), 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION,
+                       'shards': dict(sorted(self.manifest.items()))},
+                      f, ensure_ascii=False, indent=4)
+        for path in obsolete:
+            if path is None:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        tasks = {task.id: task for task in tasks}
+        os.makedirs(self.directory, exist_ok=True)
+        # шарды прежнего содержимого каталога, которых может не быть в новом снимке
+        stale = set(self._read_manifest()) | set(self.manifest) | set(self._members)
+        self._members.clear()
+        self._categories.clear()
+        for task in tasks.values():
+            self._place(task.id, task.category)
+        obsolete = [self._write_shard(category, tasks)
+                    for category in stale | set(self._members)]
+        self._write_manifest(obsolete)
+
+    def apply(self, records: List[Dict[str, Any]],
+              tasks: Dict[int, Any]) -> None:
+        dirty = set()
+        for record in records:
+            if record['op'] == 'delete':
+                ids = record['ids']
+            else:
+                ids = [record['task']['id'] if record['op'] == 'add'
+                       else record['id']]
+            for task_id in ids:
+                task = tasks.get(task_id)
+                old = self._categories.get(task_id)
+                if old is not None:
+                    dirty.add(old)
+                if task is not None:
+                    dirty.add(task.category)
+                self._place(task_id, task.category if task is not None else None)
+        if not dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        obsolete = [self._write_shard(category, tasks) for category in dirty]
+        self._write_manifest(obsolete)
+
+    def shard_sizes(self) -> Dict[str, int]:
+        """ Количество задач в каждом шарде (категории) """
+        return {category: len(ids) for category, ids in self._members.items()}
@@ -0,0 +1,260 @@
+"""
+Модуль содержит упорядоченные индексы задач по сроку выполнения и приоритету.
+
+SortedKeyList - отсортированный список ключей, разбитый на блоки ограниченного размера
+(как в библиотеке sortedcontainers). Вставка и удаление ключа стоят O(log N) на поиск
+блока плюс сдвиг внутри блока фиксированного размера, а перебор диапазона - O(log N + K).
+Длины блоков хранятся в дереве Фенвика, поэтому позиция ключа и количество ключей
+в диапазоне (count) вычисляются за O(log N). Дерево обновляется при вставке и удалении
+ключа и перестраивается за O(N / LOAD) только при разбиении или удалении блока.
+
+SortedIndex хранит ключи задач в SortedKeyList и обновляется инкрементально методами
+add и remove, как и остальные индексы TaskManager. Ключи строятся функциями:
+- due_key: (выполнена, ординал срока, id) - для задач с корректной датой;
+- priority_key: (выполнена, -ранг приоритета, ординал срока, id).
+Первый элемент ключа (0 - активная задача, 1 - все остальные) делает активные задачи
+непрерывным префиксом индекса, поэтому выборки "ближайшие", "просроченные" и
+"самые важные" по активным задачам не перебирают выполненные.
+"""
+
+import sys
+from bisect import bisect_left, insort
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from Task.tasks_class import PRIORITY_RANK
+
+
+def _done_flag(task: Any) -> int:
+    return 0 if task.status == 'Не выполнена' else 1
+
+
+def due_key(task: Any) -> Optional[Tuple[int, int, int]]:
+    """ Ключ индекса по сроку выполнения (None, если дата некорректная) """
+    ordinal = task.due_ordinal
+    if ordinal is None:
+        return None
+    return _done_flag(task), ordinal, task.id
+
+
+def priority_key(task: Any) -> Tuple[int, int, int, int]:
+    """ Ключ индекса по приоритету (более важные задачи и ранние сроки идут первыми) """
+    ordinal = task.due_ordinal
+    if ordinal is None:
+        ordinal = sys.maxsize
+    rank = PRIORITY_RANK.get(task.priority.lower(), 0)
+    return _done_flag(task), -rank, ordinal, task.id
+
+
+class SortedKeyList:
+    LOAD = 512
+
+    def __init__(self) -> None:
+        """ Инициализация пустого отсортированного списка """
+        self._lists: List[List[tuple]] = []
+        self._maxes: List[tuple] = []
+        self._len: int = 0
+        # дерево Фенвика по длинам блоков (None - нужно перестроить)
+        self._tree: Optional[List[int]] = None
+
+    def add(self, key: tuple) -> None:
+        """ Добавляет ключ с сохранением порядка """
+        if not self._maxes:
+            self._lists.append([key])
+            self._maxes.append(key)
+            self._tree = None
+        else:
+            pos = bisect_left(self._maxes, key)
+            if pos == len(self._maxes):
+                pos -= 1
+                self._lists[pos].append(key)
+                self._maxes[pos] = key
+            else:
+                insort(self._lists[pos], key)
+            self._update(pos, 1)
+            self._split(pos)
+        self._len += 1
+
+    def _split(self, pos: int) -> None:
+        block = self._lists[pos]
+        if len(block) > 2 * self.LOAD:
+            half = block[self.LOAD:]
+            del block[self.LOAD:]
+            self._maxes[pos] = block[-1]
+            self._lists.insert(pos + 1, half)
+            self._maxes.insert(pos + 1, half[-1])
+            self._tree = None
+
+    def _update(self, pos: int, delta: int) -> None:
+        """ Изменяет длину блока pos в дереве Фенвика """
+        tree = self._tree
+        if tree is None:
+            return
+        pos += 1
+        while pos < len(tree):
+            tree[pos] += delta
+            pos += pos & -pos
+
+    def _build_tree(self) -> List[int]:
+        tree = [0] + [len(block) for block in self._lists]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+        return tree
+
+    def _prefix(self, pos: int) -> int:
+        """ Количество ключей в блоках с номерами меньше pos """
+        tree = self._tree if self._tree is not None else self._build_tree()
+        total = 0
+        while pos > 0:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def remove(self, key: tuple) -> bool:
+        """
+        Удаляет ключ.
+
+        :return: True, если ключ был найден и удален.
+        """
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return False
+        block = self._lists[pos]
+        i = bisect_left(block, key)
+        if i == len(block) or block[i] != key:
+            return False
+        del block[i]
+        self._len -= 1
+        if not block:
+            del self._lists[pos]
+            del self._maxes[pos]
+            self._tree = None
+            return True
+        self._update(pos, -1)
+        if i == len(block):
+            self._maxes[pos] = block[-1]
+        return True
+
+    def clear(self) -> None:
+        self._lists.clear()
+        self._maxes.clear()
+        self._len = 0
+        self._tree = None
+
+    def _locate(self, key: tuple) -> Tuple[int, int]:
+        pos = bisect_left(self._maxes, key)
+        if pos == len(self._maxes):
+            return pos, 0
+        return pos, bisect_left(self._lists[pos], key)
+
+    def irange(self, lo: Optional[tuple] = None, hi: Optional[tuple] = None,
+               reverse: bool = False) -> Iterator[tuple]:
+        """
+        Перебирает ключи из полуинтервала [lo, hi).
+
+        :param lo: Нижняя граница (включительно), None - с начала.
+        :param hi: Верхняя граница (не включительно), None - до конца.
+        :param reverse: Перебор в обратном порядке.
+        """
+        if not reverse:
+            pos, i = (0, 0) if lo is None else self._locate(lo)
+            while pos < len(self._lists):
+                for key in self._lists[pos][i:]:
+                    if hi is not None and key >= hi:
+                        return
+                    yield key
+                pos, i = pos + 1, 0
+            return
+        if not self._lists:
+            return
+        if hi is None:
+            pos = len(self._lists) - 1
+            i = len(self._lists[pos])
+        else:
+            pos, i = self._locate(hi)
+            if pos == len(self._lists):
+                pos -= 1
+                i = len(self._lists[pos])
+        while pos >= 0:
+            block = self._lists[pos]
+            for j in range(i - 1, -1, -1):
+                if lo is not None and block[j] < lo:
+                    return
+                yield block[j]
+            pos -= 1
+            i = len(self._lists[pos]) if pos >= 0 else 0
+
+    def _position(self, key: tuple) -> int:
+        pos, i = self._locate(key)
+        return self._prefix(pos) + i
+
+    def count(self, lo: tuple, hi: tuple) -> int:
+        """ Количество ключей в полуинтервале [lo, hi) """
+        return max(0, self._position(hi) - self._position(lo))
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[tuple]:
+        for block in self._lists:
+            yield from block
+
+
+class SortedIndex:
+    def __init__(self, fields: Tuple[str, ...],
+                 key_func: Callable[[Any], Optional[tuple]]) -> None:
+        """
+        Инициализация упорядоченного индекса.
+
+        :param fields: Поля задачи, от которых зависит ключ.
+        :param key_func: Функция построения ключа задачи (None - задача не индексируется).
+        """
+        self.fields = fields
+        self.key_func = key_func
+        self.keys = SortedKeyList()
+        self.task_keys: Dict[int, tuple] = {}
+
+    def add(self, task: Any) -> None:
+        """ Добавляет задачу в индекс """
+        key = self.key_func(task)
+        if key is None:
+            return
+        self.keys.add(key)
+        self.task_keys[task.id] = key
+
+    def remove(self, task: Any) -> None:
+        """ Удаляет задачу из индекса """
+        key = self.task_keys.pop(task.id, None)
+        if key is not None:
+            self.keys.remove(key)
+
+    def clear(self) -> None:
+        """ Очищает индекс """
+        self.keys.clear()
+        self.task_keys.clear()
+
+    def ids(self, lo: Optional[tuple] = None, hi: Optional[tuple] = None,
+            limit: Optional[int] = None, reverse: bool = False) -> List[int]:
+        """
+        Возвращает id задач с ключами из полуинтервала [lo, hi) в порядке индекса.
+
+        :param lo: Нижняя граница ключа.
+        :param hi: Верхняя граница ключа.
+        :param limit: Максимальное количество id.
+        :param reverse: Обратный порядок.
+        :return: Список id задач.
+        """
+        result: List[int] = []
+        for key in self.keys.irange(lo, hi, reverse):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(key[-1])
+        return result
+
+    def count(self, lo: tuple, hi: tuple) -> int:
+        """ Количество задач с ключами из полуинтервала [lo, hi) """
+        return self.keys.count(lo, hi)
+
+    def __len__(self) -> int:
+        return len(self.keys)
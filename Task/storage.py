@@ -0,0 +1,357 @@
+"""
+Модуль содержит интерфейс хранилища задач TaskStorage и его реализации.
+
+TaskManager не работает с файлами напрямую, а обращается к хранилищу через методы:
+- load: последовательно возвращает словари задач (формат Task.to_dict);
+- load_changes: возвращает записи изменений, которые нужно применить после load (журнал);
+- save_all: сохраняет полный снимок всех задач;
+- apply: сохраняет группу записей изменений (add, patch, complete, delete);
+- close: освобождает ресурсы хранилища;
+- locked, external_changes, synced: блокировка между процессами и получение изменений,
+  сделанных другими процессами (для хранилищ, которые это поддерживают).
+
+Реализации:
+- JsonFileStorage - файл JSON (хранилище по умолчанию) с атомарной записью и необязательным журналом;
+  в режиме shared=True - с блокировкой файла и отслеживанием изменений других процессов;
+- SQLiteStorage - база SQLite (модуль sqlite3, режим WAL, индексы по полям, построчные изменения);
+- MemoryStorage - хранилище в памяти (для тестов и временных книг задач);
+- BinarySnapshotStorage (модуль Task.binary_snapshot) - двоичный снимок с доступом через mmap;
+- ShardedStorage (модуль Task.sharded_storage) - каталог с шардом на каждую категорию и манифестом.
+
+Функция open_storage выбирает хранилище по имени файла.
+"""
+
+import json
+import os
+import sqlite3
+import logging
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional
+from Task.file_utils import atomic_open
+from Task.file_lock import FileLock
+from Task.journal import TaskJournal, apply_record_to_dicts
+from Task.metrics import METRICS
+from Task.json_stream import iter_json_array
+from Task.lexicon import LEXICON_LOG
+from Task.user_exception import StorageError
+
+TASK_FIELDS = ('id', 'title', 'description', 'category', 'due_date',
+               'priority', 'status')
+
+
+class TaskStorage(ABC):
+    """ Базовый класс хранилища задач """
+
+    @abstractmethod
+    def load(self) -> Iterator[Dict[str, Any]]:
+        """ Последовательно возвращает словари задач """
+
+    def load_changes(self) -> Iterator[Dict[str, Any]]:
+        """ Возвращает записи изменений, которые нужно применить после load """
+        return iter(())
+
+    @abstractmethod
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        """ Сохраняет полный снимок задач """
+
+    def apply(self, records: List[Dict[str, Any]],
+              tasks: Dict[int, Any]) -> None:
+        """
+        Сохраняет группу изменений. По умолчанию переписывает полный снимок.
+
+        :param records: Записи изменений (add, patch, complete, delete).
+        :param tasks: Текущий словарь задач TaskManager (id -> Task).
+        """
+        self.save_all(list(tasks.values()))
+
+    def close(self) -> None:
+        """ Освобождает ресурсы хранилища """
+
+    def locked(self, shared: bool = False) -> ContextManager:
+        """ Блокировка хранилища между процессами (по умолчанию не требуется) """
+        return nullcontext()
+
+    def external_changes(self) -> List[Dict[str, Any]]:
+        """ Записи изменений, сделанных другими процессами с момента последней синхронизации """
+        return []
+
+    def synced(self, tasks: Dict[int, Any], ids: Iterable[int]) -> None:
+        """
+        Отмечает задачи с указанными id как синхронизированные с хранилищем.
+
+        :param tasks: Текущий словарь задач TaskManager (id -> Task).
+        :param ids: Идентификаторы задач, состояние которых совпадает с хранилищем.
+        """
+
+
+def _task_hash(task_data: Dict[str, Any]) -> int:
+    return hash(tuple(task_data[field] for field in TASK_FIELDS))
+
+
+class JsonFileStorage(TaskStorage):
+    def __init__(self, filename: str = 'tasks_book.json',
+                 journal: bool = False, journal_max_records: int = 1000,
+                 journal_max_bytes: int = 1024 * 1024,
+                 chunk_size: int = 64 * 1024, shared: bool = False) -> None:
+        """
+        Инициализация хранилища в файле JSON.
+
+        :param filename: Имя файла задач.
+        :param journal: Дописывать изменения в журнал '<filename>.journal' вместо перезаписи файла.
+        :param journal_max_records: Количество записей журнала, после которого выполняется компактизация.
+        :param journal_max_bytes: Размер журнала в байтах, после которого выполняется компактизация.
+        :param chunk_size: Размер блока потокового чтения файла в символах.
+        :param shared: Файл используют несколько процессов: блокировка '<filename>.lock' и
+                       отслеживание чужих изменений (по mtime/размеру снимка и размеру журнала).
+        """
+        self.filename: str = filename
+        self.chunk_size: int = chunk_size
+        self.journal: Optional[TaskJournal] = None
+        if journal:
+            self.journal = TaskJournal(f"{filename}.journal",
+                                       journal_max_records, journal_max_bytes)
+        self.shared: bool = shared
+        self.lock: Optional[FileLock] = FileLock(f"{filename}.lock") if shared else None
+        # Отпечаток снимка и хеши задач на момент последней синхронизации (режим shared)
+        self._snapshot_stamp: Optional[tuple] = None
+        self._hashes: Dict[int, int] = {}
+
+    def _snapshot_stat(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _read_snapshot(self) -> Iterator[Dict[str, Any]]:
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding='utf-8') as f:
+            yield from iter_json_array(f, self.chunk_size)
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        if not self.shared:
+            yield from self._read_snapshot()
+            return
+        self._snapshot_stamp = self._snapshot_stat()
+        self._hashes.clear()
+        for task_data in self._read_snapshot():
+            self._hashes[task_data['id']] = _task_hash(task_data)
+            yield task_data
+
+    def load_changes(self) -> Iterator[Dict[str, Any]]:
+        if self.journal is None:
+            return iter(())
+        return self.journal.replay()
+
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        with atomic_open(self.filename, 'w', encoding='utf-8') as f:
+            data: List[Dict[str, Any]] = [task.to_dict() for task in tasks]
+            json.dump(data, f, ensure_ascii=False, indent=4)
+        METRICS.inc('storage_written_bytes_total',
+                    os.path.getsize(self.filename), backend='json')
+        if self.journal:
+            # Снимок содержит все изменения журнала, поэтому журнал больше не нужен
+            self.journal.truncate()
+        if self.shared:
+            self._snapshot_stamp = self._snapshot_stat()
+            self._hashes = {task_data['id']: _task_hash(task_data)
+                            for task_data in data}
+
+    def apply(self, records: List[Dict[str, Any]],
+              tasks: Dict[int, Any]) -> None:
+        if self.journal is None:
+            self.save_all(list(tasks.values()))
+            return
+        self.journal.append_many(records)
+        if self.journal.needs_compaction():
+            self.save_all(list(tasks.values()))
+            logging.info(LEXICON_LOG['journal_compact'])
+        elif self.shared:
+            self.synced(tasks, record_ids(records))
+
+    def locked(self, shared: bool = False) -> ContextManager:
+        if self.lock is None:
+            return nullcontext()
+        return self.lock.acquire(shared)
+
+    def external_changes(self) -> List[Dict[str, Any]]:
+        """
+        Записи изменений, сделанных другими процессами с момента последней синхронизации.
+
+        Если другой процесс только дописал журнал, читаются лишь новые записи журнала.
+        Если снимок был переписан, он перечитывается, и возвращаются только задачи,
+        отличающиеся от последней синхронизированной версии (по хешам), и удаленные задачи.
+        Вызывать под блокировкой locked().
+        """
+        if not self.shared:
+            return []
+        stamp = self._snapshot_stat()
+        journal_size = self.journal.file_size() if self.journal else 0
+        if stamp == self._snapshot_stamp:
+            if self.journal is None or journal_size == self.journal.size:
+                return []
+            if journal_size > self.journal.size:
+                return list(self.journal.replay(self.journal.size))
+        data: Dict[int, Dict[str, Any]] = {
+            task_data['id']: task_data for task_data in self._read_snapshot()}
+        if self.journal:
+            for record in self.journal.replay():
+                apply_record_to_dicts(data, record)
+        self._snapshot_stamp = stamp
+        records: List[Dict[str, Any]] = [
+            {'op': 'add', 'task': task_data} for task_id, task_data in data.items()
+            if self._hashes.get(task_id) != _task_hash(task_data)]
+        deleted = [task_id for task_id in self._hashes if task_id not in data]
+        if deleted:
+            records.append({'op': 'delete', 'ids': deleted})
+        return records
+
+    def synced(self, tasks: Dict[int, Any], ids: Iterable[int]) -> None:
+        if not self.shared:
+            return
+        for task_id in ids:
+            if task_id in tasks:
+                self._hashes[task_id] = _task_hash(tasks[task_id].to_dict())
+            else:
+                self._hashes.pop(task_id, None)
+
+
+def record_ids(records: Iterable[Dict[str, Any]]) -> List[int]:
+    """ Идентификаторы задач, затронутых записями изменений """
+    ids: List[int] = []
+    for record in records:
+        if record['op'] == 'add':
+            ids.append(record['task']['id'])
+        elif record['op'] == 'delete':
+            ids.extend(record['ids'])
+        else:
+            ids.append(record['id'])
+    return ids
+
+
+class SQLiteStorage(TaskStorage):
+    def __init__(self, filename: str = 'tasks_book.db') -> None:
+        """
+        Инициализация хранилища в базе SQLite.
+
+        :param filename: Имя файла базы данных.
+        :raises StorageError: Если базу не удалось открыть.
+        """
+        self.filename: str = filename
+        try:
+            self.connection = sqlite3.connect(filename,
+                                              check_same_thread=False)
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.execute('PRAGMA synchronous=NORMAL')
+            with self.connection:
+                self.connection.execute(
+                    'CREATE TABLE IF NOT EXISTS tasks ('
+                    'id INTEGER PRIMARY KEY, title TEXT NOT NULL, '
+                    'description TEXT NOT NULL, category TEXT NOT NULL, '
+                    'due_date TEXT NOT NULL, priority TEXT NOT NULL, '
+                    'status TEXT NOT NULL)')
+                for field in ('category', 'status', 'priority', 'due_date'):
+                    self.connection.execute(
+                        f'CREATE INDEX IF NOT EXISTS tasks_{field} '
+                        f'ON tasks ({field})')
+        except sqlite3.Error as e:
+            raise StorageError(filename, e)
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        try:
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(TASK_FIELDS)} FROM tasks ORDER BY id")
+            for row in cursor:
+                yield dict(zip(TASK_FIELDS, row))
+        except sqlite3.Error as e:
+            raise StorageError(self.filename, e)
+
+    def _upsert(self, rows: Iterable[Dict[str, Any]]) -> None:
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_FIELDS)}) "
+            f"VALUES ({', '.join('?' * len(TASK_FIELDS))})",
+            ([row[field] for field in TASK_FIELDS] for row in rows))
+
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        try:
+            with self.connection:
+                self.connection.execute('DELETE FROM tasks')
+                self._upsert(task.to_dict() for task in tasks)
+        except sqlite3.Error as e:
+            raise StorageError(self.filename, e)
+
+    def apply(self, records: List[Dict[str, Any]],
+              tasks: Dict[int, Any]) -> None:
+        # Изменённые строки записываются по текущему состоянию задачи, удалённые - удаляются
+        changed: Dict[int, None] = {}
+        deleted: List[int] = []
+        for record in records:
+            if record['op'] == 'delete':
+                deleted.extend(record['ids'])
+            elif record['op'] == 'add':
+                changed[record['task']['id']] = None
+            else:
+                changed[record['id']] = None
+        try:
+            with self.connection:
+                if deleted:
+                    self.connection.executemany(
+                        'DELETE FROM tasks WHERE id = ?',
+                        ((task_id,) for task_id in deleted))
+                self._upsert(tasks[task_id].to_dict() for task_id in changed
+                             if task_id in tasks)
+        except sqlite3.Error as e:
+            raise StorageError(self.filename, e)
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class MemoryStorage(TaskStorage):
+    def __init__(self) -> None:
+        """ Инициализация пустого хранилища в памяти """
+        self.filename: str = ':memory:'
+        self.data: Dict[int, Dict[str, Any]] = {}
+
+    def load(self) -> Iterator[Dict[str, Any]]:
+        for task_data in list(self.data.values()):
+            yield dict(task_data)
+
+    def save_all(self, tasks: Iterable[Any]) -> None:
+        self.data = {task.id: task.to_dict() for task in tasks}
+
+    def apply(self, records: List[Dict[str, Any]],
+              tasks: Dict[int, Any]) -> None:
+        for record in records:
+            if record['op'] == 'delete':
+                for task_id in record['ids']:
+                    self.data.pop(task_id, None)
+                continue
+            task_id = record['task']['id'] if record['op'] == 'add' else record['id']
+            if task_id in tasks:
+                self.data[task_id] = tasks[task_id].to_dict()
+
+
+def open_storage(filename: str, **kwargs: Any) -> TaskStorage:
+    """
+    Открывает хранилище по имени файла: .db/.sqlite/.sqlite3 - SQLite,
+    .bin - двоичный снимок, .shards - каталог шардов по категориям,
+    ':memory:' - хранилище в памяти, остальные - файл JSON.
+
+    :param filename: Имя файла хранилища.
+    :param kwargs: Дополнительные параметры для JsonFileStorage.
+    :return: Экземпляр хранилища.
+    """
+    if filename == ':memory:':
+        return MemoryStorage()
+    if os.path.splitext(filename)[1].lower() in ('.db', '.sqlite', '.sqlite3'):
+        return SQLiteStorage(filename)
+    if os.path.splitext(filename)[1].lower() == '.bin':
+        from Task.binary_snapshot import BinarySnapshotStorage
+        return BinarySnapshotStorage(filename)
+    if os.path.splitext(filename)[1].lower() == '.shards':
+        from Task.sharded_storage import ShardedStorage
+        return ShardedStorage(filename)
+    return JsonFileStorage(filename, **kwargs)
@@ -16,25 +16,82 @@
 Класс может использоваться в приложениях для управления задачами, 
 где требуется отслеживать их выполнение, сортировку по категориям и приоритетам, 
 а также изменение статуса.
+
+Для экономии памяти на больших книгах задач объекты Task не имеют __dict__ (__slots__),
+повторяющиеся строки категории, приоритета и статуса интернируются (одна копия строки
+на все задачи), а срок выполнения хранится как ординал даты (int). Свойство due_date
+по-прежнему возвращает строку 'ГГГГ-ММ-ДД', а due_ordinal - ординал для индексов.
 """
 
-from typing import Dict
+import sys
+from datetime import datetime, date
+from typing import Dict, Optional
+
+# Допустимые приоритеты задач и их ранг для сортировки (чем больше, тем важнее)
+PRIORITY_RANK: Dict[str, int] = {"низкий": 1, "средний": 2, "высокий": 3}
+# Статус выполненной задачи
+COMPLETED = 'Выполнена'
+
+
+def parse_date(data: Optional[str]) -> Optional[date]:
+    """
+    Преобразует строку формата 'ГГГГ-ММ-ДД' в дату.
+
+    :param data: Строка с датой.
+    :return: Дата или None, если строка пустая или имеет неверный формат.
+    """
+    try:
+        return datetime.strptime(data, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """ Интернирует строку, чтобы одинаковые значения полей хранились в памяти один раз """
+    return sys.intern(value) if type(value) is str else value
 
 
 class Task:
+    __slots__ = ('id', 'title', 'description', 'category', '_due',
+                 'priority', 'status')
+
     def __init__(self, book_id: int, title: str, description: str,
                  category: str,
                  due_date: str, priority: str):
         self.id = book_id
         self.title = title
         self.description = description
-        self.category = category
+        self.category = _intern(category)
         self.due_date = due_date
-        self.priority = priority
+        self.priority = _intern(priority)
         self.status = 'Не выполнена'
 
+    @property
+    def due_date(self) -> str:
+        if type(self._due) is int:
+            return date.fromordinal(self._due).isoformat()
+        return self._due
+
+    @due_date.setter
+    def due_date(self, value: str) -> None:
+        # Ординал хранится только если строка восстанавливается из него без изменений
+        try:
+            parsed = date.fromisoformat(value)
+        except (TypeError, ValueError):
+            self._due = value
+            return
+        self._due = parsed.toordinal() if parsed.isoformat() == value else value
+
+    @property
+    def due_ordinal(self) -> Optional[int]:
+        """ Ординал срока выполнения или None, если дата некорректная """
+        if type(self._due) is int:
+            return self._due
+        parsed = parse_date(self._due)
+        return parsed.toordinal() if parsed else None
+
     def mark_completed(self):
-        self.status = 'Выполнена'
+        self.status = COMPLETED
 
     def to_dict(self) -> Dict[str, str]:
         return {
@@ -52,5 +109,5 @@ class Task:
         task = Task(data['id'], data['title'], data['description'],
                     data['category'],
                     data['due_date'], data['priority'])
-        task.status = data['status']
+        task.status = _intern(data['status'])
         return task
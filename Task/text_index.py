@@ -0,0 +1,121 @@
+"""
+Модуль содержит класс TrigramIndex - инвертированный триграммный индекс по названию
+и описанию задач.
+
+Для каждой задачи названия и описания приводятся к нижнему регистру и разбиваются на
+триграммы (подстроки длиной 3 символа). Индекс хранит соответствие "триграмма -> id задач".
+Поиск по ключевому слову пересекает списки задач для всех триграмм запроса (начиная
+с самого короткого), после чего кандидаты проверяются обычным поиском подстроки.
+Так сохраняется прежняя семантика поиска (подстрока без учета регистра), но проверяются
+только задачи-кандидаты, а не вся книга задач.
+
+Ключевые слова короче трех символов ищутся по словарю триграмм, содержащих запрос,
+плюс по задачам с очень короткими полями, у которых триграмм нет.
+"""
+
+from typing import Dict, List, Set, Any
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Возвращает множество триграмм строки.
+
+    :param text: Строка (уже в нижнем регистре).
+    :return: Множество подстрок длиной 3 символа.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    fields = ('title', 'description')
+
+    def __init__(self) -> None:
+        """ Инициализация пустого индекса """
+        self.postings: Dict[str, Set[int]] = {}
+        self.short: Set[int] = set()
+
+    @staticmethod
+    def _texts(task: Any) -> List[str]:
+        return [task.title.lower(), task.description.lower()]
+
+    def _task_trigrams(self, task: Any) -> Set[str]:
+        grams: Set[str] = set()
+        for text in self._texts(task):
+            grams |= trigrams(text)
+        return grams
+
+    def add(self, task: Any) -> None:
+        """ Добавляет задачу в индекс """
+        for gram in self._task_trigrams(task):
+            self.postings.setdefault(gram, set()).add(task.id)
+        if any(len(text) < 3 for text in self._texts(task)):
+            self.short.add(task.id)
+
+    def remove(self, task: Any) -> None:
+        """ Удаляет задачу из индекса """
+        for gram in self._task_trigrams(task):
+            ids = self.postings.get(gram)
+            if ids is None:
+                continue
+            ids.discard(task.id)
+            if not ids:
+                del self.postings[gram]
+        self.short.discard(task.id)
+
+    def clear(self) -> None:
+        """ Очищает индекс """
+        self.postings.clear()
+        self.short.clear()
+
+    def candidates(self, keyword: str) -> Set[int]:
+        """
+        Возвращает id задач, которые могут содержать ключевое слово (без финальной проверки).
+
+        :param keyword: Ключевое слово в нижнем регистре.
+        :return: Множество id задач-кандидатов.
+        """
+        if len(keyword) >= 3:
+            posting_lists = []
+            for gram in trigrams(keyword):
+                ids = self.postings.get(gram)
+                if not ids:
+                    return set()
+                posting_lists.append(ids)
+            posting_lists.sort(key=len)
+            result = set(posting_lists[0])
+            for ids in posting_lists[1:]:
+                result &= ids
+                if not result:
+                    break
+            return result
+        result = set(self.short)
+        for gram, ids in self.postings.items():
+            if keyword in gram:
+                result |= ids
+        return result
+
+    def estimate(self, keyword: str, total: int) -> int:
+        """
+        Оценивает сверху количество задач, содержащих ключевое слово (для планировщика запросов).
+
+        :param keyword: Ключевое слово.
+        :param total: Общее количество задач.
+        :return: Оценка количества задач.
+        """
+        keyword = keyword.lower()
+        if len(keyword) < 3:
+            return total
+        return min(len(self.postings.get(gram, ())) for gram in trigrams(keyword))
+
+    def search(self, keyword: str, tasks: Dict[int, Any]) -> List[int]:
+        """
+        Поиск задач, у которых название или описание содержит ключевое слово без учета регистра.
+
+        :param keyword: Ключевое слово.
+        :param tasks: Словарь задач TaskManager (id -> Task) для проверки кандидатов.
+        :return: Список id найденных задач.
+        """
+        keyword = keyword.lower()
+        return [task_id for task_id in self.candidates(keyword)
+                if any(keyword in text
+                       for text in self._texts(tasks[task_id]))]
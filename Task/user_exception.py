@@ -79,3 +79,26 @@ class InvalidPriorityError(TaskError):
 
     def __str__(self) -> str:
         return f"Такого приоритета нет - {self.data}"
+
+
+class StorageError(TaskError):
+    """Ошибка, возникающая при чтении или записи хранилища задач."""
+
+    def __init__(self, filename: str, error: Exception) -> None:
+        super().__init__()
+        self.filename = filename
+        self.error = error
+
+    def __str__(self) -> str:
+        return f"Ошибка хранилища задач {self.filename} - {self.error}"
+
+
+class ConflictError(TaskError):
+    """Ошибка, возникающая при одновременном изменении задачи другим процессом."""
+
+    def __init__(self, task_id: int) -> None:
+        super().__init__()
+        self.task_id = task_id
+
+    def __str__(self) -> str:
+        return f"Задача с id - {self.task_id} одновременно изменена в другом процессе"
@@ -0,0 +1,7 @@
+"""
+Пакет бенчмарков TaskManager: генератор синтетической книги задач (generator), замеры
+операций на разных размерах книги (run) и сравнение двух прогонов (compare).
+
+Запуск: python -m benchmarks.run --sizes 1000 10000 100000 --output results.json
+Сравнение: python -m benchmarks.compare old.json new.json [--threshold 0.2]
+"""
@@ -0,0 +1,70 @@
+"""
+Модуль сравнивает два прогона бенчмарков (результаты benchmarks.run) и отмечает регрессии.
+
+Замеры сопоставляются по сценарию и размеру книги задач. Регрессией считается рост
+медианного времени больше чем на threshold (по умолчанию 20%) и не меньше чем на min_delta
+секунд (чтобы не отмечать колебания микросекундных операций). При наличии регрессий
+команда завершается с кодом 1, что удобно для проверок в CI.
+
+Запуск: python -m benchmarks.compare old.json new.json [--threshold 0.2]
+"""
+
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any],
+            threshold: float = 0.2, metric: str = 'median_s',
+            min_delta: float = 1e-5) -> List[Dict[str, Any]]:
+    """
+    Сравнивает два прогона бенчмарков.
+
+    :param old: Результаты прежнего прогона.
+    :param new: Результаты нового прогона.
+    :param threshold: Допустимый относительный рост времени.
+    :param metric: Сравниваемая величина (min_s, median_s, mean_s).
+    :param min_delta: Минимальный абсолютный рост времени в секундах для регрессии.
+    :return: Строки сравнения (сценарий, размер, время до и после, отношение, признак регрессии).
+    """
+    previous = {(row['scenario'], row['size']): row for row in old['results']}
+    rows = []
+    for row in new['results']:
+        before = previous.get((row['scenario'], row['size']))
+        if before is None:
+            continue
+        ratio = row[metric] / before[metric] if before[metric] else float('inf')
+        rows.append({'scenario': row['scenario'], 'size': row['size'],
+                     'old': before[metric], 'new': row[metric],
+                     'ratio': ratio,
+                     'regression': (ratio > 1 + threshold and
+                                    row[metric] - before[metric] >= min_delta)})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Сравнение прогонов бенчмарков")
+    parser.add_argument('old')
+    parser.add_argument('new')
+    parser.add_argument('--threshold', type=float, default=0.2)
+    parser.add_argument('--metric', default='median_s',
+                        choices=['min_s', 'median_s', 'mean_s'])
+    parser.add_argument('--min-delta', type=float, default=1e-5,
+                        help="минимальный рост времени в секундах")
+    args = parser.parse_args(argv)
+    with open(args.old, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(args.new, encoding='utf-8') as f:
+        new = json.load(f)
+    rows = compare(old, new, args.threshold, args.metric, args.min_delta)
+    for row in rows:
+        mark = '  РЕГРЕССИЯ' if row['regression'] else ''
+        print(f"{row['scenario']:<22}{row['size']:>10}"
+              f"{row['old'] * 1000:>12.3f} мс{row['new'] * 1000:>12.3f} мс"
+              f"{row['ratio']:>8.2f}x{mark}")
+    return 1 if any(row['regression'] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Модуль содержит генератор синтетической книги задач для бенчмарков.
+
+Параметры: количество задач, количество различных категорий, длина описания
+и доля выполненных задач. Генерация детерминирована при одинаковом seed.
+"""
+
+import json
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator
+from Task.file_utils import atomic_open
+
+PRIORITIES = ('низкий', 'средний', 'высокий')
+WORDS = ('отчет', 'встреча', 'звонок', 'проект', 'план', 'бюджет', 'релиз',
+         'ревью', 'документ', 'клиент', 'сервер', 'дизайн', 'тест', 'договор')
+
+
+def generate_tasks(count: int, categories: int = 20,
+                   description_length: int = 40,
+                   completed_ratio: float = 0.25,
+                   seed: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+    Последовательно возвращает словари задач (формат Task.to_dict).
+
+    :param count: Количество задач.
+    :param categories: Количество различных категорий.
+    :param description_length: Длина описания в символах.
+    :param completed_ratio: Доля выполненных задач.
+    :param seed: Зерно генератора случайных чисел.
+    :return: Итератор словарей задач.
+    """
+    rnd = random.Random(seed)
+    start = date.today() + timedelta(days=1)
+    for task_id in range(1, count + 1):
+        words = []
+        while sum(len(word) + 1 for word in words) < description_length:
+            words.append(rnd.choice(WORDS))
+        yield {'id': task_id,
+               'title': f"{rnd.choice(WORDS).capitalize()} {task_id}",
+               'description': ' '.join(words)[:description_length],
+               'category': f"Категория {rnd.randrange(categories)}",
+               'due_date': (start + timedelta(days=rnd.randrange(730))).isoformat(),
+               'priority': rnd.choice(PRIORITIES),
+               'status': ('Выполнена' if rnd.random() < completed_ratio
+                          else 'Не выполнена')}
+
+
+def write_task_book(filename: str, count: int, **options: Any) -> None:
+    """
+    Записывает синтетическую книгу задач в файл JSON (в формате TaskManager).
+
+    :param filename: Имя файла.
+    :param count: Количество задач.
+    :param options: Параметры generate_tasks.
+    """
+    with atomic_open(filename, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i, task_data in enumerate(generate_tasks(count, **options)):
+            f.write(',\n' if i else '\n')
+            json.dump(task_data, f, ensure_ascii=False)
+        f.write('\n]')
@@ -0,0 +1,187 @@
+"""
+Модуль замеряет время операций TaskManager на синтетических книгах задач разного размера.
+
+Для каждого размера генерируется книга задач (benchmarks.generator), после чего каждый сценарий
+выполняется repeat раз, и для него сохраняются минимум, медиана и среднее время одной операции.
+Быстрые сценарии чтения внутри одного повтора выполняются несколько раз подряд (не короче
+MIN_REPEAT_TIME), чтобы время не терялось в погрешности таймера. Изменяющие сценарии
+работают с отдельной копией книги и сохраняют каждое изменение, как в обычной работе.
+
+Менеджер задач создается без кэша результатов (cache_size=0), иначе повторные вызовы
+одного сценария замеряли бы попадания в LRU-кэш, а не саму операцию. Попадания в кэш
+замеряются отдельными сценариями CACHED_SCENARIOS (менеджер с кэшем по умолчанию).
+
+Результат - JSON с описанием окружения и списком замеров, пригодный для benchmarks.compare.
+
+Запуск: python -m benchmarks.run [--sizes 1000 10000 100000] [--repeat 5] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import tempfile
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from Task.TaskManager import TaskManager
+from benchmarks.generator import write_task_book, WORDS
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+CACHE_SIZE = 256  # размер кэша для сценариев CACHED_SCENARIOS
+MIN_REPEAT_TIME = 0.005  # секунд на один повтор быстрого сценария чтения
+
+
+def _load(filename: str, journal: bool) -> Callable[[Any, int], Any]:
+    return lambda manager, i: TaskManager(filename, journal=journal,
+                                          cache_size=0)
+
+
+def _mutation(method: str) -> Callable[[Any, int], Any]:
+    def run(manager: TaskManager, i: int) -> Any:
+        # разные задачи на каждом повторе без перебора всего словаря задач
+        task_id = str((i * 7919) % (manager.next_id - 1) + 1)
+        if method == 'update_task':
+            return manager.update_task(task_id, {'title': f"Изменена {i}"})
+        if method == 'mark_task_completed':
+            return manager.mark_task_completed(task_id)
+        return manager.delete_task(task_id)
+    return run
+
+
+# Сценарий: (изменяет ли задачи, функция (manager, номер повтора) -> результат)
+SCENARIOS: Dict[str, tuple] = {
+    'save_tasks': (False, lambda manager, i: manager.save_tasks()),
+    'view_tasks_all': (False, lambda manager, i: manager.view_tasks_all()),
+    'view_tasks_category': (False,
+                            lambda manager, i: manager.view_tasks_category()),
+    'search_keyword': (False, lambda manager, i: manager.query(
+        keyword=WORDS[i % len(WORDS)])),
+    'search_title_rare': (False, lambda manager, i: manager.query(
+        keyword=f"{WORDS[i % len(WORDS)]} {i + 1}")),
+    'ranked_search': (False, lambda manager, i: manager.ranked_search(
+        WORDS[i % len(WORDS)][:-1] + 'ы', limit=10)),
+    'search_category': (False, lambda manager, i: manager.query(
+        category=f"Категория {i}")),
+    'query_combined': (False, lambda manager, i: manager.query(
+        category=f"Категория {i}", status='Не выполнена', priority='высокий',
+        order_by='due_date', limit=20)),
+    'next_due': (False, lambda manager, i: manager.next_due(20)),
+    'top_by_priority': (False, lambda manager, i: manager.top_by_priority(20)),
+    'overdue_count': (False, lambda manager, i: manager.overdue_count()),
+    'due_within': (False, lambda manager, i: manager.due_within(7)),
+    'weekly_histogram': (False, lambda manager, i: manager.weekly_histogram()),
+    'query_cached': (False, lambda manager, i: manager.query(
+        category="Категория 0", status='Не выполнена', order_by='due_date',
+        limit=20)),
+    'add_task': (True, lambda manager, i: manager.add_task(
+        f"Новая {i}", "Описание", "Категория 0", "2030-11-30", "средний")),
+    'update_task': (True, _mutation('update_task')),
+    'mark_task_completed': (True, _mutation('mark_task_completed')),
+    'delete_task': (True, _mutation('delete_task')),
+}
+# Сценарии, которые выполняются с включенным кэшем результатов (повторный запрос)
+CACHED_SCENARIOS = {'query_cached'}
+
+
+def _time(func: Callable[[Any, int], Any], manager: Any, repeat: int,
+          calibrate: bool) -> List[float]:
+    """ Время одной операции на каждом повторе (для calibrate - среднее по серии вызовов) """
+    number = 1
+    if calibrate:
+        start = time.perf_counter()
+        func(manager, 0)
+        once = time.perf_counter() - start
+        number = max(1, int(MIN_REPEAT_TIME / once)) if once else 1000
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(manager, i)
+        timings.append((time.perf_counter() - start) / number)
+    return timings
+
+
+def run_benchmarks(sizes: tuple = DEFAULT_SIZES, repeat: int = 5,
+                   scenarios: Optional[List[str]] = None,
+                   journal: bool = False, directory: Optional[str] = None,
+                   **generator_options: Any) -> Dict[str, Any]:
+    """
+    Выполняет сценарии на книгах задач указанных размеров.
+
+    :param sizes: Размеры книги задач.
+    :param repeat: Количество повторов каждого сценария.
+    :param scenarios: Имена сценариев (None - все, включая load_tasks).
+    :param journal: Использовать журнал изменений при сохранении.
+    :param directory: Каталог для файлов книг задач (по умолчанию временный).
+    :param generator_options: Параметры генератора (categories, description_length, completed_ratio, seed).
+    :return: Словарь с описанием окружения (meta) и замерами (results).
+    """
+    names = scenarios or ['load_tasks', *SCENARIOS]
+    results = []
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for size in sizes:
+            source = os.path.join(tmp, f"book_{size}.json")
+            write_task_book(source, size, **generator_options)
+            for name in names:
+                filename = os.path.join(tmp, f"{name}_{size}.json")
+                with open(source, 'rb') as src, open(filename, 'wb') as dst:
+                    dst.write(src.read())
+                if name == 'load_tasks':
+                    mutates, func = True, _load(filename, journal)
+                    manager = None
+                else:
+                    mutates, func = SCENARIOS[name]
+                    cache_size = CACHE_SIZE if name in CACHED_SCENARIOS else 0
+                    manager = TaskManager(filename, journal=journal,
+                                          cache_size=cache_size)
+                timings = _time(func, manager, repeat, not mutates)
+                results.append({'scenario': name, 'size': size,
+                                'repeat': repeat,
+                                'min_s': min(timings),
+                                'median_s': statistics.median(timings),
+                                'mean_s': statistics.fmean(timings)})
+                if manager is not None:
+                    manager.close()
+                for path in (filename, filename + '.journal',
+                             filename + '.lock'):
+                    if os.path.exists(path):
+                        os.remove(path)
+    return {'meta': {'python': sys.version.split()[0],
+                     'platform': platform.platform(),
+                     'date': datetime.now().isoformat(timespec='seconds'),
+                     'journal': journal, 'generator': generator_options},
+            'results': results}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Бенчмарки операций TaskManager")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scenarios', nargs='+',
+                        choices=['load_tasks', *SCENARIOS])
+    parser.add_argument('--journal', action='store_true',
+                        help="сохранять изменения через журнал")
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--description-length', type=int, default=40)
+    parser.add_argument('--completed-ratio', type=float, default=0.25)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="файл JSON для результатов")
+    args = parser.parse_args(argv)
+    report = run_benchmarks(tuple(args.sizes), args.repeat, args.scenarios,
+                            args.journal, categories=args.categories,
+                            description_length=args.description_length,
+                            completed_ratio=args.completed_ratio,
+                            seed=args.seed)
+    for row in report['results']:
+        print(f"{row['scenario']:<22}{row['size']:>10}"
+              f"{row['median_s'] * 1000:>14.3f} мс")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=4)
+
+
+if __name__ == "__main__":
+    main()
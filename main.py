@@ -2,24 +2,21 @@
 
 """
 Модуль для запуска скрипта
-"""
-
 
+Без аргументов запускается интерактивное меню, с аргументами - неинтерактивная
+командная строка (python main.py --help).
+"""
 
+import sys
 from Task.Presenter import task_console
-import logging
-
-
-def setup_logging():
-    """Настройка логирования."""
-    logging.basicConfig(
-        filename='task.log',
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-    )
+from Task.logging_setup import setup_logging
 
 
 if __name__ == "__main__":
     setup_logging()  # Запуск логирования
 
+    if len(sys.argv) > 1:
+        from Task.cli import main
+        sys.exit(main())  # Выполнение команд из аргументов или пакетного файла
+
     task_console() # Запуск основной функции
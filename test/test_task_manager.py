@@ -7,6 +7,8 @@
 - тестирование создания задачи (test_task_creation_valid). 
 Тестирует создания задачи с определенными параметрами и проверяет корректность
 
+- компактное представление задачи (test_task_compact_representation, test_memory_report)
+
 - добавление новой задачи (test_add_task)
 Тестирует метод добавления задачи в систему.
 
@@ -18,16 +20,72 @@
 - поиск задач (test_search_tasks)
 Тестирует поиск задач по ключевому слову. 
 
-После завершения всех тестов файл с данными задач удаляется, чтобы избежать загрязнения данных 
-при последующих запусках тестов.
+- журнал изменений (test_journal_replay, test_journal_torn_write, test_journal_compaction)
+Проверяет восстановление задач из снимка и журнала и компактизацию журнала.
+
+- атомарная запись и групповое сохранение (test_save_tasks_atomic, test_batch_single_save,
+test_commit_delay_flush, test_flush_retry_after_error)
+
+- вторичные индексы (test_view_tasks_category_index, test_indexes_follow_mutations)
+
+- триграммный индекс поиска (test_search_tasks_text_index)
+
+- составной запрос (test_search_tasks_combined, test_query_plan_order)
+
+- упорядоченные индексы по сроку и приоритету (test_sorted_key_list, test_due_and_priority_queries)
+
+- потоковая и фоновая загрузка (test_streaming_load, test_streaming_load_strict, test_lazy_load)
+
+- хранилища задач (test_sqlite_storage, test_migrate_storage)
+
+- двоичный снимок (test_binary_snapshot)
+
+- общий файл задач для нескольких процессов (test_shared_concurrent_adds, test_shared_conflict_policy)
+
+- потокобезопасный режим (test_snapshot_immutable, test_thread_safe_stress)
+Смешанная нагрузка: несколько потоков изменяют задачи, другие одновременно читают и сверяют индексы.
+
+- сетевой API (test_server_api, test_server_reads_off_event_loop)
+Запросы по одному keep-alive соединению: добавление, постраничный список, условный GET, изменение, удаление.
+
+- бенчмарки (test_benchmarks_smoke)
+
+- метрики и профилирование (test_metrics, test_metrics_collectors_concurrent, test_profiled)
+
+- логирование через очередь (test_queue_logging)
+
+- командная строка (test_cli_commands, test_cli_batch)
+
+- массовый импорт и экспорт (test_bulk_import_export, test_bulk_import_malformed)
+
+- постраничный вывод задач (test_show_tasks_pages)
+
+- кэш результатов запросов (test_query_cache)
+
+- хранилище с шардами по категориям (test_sharded_storage)
+
+- архив выполненных задач (test_archive_completed, test_archive_in_memory)
+
+- инкрементальная статистика в сравнении с полным пересчетом (test_stats_incremental)
+
+- упакованный столбец сроков и аналитика по датам (test_due_date_column)
+
+- ранжированный поиск с учетом опечаток (test_ranked_search)
+
+Основные тесты TaskManager работают с общим хранилищем в памяти (MemoryStorage) и не трогают диск;
+тесты файловых режимов (журнал, атомарная запись, SQLite) используют временный каталог pytest.
 """
 
 
 import os
+import json
+import pytest
 from Task.tasks_class import Task
 from Task.TaskManager import TaskManager
+from Task.user_exception import NotTaskError, NotInputError, StorageError
+from Task.storage import MemoryStorage, SQLiteStorage, JsonFileStorage
 
-FILENAME = "test_tasks.json" # название файла для записи задач
+STORAGE = MemoryStorage() # общее хранилище задач для тестов TaskManager
 
 # Тест для класса Task
 
@@ -43,11 +101,33 @@ def test_task_creation_valid():
     assert task.status == 'Не выполнена'
 
 
+# Компактное представление задачи
+def test_task_compact_representation():
+    task = Task.from_task_in_dict({"id": 1, "title": "Test", "description": "",
+                                   "category": "Work" + "", "due_date": "2030-01-05",
+                                   "priority": "высокий", "status": "Выполнена"})
+    assert not hasattr(task, "__dict__")
+    assert task.due_date == "2030-01-05"
+    assert task.due_ordinal == 741082
+    task.due_date = "2030-1-5"
+    assert task.due_date == "2030-1-5"
+    assert task.due_ordinal == 741082
+    task.due_date = "не дата"
+    assert task.due_ordinal is None
+    assert task.to_dict()["due_date"] == "не дата"
+
+
+def test_memory_report():
+    from Task.memory_report import memory_report
+    report = memory_report(2000)
+    assert report["slots_bytes_per_task"] < report["legacy_bytes_per_task"]
+
+
 # Тесты для класса TaskManager
 
 # Добавление задачи
 def test_add_task():
-    task_manager = TaskManager(FILENAME)
+    task_manager = TaskManager(storage=STORAGE)
     initial_count = len(task_manager.tasks)
     task_manager.add_task("New Task", "Task description", "Personal", "2023-11-30", "высокий")
     assert len(task_manager.tasks) == initial_count + 1
@@ -56,7 +136,7 @@ def test_add_task():
 
 # Удаление задачи
 def test_delete_task():
-    task_manager = TaskManager(FILENAME)
+    task_manager = TaskManager(storage=STORAGE)
     task_manager.add_task("Task to delete", "Description", "Personal", "2023-11-30", "высокий")
     task_id = task_manager.tasks[2].id
     task_manager.delete_task(task_id=str(task_id))
@@ -65,7 +145,7 @@ def test_delete_task():
 
 # Изменение статуса задачи
 def test_mark_task_completed():
-    task_manager = TaskManager(FILENAME)
+    task_manager = TaskManager(storage=STORAGE)
     task_manager.add_task("Task to complete", "Description", "Work", "2023-11-30", "высокий")
     task_id = task_manager.tasks[1].id
     task_manager.mark_task_completed(task_id)
@@ -74,14 +154,1096 @@ def test_mark_task_completed():
 
 # Поиск задачи
 def test_search_tasks():
-    task_manager = TaskManager(FILENAME)
+    task_manager = TaskManager(storage=STORAGE)
     task_manager.add_task("Search Task", "Find me", "Misc", "2023-11-30", "высокий")
     results = task_manager.search_tasks(keyword="Find")
-    try: 
-        assert len(results) == 1
-        assert results[0].title == "Search Task"
-    
+    assert len(results) == 1
+    assert results[0].title == "Search Task"
+
+
+# Журнал изменений
+def test_journal_replay(tmp_path):
+    filename = str(tmp_path / "journal_tasks.json")
+    task_manager = TaskManager(filename, journal=True)
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("Task 2", "Description", "Home", "2030-11-30", "низкий")
+    task_manager.update_task("1", {"title": "Task 1 updated", "description": ""})
+    task_manager.mark_task_completed("2")
+    task_manager.delete_task(task_id="", category="Home")
+    assert not os.path.exists(filename)
+
+    restored = TaskManager(filename, journal=True)
+    assert list(restored.tasks) == [1]
+    assert restored.tasks[1].title == "Task 1 updated"
+    assert restored.tasks[1].description == "Description"
+    assert restored.next_id == 3
+
+
+def test_journal_torn_write(tmp_path):
+    from Task.journal import TaskJournal
+    journal = TaskJournal(str(tmp_path / "torn.journal"))
+    journal.append({"id": 1})
+    with open(journal.filename, "ab") as f:
+        f.write(b'{"id": 9, "ti')  # сбой посреди записи
+    journal.append({"id": 2})
+    assert list(journal.replay()) == [{"id": 1}, {"id": 2}]
+
+
+def test_journal_compaction(tmp_path):
+    filename = str(tmp_path / "journal_tasks.json")
+    task_manager = TaskManager(filename, journal=True, journal_max_records=3)
+    for i in range(4):
+        task_manager.add_task(f"Task {i}", "Description", "Work", "2030-11-30", "средний")
+    assert os.path.exists(filename)
+    assert task_manager.journal.records == 1
+
+    restored = TaskManager(filename, journal=True)
+    assert len(restored.tasks) == 4
+
+
+# Атомарная запись и групповое сохранение
+def test_save_tasks_atomic(tmp_path, monkeypatch):
+    filename = str(tmp_path / "atomic_tasks.json")
+    task_manager = TaskManager(filename)
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(json, "dump", broken_dump)
+    task_manager.add_task("Task 2", "Description", "Work", "2030-11-30", "высокий")
+    monkeypatch.undo()
+
+    with open(filename, encoding="utf-8") as f:
+        assert [task["title"] for task in json.load(f)] == ["Task 1"]
+    assert os.listdir(tmp_path) == ["atomic_tasks.json"]
+
+
+def test_batch_single_save(tmp_path, monkeypatch):
+    task_manager = TaskManager(str(tmp_path / "batch_tasks.json"))
+    saves = []
+    monkeypatch.setattr(task_manager.storage, "save_all", lambda tasks: saves.append(1))
+    with task_manager.batch():
+        task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+        task_manager.add_task("Task 2", "Description", "Work", "2030-11-30", "высокий")
+        task_manager.mark_task_completed("1")
+        assert saves == []
+    assert saves == [1]
+
+
+def test_commit_delay_flush(tmp_path):
+    filename = str(tmp_path / "delay_tasks.json")
+    task_manager = TaskManager(filename, journal=True, commit_delay=60)
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("Task 2", "Description", "Work", "2030-11-30", "высокий")
+    assert not os.path.exists(task_manager.journal.filename)
+    task_manager.close()
+    assert task_manager.journal.records == 2
+    assert len(TaskManager(filename, journal=True).tasks) == 2
+
+
+def test_flush_retry_after_error():
+    storage = MemoryStorage()
+    task_manager = TaskManager(storage=storage)
+    apply = storage.apply
+    calls = []
+
+    def broken_apply(records, tasks):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        apply(records, tasks)
+
+    storage.apply = broken_apply
+    with task_manager.batch():
+        task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+        task_manager.add_task("Task 2", "Description", "Work", "2030-11-30", "высокий")
+    assert storage.data == {}
+    assert len(task_manager._pending) == 2
+    task_manager.add_task("Task 3", "Description", "Work", "2030-11-30", "высокий")
+    assert calls == [2, 3]
+    assert sorted(storage.data) == [1, 2, 3]
+    assert task_manager._pending == []
+
+
+# Вторичные индексы
+def test_view_tasks_category_index():
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("Task 2", "Description", "Home", "2030-11-30", "низкий")
+    task_manager.add_task("Task 3", "Description", "Work", "2030-11-30", "средний")
+    task_manager.mark_task_completed("3")
+    tasks_book = task_manager.view_tasks_category()
+    assert {key: [task.id for task in value] for key, value in tasks_book.items()} == {
+        "Work": [1], "Home": [2]}
+    assert [task.id for task in task_manager.view_tasks_all()] == [1, 2]
+
+
+def test_indexes_follow_mutations():
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("Task 2", "Description", "Work", "2030-11-30", "низкий")
+    task_manager.update_task("2", {"category": "Home", "priority": ""})
+    assert [task.id for task in task_manager.search_tasks(category="home")] == [2]
+    task_manager.delete_task(task_id="", category="Work")
+    assert task_manager.category_index.get("Work") == {}
+    assert list(task_manager.priority_index.get("низкий")) == [2]
+    task_manager.mark_task_completed("2")
+    assert [task.id for task in task_manager.search_tasks(status="выполнена")] == [2]
+
+
+# Триграммный индекс поиска
+def test_search_tasks_text_index():
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Купить Молоко", "в магазине", "Home", "2030-11-30", "низкий")
+    task_manager.add_task("Отчёт", "Квартальный ОТЧЁТ", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("ok", "", "Misc", "2030-11-30", "низкий")
+
+    assert [task.id for task in task_manager.search_tasks(keyword="молоко")] == [1]
+    assert [task.id for task in task_manager.search_tasks(keyword="ОТЧ")] == [2]
+    assert [task.id for task in task_manager.search_tasks(keyword="ок")] == [1]
+    assert [task.id for task in task_manager.search_tasks(keyword="o")] == [3]
+    with pytest.raises(NotTaskError):
+        task_manager.search_tasks(keyword="молокомагазин")
+
+    task_manager.update_task("1", {"title": "Купить хлеб"})
+    with pytest.raises(NotTaskError):
+        task_manager.search_tasks(keyword="молоко")
+    task_manager.delete_task(task_id="2")
+    with pytest.raises(NotTaskError):
+        task_manager.search_tasks(keyword="отчёт")
+
+
+# Составной запрос
+def test_search_tasks_combined():
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Report", "quarterly", "Work", "2030-01-10", "высокий")
+    task_manager.add_task("Report", "yearly", "Work", "2030-03-10", "низкий")
+    task_manager.add_task("Report", "home budget", "Home", "2030-02-10", "высокий")
+    task_manager.mark_task_completed("2")
+
+    results = task_manager.search_tasks(keyword="report", category="work",
+                                        status="Не выполнена")
+    assert [task.id for task in results] == [1]
+    results = task_manager.query(keyword="report", due_from="2030-02-01",
+                                 due_to="2030-12-31")
+    assert [task.id for task in results] == [2, 3]
+    results = task_manager.query(order_by="due_date", descending=True,
+                                 limit=2, offset=1)
+    assert [task.id for task in results] == [3, 1]
+    results = task_manager.query(order_by="priority", descending=True)
+    assert [task.id for task in results] == [3, 1, 2]
+    with pytest.raises(ValueError):
+        task_manager.query(due_from="2030/01/01")
+    for criteria in ({}, {"category": "work"}, {"keyword": "report", "priority": "высокий"},
+                     {"due_from": "2030-02-01"}, {"keyword": "budget"}):
+        assert task_manager.query_count(**criteria) == len(task_manager.query(**criteria))
+    # пустой поиск - ошибка ввода, а не вся книга задач
+    for criteria in ({}, {"keyword": ""}, {"keyword": "", "category": "", "status": ""}):
+        with pytest.raises(NotInputError):
+            task_manager.search_tasks(**criteria)
+
+
+def test_query_plan_order():
+    from Task.query import TaskQuery, plan_query
+    task_manager = TaskManager(storage=MemoryStorage())
+    with task_manager.batch():
+        for i in range(20):
+            task_manager.add_task(f"Task {i}", "Description", "Work", "2030-01-10",
+                                  "высокий" if i == 5 else "низкий")
+    plan = plan_query(task_manager, TaskQuery(category="Work", priority="высокий",
+                                              keyword="task"))
+    assert [predicate.name for predicate in plan][0] == "priority"
+    assert [task.id for task in task_manager.search_tasks(
+        category="Work", priority="высокий", keyword="task")] == [6]
+
+
+# Упорядоченные индексы по сроку и приоритету
+def test_sorted_key_list():
+    import random
+    from Task.sorted_index import SortedKeyList
+    SortedKeyList.LOAD = 4
+    try:
+        keys = SortedKeyList()
+        expected = []
+        rnd = random.Random(1)
+        for i in range(300):
+            key = (rnd.randint(0, 50), i)
+            keys.add(key)
+            expected.append(key)
+            if i % 3 == 0:
+                victim = rnd.choice(expected)
+                expected.remove(victim)
+                assert keys.remove(victim)
+            # дерево Фенвика по длинам блоков обновляется между запросами count
+            lo, hi = (rnd.randint(0, 50),), (rnd.randint(0, 50),)
+            assert keys.count(lo, hi) == len([k for k in expected if lo <= k < hi])
+        expected.sort()
+        assert list(keys) == expected
+        assert list(keys.irange((10,), (20,))) == [k for k in expected if (10,) <= k < (20,)]
+        assert list(keys.irange((10,), (20,), reverse=True)) == [
+            k for k in reversed(expected) if (10,) <= k < (20,)]
+        assert keys.count((10,), (20,)) == len([k for k in expected if (10,) <= k < (20,)])
+    finally:
+        SortedKeyList.LOAD = 512
+
+
+def test_due_and_priority_queries():
+    task_manager = TaskManager(storage=MemoryStorage())
+    with task_manager.batch():
+        task_manager.add_task("Task 1", "Description", "Work", "2030-01-20", "низкий")
+        task_manager.add_task("Task 2", "Description", "Work", "2030-01-05", "высокий")
+        task_manager.add_task("Task 3", "Description", "Work", "2030-01-10", "средний")
+        task_manager.add_task("Task 4", "Description", "Work", "2030-01-01", "высокий")
+        task_manager.add_task("Task 5", "Description", "Work", "не дата", "высокий")
+    task_manager.mark_task_completed("4")
+
+    assert [task.id for task in task_manager.next_due(2, "2030-01-01")] == [2, 3]
+    assert [task.id for task in task_manager.overdue("2030-01-11")] == [2, 3]
+    assert [task.id for task in task_manager.top_by_priority(3)] == [2, 5, 3]
+    assert [task.id for task in task_manager.tasks_due_between(
+        "2030-01-01", "2030-01-10", include_completed=True)] == [4, 2, 3]
+    task_manager.update_task("1", {"due_date": "2030-01-02"})
+    assert [task.id for task in task_manager.next_due(1, "2030-01-01")] == [1]
+    assert [task.id for task in task_manager.query(
+        due_from="2030-01-01", due_to="2030-01-05")] == [1, 2, 4]
+
+
+# Потоковая и фоновая загрузка
+def test_streaming_load(tmp_path):
+    filename = str(tmp_path / "stream_tasks.json")
+    task_manager = TaskManager(filename)
+    with task_manager.batch():
+        for i in range(50):
+            task_manager.add_task(f"Задача {i}", "Описание" * i, "Work", "2030-11-30", "средний")
+    restored = TaskManager(filename, load_chunk_size=7)
+    assert [task.to_dict() for task in restored.tasks.values()] == [
+        task.to_dict() for task in task_manager.tasks.values()]
+    assert restored.next_id == 51
+
+
+@pytest.mark.parametrize("text", ['[1,]', '[1, 2] [3]', '[{"id": 1}]x', '[,1]', '[1 2]'])
+def test_streaming_load_strict(text):
+    import io
+    from Task.json_stream import iter_json_array
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO(text), chunk_size=2))
+    with pytest.raises(json.JSONDecodeError):
+        json.loads(text)
+    assert list(iter_json_array(io.StringIO(' [ ] \n'))) == []
+    assert list(iter_json_array(io.StringIO('[1, [2], {"a": 3}]\n'), chunk_size=2)) == [
+        1, [2], {"a": 3}]
+
+
+def test_lazy_load(tmp_path):
+    filename = str(tmp_path / "lazy_tasks.json")
+    task_manager = TaskManager(filename)
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    lazy_manager = TaskManager(filename, lazy=True)
+    assert [task.title for task in lazy_manager.view_tasks_all()] == ["Task 1"]
+    assert lazy_manager.wait_loaded(0)
+
+
+# Хранилища задач
+def test_sqlite_storage(tmp_path):
+    filename = str(tmp_path / "tasks.db")
+    task_manager = TaskManager(storage=SQLiteStorage(filename))
+    with task_manager.batch():
+        task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+        task_manager.add_task("Task 2", "Description", "Home", "2030-11-30", "низкий")
+        task_manager.add_task("Task 3", "Description", "Home", "2030-11-30", "низкий")
+    task_manager.update_task("1", {"title": "Task 1 updated"})
+    task_manager.mark_task_completed("2")
+    task_manager.delete_task(task_id="3")
+    task_manager.close()
+
+    restored = TaskManager(storage=SQLiteStorage(filename))
+    assert [task.to_dict() for task in restored.tasks.values()] == [
+        task.to_dict() for task in task_manager.tasks.values()]
+    restored.close()
+
+
+def test_migrate_storage(tmp_path):
+    from Task.migrate import migrate_storage
+    source = JsonFileStorage(str(tmp_path / "tasks.json"), journal=True)
+    task_manager = TaskManager(storage=source)
+    task_manager.add_task("Task 1", "Description", "Work", "2030-11-30", "высокий")
+    task_manager.add_task("Task 2", "Description", "Home", "2030-11-30", "низкий")
+
+    target = SQLiteStorage(str(tmp_path / "tasks.db"))
+    assert migrate_storage(JsonFileStorage(str(tmp_path / "tasks.json"), journal=True),
+                           target) == 2
+    assert [task["title"] for task in target.load()] == ["Task 1", "Task 2"]
+    memory = MemoryStorage()
+    assert migrate_storage(target, memory) == 2
+    assert sorted(memory.data) == [1, 2]
+
+    # поврежденный источник не стирает целевую книгу, непустая книга - только с overwrite
+    broken = tmp_path / "broken.json"
+    broken.write_text('[{"id": 1,', encoding="utf-8")
+    with pytest.raises(StorageError):
+        migrate_storage(JsonFileStorage(str(broken)), target, overwrite=True)
+    with pytest.raises(StorageError):
+        migrate_storage(memory, target)
+    assert len(list(target.load())) == 2
+
+    # незакомпактированный журнал источника применяется при запуске из командной строки
+    from Task.migrate import main
+    task_manager.add_task("Task 3", "Description", "Home", "2030-11-30", "низкий")
+    assert main([str(tmp_path / "tasks.json"), str(tmp_path / "copy.json")]) == 0
+    assert len(list(JsonFileStorage(str(tmp_path / "copy.json")).load())) == 3
+
+
+# Двоичный снимок
+def test_binary_snapshot(tmp_path):
+    from Task.binary_snapshot import (BinarySnapshot, BinarySnapshotStorage,
+                                      json_to_binary, binary_to_json)
+    json_file = str(tmp_path / "tasks.json")
+    task_manager = TaskManager(json_file)
+    with task_manager.batch():
+        for i in range(30):
+            task_manager.add_task(f"Задача {i}", "Описание", "Работа", "2030-11-30", "средний")
+    task_manager.mark_task_completed("7")
+
+    binary_file = str(tmp_path / "tasks.bin")
+    assert json_to_binary(json_file, binary_file) == 30
+    with BinarySnapshot(binary_file) as snapshot:
+        assert len(snapshot) == 30
+        assert snapshot.get(7) == task_manager.tasks[7].to_dict()
+        assert snapshot.get(100) is None
+
+    restored = TaskManager(storage=BinarySnapshotStorage(binary_file))
+    assert [task.to_dict() for task in restored.tasks.values()] == [
+        task.to_dict() for task in task_manager.tasks.values()]
+    restored.delete_task(task_id="1")
+    assert binary_to_json(binary_file, str(tmp_path / "back.json")) == 29
+
+    # поврежденная запись - StorageError, а не struct.error / UnicodeDecodeError
+    from Task.binary_snapshot import HEADER
+    with open(binary_file, "r+b") as f:
+        f.seek(HEADER.size + 4 + 8)  # заголовок, длина первой записи, id -> длина title
+        f.write(b"\xff\xff\xff\x00")
+    with pytest.raises(StorageError):
+        list(BinarySnapshotStorage(binary_file).load())
+    with open(binary_file, "r+b") as f:
+        f.seek(HEADER.size + 4 + 8)
+        f.write(b"\x02\x00\x00\x00\xff\xfe")
+    with pytest.raises(StorageError):
+        list(BinarySnapshotStorage(binary_file).load())
+
+
+# Общий файл задач для нескольких процессов
+@pytest.mark.parametrize("journal", [False, True])
+def test_shared_concurrent_adds(tmp_path, journal):
+    filename = str(tmp_path / "shared_tasks.json")
+    first = TaskManager(filename, journal=journal, shared=True)
+    second = TaskManager(filename, journal=journal, shared=True)
+    first.add_task("First", "Description", "Work", "2030-11-30", "высокий")
+    second.add_task("Second", "Description", "Home", "2030-11-30", "низкий")
+    assert {task.id: task.title for task in second.tasks.values()} == {1: "First", 2: "Second"}
+    assert first.refresh() > 0
+    assert {task.id: task.title for task in first.tasks.values()} == {1: "First", 2: "Second"}
+    assert first.refresh() == 0
+    restored = TaskManager(filename, journal=journal)
+    assert {task.id: task.title for task in restored.tasks.values()} == {1: "First", 2: "Second"}
+
+
+@pytest.mark.parametrize("policy, expected", [("ours", "Second"), ("theirs", "First")])
+def test_shared_conflict_policy(tmp_path, policy, expected):
+    from Task.user_exception import ConflictError
+    filename = str(tmp_path / "shared_tasks.json")
+    TaskManager(filename).add_task("Task", "Description", "Work", "2030-11-30", "высокий")
+    first = TaskManager(filename, journal=True, shared=True)
+    second = TaskManager(filename, journal=True, shared=True, conflict_policy=policy)
+    first.update_task("1", {"title": "First"})
+    second.update_task("1", {"title": "Second", "category": "Home"})
+    assert second.tasks[1].title == expected
+    restored = TaskManager(filename, journal=True)
+    assert restored.tasks[1].title == expected
+    assert restored.tasks[1].to_dict() == second.tasks[1].to_dict()
+
+    strict = TaskManager(filename, journal=True, shared=True, conflict_policy="raise")
+    with strict.batch():
+        first.mark_task_completed("1")
+        strict.update_task("1", {"title": "Strict"})
+        with pytest.raises(ConflictError):
+            strict.flush()
+        strict._pending.clear()
+
+
+# Потокобезопасный режим
+def test_snapshot_immutable():
+    manager = TaskManager(storage=MemoryStorage(), thread_safe=True)
+    manager.add_task("Task", "Description", "Work", "2030-11-30", "высокий")
+    snapshot = manager.snapshot()
+    assert manager.snapshot() is snapshot
+    manager.mark_task_completed("1")
+    manager.add_task("Other", "Description", "Work", "2030-11-30", "низкий")
+    assert list(snapshot) == [1]
+    assert snapshot[1].status == "Не выполнена"
+    assert manager.snapshot()[1].status == "Выполнена"
+    with pytest.raises(TypeError):
+        snapshot[2] = manager.tasks[2]
+
+
+def test_thread_safe_stress():
+    import random
+    import threading
+    manager = TaskManager(storage=MemoryStorage(), thread_safe=True)
+    errors = []
+    stop = threading.Event()
+
+    def writer(seed):
+        rnd = random.Random(seed)
+        try:
+            for i in range(300):
+                manager.add_task(f"Task {seed} {i}", "Description",
+                                 rnd.choice(["Work", "Home"]), "2030-11-30",
+                                 rnd.choice(["низкий", "высокий"]))
+                ids = list(manager.snapshot())
+                task_id = str(rnd.choice(ids))
+                action = rnd.random()
+                try:
+                    if action < 0.3:
+                        manager.update_task(task_id, {"title": f"Updated {i}"})
+                    elif action < 0.5:
+                        manager.mark_task_completed(task_id)
+                    elif action < 0.7:
+                        manager.delete_task(task_id)
+                except (KeyError, AttributeError):
+                    pass  # задачу уже удалил другой поток
+        except Exception as e:
+            errors.append(e)
+
+    def reader():
+        try:
+            while not stop.is_set():
+                active = manager.view_tasks_all()
+                assert all(task.status == "Не выполнена" for task in active)
+                for tasks in manager.view_tasks_category().values():
+                    assert len({task.category for task in tasks}) == 1
+                manager.query(keyword="task", order_by="due_date", limit=10)
+                snapshot = manager.snapshot()
+                assert all(task_id == task.id
+                           for task_id, task in snapshot.items())
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in writers + readers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert not errors
+    assert set(manager.view_tasks_all()) == {
+        task for task in manager.tasks.values() if task.status == "Не выполнена"}
+    assert manager.next_id == 4 * 300 + 1
+
+
+# Сетевой API
+def test_server_api():
+    import asyncio
+    from Task.server import TaskServer
+    from Task.load_generator import HttpClient
+
+    async def scenario():
+        manager = TaskManager(storage=MemoryStorage(), thread_safe=True,
+                              commit_delay=0.01)
+        server = TaskServer(manager, port=0, per_page=2)
+        await server.start()
+        client = HttpClient(port=server.port)
+        try:
+            for i in range(3):
+                status, _, body = await client.request('POST', '/tasks', {
+                    "title": f"Task {i}", "description": "Description",
+                    "category": "Work", "due_date": "2030-11-30",
+                    "priority": "высокий"})
+                assert status == 201 and body["task"]["id"] == i + 1
+            status, _, body = await client.request('POST', '/tasks', {
+                "title": "Bad", "description": "", "category": "Work",
+                "due_date": "2030-11-30", "priority": "срочный"})
+            assert status == 400
+
+            status, headers, body = await client.request('GET', '/tasks?page=2')
+            assert status == 200 and body["total"] == 3
+            assert [task["id"] for task in body["items"]] == [3]
+            etag = headers["etag"]
+            status, _, body = await client.request(
+                'GET', '/tasks?page=2', headers={"If-None-Match": etag})
+            assert status == 304 and body is None
+
+            status, _, body = await client.request('PATCH', '/tasks/2',
+                                                   {"title": "Renamed"})
+            assert status == 200 and body["task"]["title"] == "Renamed"
+            status, _, body = await client.request('POST', '/tasks/1/complete')
+            assert body["task"]["status"] == "Выполнена"
+            status, headers, _ = await client.request(
+                'GET', '/tasks?page=2', headers={"If-None-Match": etag})
+            assert status == 200 and headers["etag"] != etag
+            status, _, body = await client.request('GET', '/search?keyword=renamed')
+            assert [task["id"] for task in body["items"]] == [2]
+
+            assert (await client.request('DELETE', '/tasks/3'))[0] == 200
+            assert (await client.request('GET', '/tasks/3'))[0] == 404
+            assert (await client.request('GET', '/unknown'))[0] == 404
+        finally:
+            await client.close()
+            await server.close()
+        assert sorted(manager.storage.data) == [1, 2]
+
+    asyncio.run(scenario())
+
+
+def test_server_reads_off_event_loop():
+    import asyncio
+    from Task.server import TaskServer
+    from Task.load_generator import HttpClient
+
+    async def scenario():
+        manager = TaskManager(storage=MemoryStorage(), thread_safe=True)
+        manager.add_task("Task", "Description", "Work", "2030-11-30", "высокий")
+        server = TaskServer(manager, port=0)
+        await server.start()
+        client, other = HttpClient(port=server.port), HttpClient(port=server.port)
+        write_lock = manager._rwlock.write()
+        write_lock.__enter__()
+        try:
+            # чтение ждет блокировку в потоке чтения, а цикл событий обслуживает другие запросы
+            pending = asyncio.ensure_future(client.request('GET', '/tasks'))
+            await asyncio.sleep(0.05)
+            assert not pending.done()
+            status, _, _ = await asyncio.wait_for(
+                other.request('GET', '/metrics'), 5)
+            assert status == 200
+            write_lock.__exit__(None, None, None)
+            write_lock = None
+            status, _, body = await asyncio.wait_for(pending, 5)
+            assert status == 200 and body["total"] == 1
+        finally:
+            if write_lock is not None:
+                write_lock.__exit__(None, None, None)
+            await client.close()
+            await other.close()
+            await server.close()
+
+    asyncio.run(scenario())
+
+
+# Бенчмарки
+def test_benchmarks_smoke(tmp_path):
+    from benchmarks.generator import generate_tasks
+    from benchmarks.run import run_benchmarks
+    from benchmarks.compare import compare
+    tasks = list(generate_tasks(100, categories=3, description_length=15,
+                                completed_ratio=0.5))
+    assert {task["category"] for task in tasks} <= {"Категория 0", "Категория 1",
+                                                    "Категория 2"}
+    assert all(len(task["description"]) <= 15 for task in tasks)
+    assert [Task.from_task_in_dict(task).to_dict() for task in tasks] == tasks
+
+    report = run_benchmarks((50,), repeat=1,
+                            scenarios=["load_tasks", "search_keyword", "update_task",
+                                       "query_cached"],
+                            directory=str(tmp_path))
+    assert [(row["scenario"], row["size"]) for row in report["results"]] == [
+        ("load_tasks", 50), ("search_keyword", 50), ("update_task", 50),
+        ("query_cached", 50)]
+    assert list(tmp_path.iterdir()) == []
+
+    slower = {"results": [dict(row, median_s=row["median_s"] * 2 + 1)
+                          for row in report["results"]]}
+    assert all(row["regression"] for row in compare(report, slower))
+    assert not any(row["regression"] for row in compare(slower, report))
+
+
+# Метрики и профилирование
+def test_metrics():
+    from Task.metrics import METRICS
+    METRICS.reset()
+    manager = TaskManager("metrics_book", storage=MemoryStorage())
+    manager.add_task("Task", "Description", "Work", "2030-11-30", "высокий")
+    manager.search_tasks("task")
+    with pytest.raises(NotTaskError):
+        manager.search_tasks("missing")
+    data = METRICS.to_dict()
+    histograms = {(row["name"], row["labels"].get("operation")): row
+                  for row in data["histograms"]}
+    assert histograms[("task_manager_operation_seconds", "add_task")]["count"] == 1
+    assert histograms[("task_manager_operation_seconds", "search_tasks")]["count"] == 2
+    assert histograms[("task_manager_query_results", None)]["sum"] == 1
+    assert histograms[("storage_seconds", "apply")]["count"] == 1
+    counters = {(row["name"], row["labels"].get("operation")): row["value"]
+                for row in data["counters"]}
+    assert counters[("task_manager_operation_errors_total", "search_tasks")] == 1
+    gauges = {(row["name"], row["labels"].get("index")): row["value"]
+              for row in data["gauges"]
+              if row["labels"].get("book") == manager.filename}
+    assert gauges[("task_manager_tasks", None)] == 1
+    assert gauges[("task_manager_index_keys", "category")] == 1
+
+    text = METRICS.to_prometheus()
+    assert "# TYPE task_manager_operation_seconds histogram" in text
+    assert 'task_manager_operation_seconds_count{operation="add_task"} 1' in text
+    assert 'task_manager_operation_seconds_bucket{operation="add_task",le="+Inf"} 1' in text
+
+
+def test_metrics_collectors_concurrent():
+    import time
+    import threading
+    from Task.metrics import MetricsRegistry
+    registry = MetricsRegistry()
+    calls = []
+    stop = threading.Event()
+
+    def collector(i):
+        time.sleep(0)  # отдаем GIL, чтобы регистрация шла во время collect
+        calls.append(i)
+
+    def collecting():
+        while not stop.is_set():
+            registry.collect()
+
+    collector_thread = threading.Thread(target=collecting)
+    collector_thread.start()
+    try:
+        for i in range(2000):
+            registry.add_collector(lambda i=i: collector(i))
+            time.sleep(0)
+    finally:
+        stop.set()
+        collector_thread.join()
+    calls.clear()
+    registry.collect()
+    assert sorted(calls) == list(range(2000))
+
+
+def test_profiled():
+    from Task.metrics import profiled
+    manager = TaskManager(storage=MemoryStorage())
+    with profiled(memory=True) as profile:
+        for i in range(50):
+            manager.add_task(f"Task {i}", "Description", "Work", "2030-11-30",
+                             "высокий")
+    assert "add_task" in profile.text
+    assert profile.memory_peak > 0 and profile.top_allocations
+
+
+# Логирование через очередь
+def test_queue_logging(tmp_path):
+    import logging
+    import threading
+    from Task.logging_setup import setup_logging, stop_logging
+
+    class Message:
+        threads = []
+
+        def __str__(self):
+            self.threads.append(threading.current_thread())
+            self.formatted = True
+            return "сообщение"
+
+    disabled = Message()
+
+    filename = str(tmp_path / "task.log")
+    root = logging.getLogger()
+    level, handlers = root.level, root.handlers[:]
+    root.handlers.clear()  # обработчики pytest форматируют записи в текущем потоке
+    setup_logging(filename, json_lines=True, max_bytes=300, backup_count=2)
+    try:
+        logging.debug("%s", disabled)
+        for i in range(5):
+            logging.info("%s %s", Message(), i)
     finally:
-    # Удаление файла JSON после тестирования
-        if os.path.exists(FILENAME):
-            os.remove(FILENAME)
\ No newline at end of file
+        stop_logging()
+        root.setLevel(level)
+        root.handlers[:] = handlers
+    # сообщения собираются только в фоновом потоке, а для отключенного уровня - никогда
+    assert Message.threads
+    assert threading.current_thread() not in Message.threads
+    assert not hasattr(disabled, "formatted")
+    records = []
+    for name in sorted(os.listdir(tmp_path), reverse=True):
+        with open(tmp_path / name, encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    assert os.path.exists(filename + ".1")
+    assert [record["message"] for record in records][-2:] == ["сообщение 3",
+                                                              "сообщение 4"]
+    assert all(record["level"] == "INFO" for record in records)
+
+
+# Командная строка
+def _run_cli(*argv, stdin=""):
+    import io
+    from Task.cli import main
+    stdout = io.StringIO()
+    code = main(list(argv), stdin=io.StringIO(stdin), stdout=stdout,
+                stderr=io.StringIO())
+    return code, [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+
+def test_cli_commands(tmp_path):
+    filename = str(tmp_path / "cli_tasks.json")
+    code, [result] = _run_cli("--file", filename, "add", "--title", "Отчет",
+                              "--category", "Работа", "--due-date", "2030-01-31",
+                              "--priority", "высокий")
+    assert code == 0 and result["task"]["id"] == 1
+    code, [result] = _run_cli("--file", filename, "add", "--title", "Плохая",
+                              "--category", "Работа", "--due-date", "2030-01-31",
+                              "--priority", "срочный")
+    assert code == 1 and not result["ok"]
+    assert _run_cli("--file", filename, "complete", "1")[0] == 0
+    assert _run_cli("--file", filename, "list")[1][0]["count"] == 0
+    code, [result] = _run_cli("--file", filename, "search", "отчет")
+    assert [task["status"] for task in result["tasks"]] == ["Выполнена"]
+    code, [result] = _run_cli("--file", filename, "delete", "--id", "7")
+    assert code == 1 and "7" in result["error"]
+    assert _run_cli("--file", filename, "frobnicate")[0] == 2
+    code, [result] = _run_cli("--file", filename, "search")
+    assert code == 1 and not result["ok"]  # поиск без условий не возвращает всю книгу
+
+
+def test_cli_batch(tmp_path):
+    from Task.metrics import METRICS
+    filename = str(tmp_path / "cli_tasks.json")
+    commands = "\n".join(
+        [f'add --title "Задача {i}" --category Дом --due-date 2030-02-01 '
+         f'--priority низкий' for i in range(20)] +
+        ["# комментарий", "update 3 --title Третья", "complete 4",
+         "delete --id 5", "update 99 --title Нет", "list --category Дом",
+         "search --help", "list --category Дом"])
+    METRICS.reset()
+    code, results = _run_cli("--file", filename, "--batch", "-", stdin=commands)
+    applies = [row for row in METRICS.to_dict()["histograms"]
+               if row["name"] == "storage_seconds"
+               and row["labels"]["operation"] == "apply"]
+    assert [row["count"] for row in applies] == [1]  # одно сохранение на весь пакет
+    assert code == 1
+    assert [result["ok"] for result in results] == [True] * 23 + [False] + [True] * 3
+    assert results[-3]["count"] == results[-1]["count"] == 18
+    assert "--ranked" in results[-2]["help"]  # справка - результат строки, пакет не прерван
+    with open(filename, encoding="utf-8") as f:
+        assert len(json.load(f)) == 19
+
+
+# Массовый импорт и экспорт
+def test_bulk_import_export(tmp_path):
+    from Task.metrics import METRICS
+    from Task.bulk_io import import_tasks, export_tasks
+    source = tmp_path / "import.jsonl"
+    rows = [{"title": f"Задача {i}", "description": "", "category": "Дом",
+             "due_date": "2030-03-01", "priority": "Средний"} for i in range(25)]
+    rows[3]["title"] = ""
+    rows[7]["priority"] = "срочный"
+    rows[9]["due_date"] = "2001-01-01"
+    lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+    lines.insert(12, "{не json")
+    source.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    manager = TaskManager(filename=str(tmp_path / "bulk_book.json"))
+    manager.add_task("Старая", "", "Работа", "2030-01-01", "низкий")
+    METRICS.reset()
+    result = import_tasks(manager, str(source), chunk_size=4)
+    applies = [row["count"] for row in METRICS.to_dict()["histograms"]
+               if row["name"] == "storage_seconds"
+               and row["labels"]["operation"] == "apply"]
+    assert applies == [1]  # одно сохранение на весь импорт
+    assert result.imported == 22 and (result.first_id, result.last_id) == (2, 23)
+    assert [error["row"] for error in result.errors] == [4, 8, 10, 13]
+    assert manager.next_id == 24 and manager.tasks[23].priority == "средний"
+
+    target = str(tmp_path / "export.csv")
+    assert export_tasks(manager, target) == 23
+    copy = TaskManager(filename=str(tmp_path / "copy_book.json"))
+    result = import_tasks(copy, target, allow_past_due=True)
+    assert result.error_count == 0 and result.imported == 23
+    assert ([task.to_dict() for task in copy.tasks.values()] ==
+            [task.to_dict() for task in manager.tasks.values()])
+    assert TaskManager(filename=str(tmp_path / "copy_book.json")).next_id == 24
+
+
+@pytest.mark.parametrize("file_format, text, error_row", [
+    ("csv", "title,description,category,due_date,priority\n"
+            "Задача 1,,Дом,2030-03-01,низкий\n"
+            "Задача 2,,Дом,2030-03-01,низкий\n"
+            "Задача 3,\"" + "x" * 200000 + "\",Дом,2030-03-01,низкий\n"
+            "Задача 4,,Дом,2030-03-01,низкий\n", 3),
+    ("json", '[{"title": "Задача 1", "due_date": "2030-03-01", "priority": "низкий"},'
+             ' {"title": "Задача 2", "due_date": "2030-03-01", "priority": "низкий"},'
+             ' {"title": "Задача 3", "due_da', 3),
+])
+def test_bulk_import_malformed(file_format, text, error_row):
+    import io
+    from Task.bulk_io import import_tasks
+    manager = TaskManager(storage=MemoryStorage())
+    result = import_tasks(manager, io.StringIO(text), file_format, chunk_size=1)
+    assert result.imported == 2 and result.error_count == 1
+    assert result.errors[0]["row"] == error_row
+    assert sorted(manager.storage.data) == [1, 2]
+
+
+# Постраничный вывод
+def test_show_tasks_pages(monkeypatch):
+    import io
+    import builtins
+    import Task.View as view
+    task_manager = TaskManager(storage=MemoryStorage())
+    for i in range(5):
+        task_manager.add_task(f"Задача {i}", "Описание", "Дом", "2030-01-01",
+                              "низкий")
+    tasks = task_manager.view_tasks_all()
+    answers = iter(["", "p", "", "", ""])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+    stream = io.StringIO()
+    writes = []
+    monkeypatch.setattr(stream, "write", lambda text: writes.append(text))
+    assert view.show_tasks(tasks, page_size=2, stream=stream)
+    pages = [[line.split(",")[0] for line in text.splitlines()
+              if line.startswith("ID")] for text in writes]
+    assert pages == [["ID: 1", "ID: 2"], ["ID: 3", "ID: 4"], ["ID: 1", "ID: 2"],
+                     ["ID: 3", "ID: 4"], ["ID: 5"]]  # одна запись на страницу
+    assert "из 5" in writes[0]
+
+    answers = iter(["q"])
+    writes.clear()
+    assert not view.show_tasks(iter(tasks), page_size=2, table=True,
+                               stream=stream)
+    header, rule, *rows, info = writes[0].splitlines()
+    assert len(writes) == 1 and len(rows) == 2
+    assert len(header) == len(rule) and header.startswith("ID | Название")
+    assert rows[0].index("|") == header.index("|")
+
+
+# Кэш результатов запросов
+def test_query_cache():
+    task_manager = TaskManager(storage=MemoryStorage(), cache_size=3)
+    for category in ("Дом", "Работа"):
+        for i in range(3):
+            task_manager.add_task(f"{category} {i}", "", category, "2030-01-01",
+                                  "низкий")
+    cache = task_manager.query_cache
+    assert len(task_manager.search_tasks(category="дом")) == 3
+    task_manager.search_tasks(category="Дом")  # тот же нормализованный запрос
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    work = task_manager.search_tasks(category="Работа")
+    work.clear()  # изменение возвращенного списка не портит кэш
+    task_manager.mark_task_completed("1")  # задача категории "Дом"
+    assert len(task_manager.search_tasks(category="Работа")) == 3
+    assert cache.hits == 2  # выборка другой категории осталась в кэше
+    assert [task.status for task in task_manager.search_tasks(category="Дом")
+            ].count("Выполнена") == 1
+    assert cache.stale == 1
+
+    assert len(task_manager.view_tasks_all()) == 5
+    task_manager.update_task("4", {"category": "Дом"})
+    assert len(task_manager.view_tasks_category()["Дом"]) == 3
+    task_manager.search_tasks("Работа")
+    assert cache.stats()["size"] == 3 and cache.evictions == 2
+
+
+# Шарды по категориям
+def test_sharded_storage(tmp_path, monkeypatch, caplog):
+    from Task.migrate import migrate_storage
+    from Task.storage import open_storage
+    from Task.sharded_storage import ShardedStorage, shard_filename
+    directory = str(tmp_path / "book.shards")
+    source = MemoryStorage()
+    source.save_all(Task(i, f"Задача {i}", "", ("Дом", "Работа", "Учеба")[i % 3],
+                         "2030-01-01", "низкий") for i in range(1, 31))
+    assert migrate_storage(source, open_storage(directory)) == 30
+    with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+        assert json.load(f)["shards"]["Дом"]["count"] == 10
+
+    task_manager = TaskManager(storage=ShardedStorage(directory,
+                                                      min_parallel_bytes=0))
+    assert len(task_manager.tasks) == 30  # шарды разобраны в пуле процессов
+    shards = {category: os.path.join(directory, shard_filename(category))
+              for category in ("Дом", "Работа", "Учеба")}
+    for path in shards.values():
+        os.utime(path, ns=(0, 0))
+    task_manager.update_task("2", {"category": "Дом"})  # из "Учеба" в "Дом"
+    # переписаны только шарды затронутых категорий
+    assert [category for category, path in shards.items()
+            if os.stat(path).st_mtime_ns] == ["Дом", "Учеба"]
+    task_manager.mark_task_completed("1")
+    removed = []
+
+    def remove(path):
+        with open(os.path.join(directory, "manifest.json"), encoding="utf-8") as f:
+            removed.append((path, "Работа" in json.load(f)["shards"]))
+        real_remove(path)
+    real_remove = os.remove
+    monkeypatch.setattr("Task.sharded_storage.os.remove", remove)
+    task_manager.delete_task("", "Работа")
+    # файл шарда удаляется только после записи манифеста без него
+    assert removed == [(shards["Работа"], False)]
+    assert not os.path.exists(shards["Работа"])
+    task_manager.add_task("Новая", "", "Сад", "2030-01-01", "высокий")
+
+    reloaded = TaskManager(storage=ShardedStorage(directory))
+    assert {task_id: task.to_dict() for task_id, task in reloaded.tasks.items()} == \
+           {task_id: task.to_dict() for task_id, task in task_manager.tasks.items()}
+    assert reloaded.storage.shard_sizes() == {"Дом": 11, "Учеба": 9, "Сад": 1}
+
+    os.remove(shards["Учеба"])  # шард из манифеста пропал
+    reloaded = TaskManager(storage=ShardedStorage(directory))
+    assert reloaded.storage.shard_sizes() == {"Дом": 11, "Сад": 1}
+    assert "отсутствующий шард" in caplog.text
+
+
+# Архив выполненных задач
+def test_archive_completed(tmp_path):
+    filename = str(tmp_path / "archive_book.json")
+    task_manager = TaskManager(filename=filename, archive_after_days=30)
+    for i, due_date in enumerate(("2020-01-01", "2020-02-01", "2030-01-01",
+                                  "2020-03-01")):
+        task_manager.add_task(f"Отчет {i}", "", "Работа" if i else "Дом",
+                              due_date, "низкий")
+    for task_id in ("1", "2", "3"):
+        task_manager.mark_task_completed(task_id)
+    task_manager.close()  # старые выполненные задачи 1 и 2 уходят в архив
+
+    reloaded = TaskManager(filename=filename)
+    assert sorted(reloaded.tasks) == [3, 4] and reloaded.next_id == 5
+    assert len(reloaded.view_tasks_all()) == 1
+    assert [task.id for task in reloaded.search_tasks(status="выполнена")] == [1, 2, 3]
+    assert [task.id for task in reloaded.search_tasks("отчет", category="Дом",
+                                                      include_archive=True)] == [1]
+    with pytest.raises(NotTaskError):
+        reloaded.search_tasks("отчет", category="Дом")
+
+    assert [task.id for task in reloaded.restore_archived(category="Работа")] == [2]
+    assert reloaded.archive.count == 1
+    assert sorted(TaskManager(filename=filename).tasks) == [2, 3, 4]
+
+
+def test_archive_in_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Отчет", "", "Работа", "2020-01-01", "низкий")
+    task_manager.add_task("Отчет", "", "Дом", "2030-01-01", "низкий")
+    task_manager.mark_task_completed("1")
+    assert task_manager.archive_completed(30) == 1
+    assert os.listdir(tmp_path) == []
+    assert sorted(task_manager.tasks) == [2]
+    assert [task.id for task in task_manager.search_tasks(status="выполнена")] == [1]
+    assert [task.id for task in task_manager.restore_archived([1])] == [1]
+    assert task_manager.archive.count == 0 and list(task_manager.archive) == []
+
+
+# Инкрементальная статистика
+def test_stats_incremental():
+    import random
+    from datetime import date
+    from Task.aggregates import TaskAggregates
+    task_manager = TaskManager(storage=MemoryStorage())
+    rng = random.Random(7)
+    categories = ["Дом", "Работа", "Учеба"]
+    priorities = ["низкий", "средний", "высокий"]
+    today = date(2030, 6, 15)
+    with task_manager.batch():
+        for step in range(600):
+            ids = list(task_manager.tasks)
+            action = rng.random()
+            if action < 0.5 or not ids:
+                task_manager.add_task("Задача", "", rng.choice(categories),
+                                      f"2030-06-{rng.randint(1, 30):02d}",
+                                      rng.choice(priorities))
+            elif action < 0.7:
+                task_manager.update_task(str(rng.choice(ids)), {
+                    "category": rng.choice(categories),
+                    "priority": rng.choice(priorities),
+                    "due_date": rng.choice(["2030-06-20", "2031-01-01", "плохая"])})
+            elif action < 0.85:
+                task_manager.mark_task_completed(str(rng.choice(ids)))
+            elif action < 0.97:
+                task_manager.delete_task(str(rng.choice(ids)))
+            else:
+                task_manager.delete_task("", rng.choice(categories))
+            if step % 50 == 0:
+                expected = TaskAggregates.from_tasks(task_manager.tasks.values())
+                assert task_manager.stats(today) == expected.stats(today)
+    stats = task_manager.stats(today)
+    assert stats == TaskAggregates.from_tasks(task_manager.tasks.values()).stats(today)
+    assert stats["total"] == len(task_manager.tasks)
+    assert stats["open"] == len(task_manager.view_tasks_all())
+    assert sum(stats["due"].values()) == stats["open"]
+    assert stats["overdue_by_priority"].get("высокий", 0) == len(
+        [task for task in task_manager.overdue(today)
+         if task.priority == "высокий"])
+
+
+# Столбец сроков выполнения
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_due_date_column(use_numpy):
+    import random
+    from datetime import date
+    from Task.date_column import DueDateColumn
+    if use_numpy:
+        pytest.importorskip("numpy")
+    task_manager = TaskManager(storage=MemoryStorage())
+    position = task_manager.indexes.index(task_manager.due_column)
+    task_manager.due_column = DueDateColumn(use_numpy, capacity=4)
+    task_manager.indexes[position] = task_manager.due_column
+    rng = random.Random(3)
+    for i in range(300):
+        task_manager.add_task("Задача", "", "Дом",
+                              rng.choice([f"2030-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                                          "плохая"]),
+                              rng.choice(["низкий", "средний", "высокий"]))
+    for task_id in rng.sample(range(1, 301), 60):
+        task_manager.mark_task_completed(str(task_id))
+    for task_id in rng.sample(range(1, 301), 40):
+        if task_id in task_manager.tasks:
+            task_manager.delete_task(str(task_id))
+    today = date(2030, 5, 15)
+    opened = [task for task in task_manager.tasks.values()
+              if task.status == "Не выполнена" and task.due_ordinal]
+    assert task_manager.overdue_count(today) == len(task_manager.overdue(today))
+    assert task_manager.due_column.overdue_ids(today, "высокий") == [
+        task.id for task in opened
+        if task.due_ordinal < today.toordinal() and task.priority == "высокий"]
+    assert task_manager.due_within(30, today) == len(
+        [task for task in opened
+         if 0 <= task.due_ordinal - today.toordinal() <= 30])
+    histogram = task_manager.weekly_histogram(include_completed=True)
+    assert sum(histogram.values()) == len(
+        [task for task in task_manager.tasks.values() if task.due_ordinal])
+    assert all(week.weekday() == 0 for week in histogram)
+    assert list(histogram) == sorted(histogram)
+
+
+# Ранжированный поиск с учетом опечаток
+def test_ranked_search():
+    from Task.search_index import SearchIndex
+    task_manager = TaskManager(storage=MemoryStorage())
+    task_manager.add_task("Квартальный отчет", "Отчет для бухгалтерии",
+                          "Работа", "2030-01-01", "высокий")
+    task_manager.add_task("Купить молоко", "И хлеб к отчету не забыть",
+                          "Дом", "2030-01-01", "низкий")
+    task_manager.add_task("Позвонить маме", "", "Дом", "2030-01-01", "средний")
+    task_manager.add_task("Отчет по проекту", "", "Работа", "2030-01-01",
+                          "средний")
+    # опечатка в слове и порядок по релевантности: совпадения в названии выше
+    results = task_manager.ranked_search("атчет")
+    assert [task.id for task in results][:2] == [1, 4]
+    assert task_manager.ranked_search("квартльный отчет")[0].id == 1
+    assert [task.id for task in task_manager.ranked_search("отчет", limit=1)] == [1]
+    assert [task.id for task in task_manager.ranked_search(
+        "отчет", category="дом")] == [2]
+    with pytest.raises(NotTaskError):
+        task_manager.ranked_search("зоопарк")
+    # индекс обновляется при изменениях (и кэш результатов не устаревает)
+    task_manager.update_task("3", {"title": "Отчет маме"})
+    assert 3 in [task.id for task in task_manager.ranked_search("отчет", None)]
+    task_manager.delete_task("1")
+    assert 1 not in [task.id for task in task_manager.ranked_search("отчет", None)]
+    rebuilt = SearchIndex()
+    for task in task_manager.tasks.values():
+        rebuilt.add(task)
+    assert rebuilt.postings == task_manager.search_index.postings
+    assert rebuilt.vocabulary == task_manager.search_index.vocabulary
+    assert rebuilt.total_length == task_manager.search_index.total_length